@@ -0,0 +1,59 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Times building and serializing GetItem requests, the way the service sends them, with ElementMaker
+and with the precompiled template. Run it from the top of the repository:
+
+    python benchmarks/get_item_requests.py
+"""
+from __future__ import print_function
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from lxml import etree  # noqa: E402
+from pyexchange import Exchange2010Service  # noqa: E402
+from pyexchange.exchange2010 import soap_request  # noqa: E402
+
+ID = u'AAMkADdhZjY2YzU5LTM4NWYtNDNiMy1hZGI3LWMwNDkyYTM1YmE0OABGAAAAAAAmAAA='
+NUMBER = 20000
+
+
+def built(service, ids, format):
+    return etree.tostring(service._wrap_soap_xml_request(soap_request.get_item(ids, format=format)), encoding=u'utf-8')
+
+
+def templated(service, ids, format):
+    return service._wrap_soap_xml_request(soap_request.render_get_item(ids, format=format))
+
+
+def main():
+    plain = Exchange2010Service(connection=None)
+    impersonating = plain.impersonate(u'somebody@example.com')
+
+    cases = [
+        (u'one id, IdOnly', plain, ID, u'IdOnly'),
+        (u'one id, AllProperties', plain, ID, u'AllProperties'),
+        (u'one id, impersonating', impersonating, ID, u'IdOnly'),
+        (u'100 ids', plain, [ID] * 100, u'AllProperties'),
+    ]
+
+    print(u'%-24s %14s %14s %8s' % (u'request', u'ElementMaker', u'template', u'speedup'))
+    for name, service, ids, format in cases:
+        assert built(service, ids, format) == templated(service, ids, format)
+        number = NUMBER if isinstance(ids, type(u'')) else NUMBER // 50
+
+        slow = min(timeit.repeat(lambda: built(service, ids, format), number=number, repeat=3)) / number
+        fast = min(timeit.repeat(lambda: templated(service, ids, format), number=number, repeat=3)) / number
+
+        print(u'%-24s %12.1fus %12.1fus %7.1fx' % (name, slow * 1e6, fast * 1e6, slow / fast))
+
+
+if __name__ == '__main__':
+    main()
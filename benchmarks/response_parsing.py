@@ -0,0 +1,60 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Times parsing GetItem responses with lxml's default parser and with the service's own (see
+``pyexchange.base.soap.response_parser``), and measures the memory the parsed trees hold. lxml
+builds its trees in C, so memory is measured as the growth in the process's peak resident size
+(which needs Unix), one parser per run so the peaks don't mix:
+
+    python benchmarks/response_parsing.py default 500
+    python benchmarks/response_parsing.py service 500
+"""
+from __future__ import print_function
+
+import os
+import re
+import resource
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from lxml import etree  # noqa: E402
+from pyexchange.base.soap import response_parser  # noqa: E402
+from tests.exchange2010.fixtures import GET_ITEM_RESPONSE  # noqa: E402
+
+KEPT = 50
+
+
+def get_items_response(count):
+    """ A GetItem response for *count* items, made by repeating the fixture's one message. """
+    message = re.search(u'<m:GetItemResponseMessage.*</m:GetItemResponseMessage>', GET_ITEM_RESPONSE, re.S)
+    return (GET_ITEM_RESPONSE[:message.start()] + message.group(0) * count + GET_ITEM_RESPONSE[message.end():]).encode(u'utf-8')
+
+
+def main():
+    case = sys.argv[1] if len(sys.argv) > 1 else u'service'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    response = get_items_response(count)
+    parse = {
+        u'default': lambda: etree.XML(response),
+        u'service': lambda: etree.XML(response, response_parser()),
+    }[case]
+
+    number = max(2000 // count, 1)
+    seconds = min(timeit.repeat(parse, number=number, repeat=3)) / number
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    trees = [parse() for _ in range(KEPT)]
+    grown = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+
+    print(u'%s, %d items, %d bytes: %.2fms a parse, %.0f parses/s, %.2f MB held per tree' % (
+        case, count, len(response), seconds * 1e3, 1 / seconds, grown / 1024.0 / len(trees)))
+
+
+if __name__ == '__main__':
+    main()
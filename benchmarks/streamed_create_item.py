@@ -0,0 +1,80 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+
+Peak memory and time for building a CreateItem request for many events, as one ElementMaker tree
+and streamed, each sent the way the service sends it to a connection that takes a streamed body.
+lxml builds its trees in C, so memory is measured as the growth in the process's peak resident size
+(which needs Unix). Run it from the top of the repository, once per case, so the peaks don't mix:
+
+    python benchmarks/streamed_create_item.py tree 10000
+    python benchmarks/streamed_create_item.py stream 10000
+"""
+from __future__ import print_function
+
+import os
+import resource
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from lxml import etree  # noqa: E402
+from pytz import utc  # noqa: E402
+from pyexchange import Exchange2010Service  # noqa: E402
+from pyexchange.connection import ExchangeBaseConnection  # noqa: E402
+from pyexchange.exchange2010 import soap_request  # noqa: E402
+from pyexchange.exchange2010.soap_request import M  # noqa: E402
+
+
+class DiscardingConnection(ExchangeBaseConnection):
+    streams_request_bodies = True
+
+    def send(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
+        return sum(len(chunk) for chunk in ([body] if isinstance(body, bytes) else body))
+
+
+def tree(service, events):
+    root = M.CreateItem(
+        M.SavedItemFolderId(soap_request.folder_id_node(u'calendar')),
+        M.Items(*[soap_request.calendar_item(event) for event in events]),
+        SendMeetingInvitations="SendToAllAndSaveCopy"
+    )
+    return service.connection.send(etree.tostring(service._wrap_soap_xml_request(root), encoding=u'utf-8'))
+
+
+def stream(service, events):
+    return service.connection.send(service._wrap_soap_xml_request(soap_request.stream_new_events(events)))
+
+
+def main():
+    case = sys.argv[1] if len(sys.argv) > 1 else u'stream'
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    service = Exchange2010Service(connection=DiscardingConnection())
+    events = [
+        service.calendar().new_event(
+            subject=u'Event %d' % number,
+            start=datetime(2050, 5, 1, 9, 0, tzinfo=utc),
+            end=datetime(2050, 5, 1, 10, 0, tzinfo=utc),
+            location=u'Room %d' % number,
+            html_body=u'<p>Agenda for event %d</p>' % number,
+            attendees=[u'person%d@example.com' % number, u'other%d@example.com' % number],
+        )
+        for number in range(count)
+    ]
+
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.time()
+    size = {u'tree': tree, u'stream': stream}[case](service, events)
+    elapsed = time.time() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(u'%s, %d events, %d bytes: %.2fs, peak RSS grew by %.1f MB' % (case, count, size, elapsed, (peak - before) / 1024.0))
+
+
+if __name__ == '__main__':
+    main()
@@ -6,10 +6,27 @@ Unless required by applicable law or agreed to in writing, software?distributed
 """
 from collections import namedtuple
 
+from .model import BaseExchangeModel, ExchangeField
+
 ExchangeEventOrganizer = namedtuple('ExchangeEventOrganizer', ['name', 'email'])
 ExchangeEventAttendee = namedtuple('ExchangeEventAttendee', ['name', 'email', 'required'])
 ExchangeEventResponse = namedtuple('ExchangeEventResponse', ['name', 'email', 'response', 'last_response', 'required'])
 
+# A read-only event, straight from the server - see list_events(as_records=True)
+ExchangeEventRecord = namedtuple('ExchangeEventRecord', [
+    'id', 'change_key', 'subject', 'start', 'end', 'location', 'availability', 'html_body', 'text_body', 'type',
+    'reminder_minutes_before_start', 'is_all_day', 'recurrence', 'recurrence_end_date', 'recurrence_interval',
+    'recurrence_days', 'organizer', 'attendees', 'resources', 'conflicting_event_ids',
+])
+
+# One mailbox's events from list_events_for(). If listing them failed, events is empty and error is
+# the exception. seconds is how long the mailbox took.
+ExchangeMailboxEvents = namedtuple('ExchangeMailboxEvents', ['mailbox', 'events', 'error', 'seconds'])
+
+# How a list_events_for() run went: mailbox counts, failures (mailbox -> exception), the wall-clock
+# seconds for the whole run and the seconds each mailbox took (mailbox -> seconds).
+ExchangeFanOutSummary = namedtuple('ExchangeFanOutSummary', ['mailboxes', 'succeeded', 'failures', 'seconds', 'timings'])
+
 
 RESPONSE_ACCEPTED = u'Accept'
 RESPONSE_DECLINED = u'Decline'
@@ -35,39 +52,41 @@ class BaseExchangeCalendarService(object):
         raise NotImplementedError
 
 
-class BaseExchangeCalendarEvent(object):
+class BaseExchangeCalendarEvent(BaseExchangeModel):
 
-    _id = None  # Exchange identifier for the event
-    _change_key = None  # Exchange requires a second key when updating/deleting the event
+    _id = ExchangeField()  # Exchange identifier for the event
+    _change_key = ExchangeField()  # Exchange requires a second key when updating/deleting the event
 
-    service = None
-    calendar_id = None
+    service = ExchangeField()
+    calendar_id = ExchangeField()
 
-    subject = u''
-    start = None
-    end = None
-    location = None
-    html_body = None
-    text_body = None
-    attachments = None
-    organizer = None
-    reminder_minutes_before_start = None
-    is_all_day = None
+    subject = ExchangeField(u'')
+    start = ExchangeField()
+    end = ExchangeField()
+    location = ExchangeField()
+    availability = ExchangeField()
+    html_body = ExchangeField()
+    text_body = ExchangeField()
+    attachments = ExchangeField()
+    organizer = ExchangeField()
+    reminder_minutes_before_start = ExchangeField()
+    is_all_day = ExchangeField()
 
-    recurrence = None
-    recurrence_end_date = None
-    recurrence_days = None
-    recurrence_interval = None
+    recurrence = ExchangeField()
+    recurrence_end_date = ExchangeField()
+    recurrence_days = ExchangeField()
+    recurrence_interval = ExchangeField()
 
-    _type = None
+    _type = ExchangeField()
 
-    _attendees = {}  # people attending
-    _resources = {}  # conference rooms attending
+    _attendees = ExchangeField(default_factory=dict)  # people attending
+    _resources = ExchangeField(default_factory=dict)  # conference rooms attending
 
-    _conflicting_event_ids = []
+    _conflicting_event_ids = ExchangeField(default_factory=list)
 
-    _track_dirty_attributes = False
-    _dirty_attributes = set()  # any attributes that have changed, and we need to update in Exchange
+    # Since the last save: u'attendees'/u'resources' -> {email: ExchangeEventResponse} of people added,
+    # or None if the collection has to be sent in full. See _pending_additions().
+    _attendee_changes = ExchangeField()
 
     # these attributes can be pickled, or output as JSON
     DATA_ATTRIBUTES = [
@@ -82,12 +101,12 @@ class BaseExchangeCalendarEvent(object):
 
     WEEKLY_DAYS = [u'Sunday', u'Monday', u'Tuesday', u'Wednesday', u'Thursday', u'Friday', u'Saturday']
 
-    def __init__(self, service, id=None, calendar_id=u'calendar', xml=None, **kwargs):
+    def __init__(self, service, id=None, calendar_id=u'calendar', xml=None, lazy=False, **kwargs):
         self.service = service
         self.calendar_id = calendar_id
 
         if xml is not None:
-            self._init_from_xml(xml)
+            self._init_from_xml(xml, lazy=lazy)
         elif id is None:
             self._update_properties(kwargs)
         else:
@@ -99,8 +118,12 @@ class BaseExchangeCalendarEvent(object):
         """ Connect to the Exchange service and grab all the properties out of it. """
         raise NotImplementedError
 
-    def _init_from_xml(self, xml):
-        """ Using already retrieved XML from Exchange, extract properties out of it. """
+    def _init_from_xml(self, xml, lazy=False):
+        """
+        Using already retrieved XML from Exchange, extract properties out of it.
+
+        If *lazy* is set, hang on to the XML and only parse each property the first time it's read.
+        """
         raise NotImplementedError
 
     @property
@@ -171,6 +194,7 @@ class BaseExchangeCalendarEvent(object):
     @attendees.setter
     def attendees(self, attendees):
         self._attendees = self._build_resource_dictionary(attendees)
+        self._record_replacement(u'attendees')
         self._dirty_attributes.add(u'attendees')
 
     @property
@@ -198,6 +222,7 @@ class BaseExchangeCalendarEvent(object):
         for email in required:
             self._attendees[email] = required[email]
 
+        self._record_replacement(u'attendees')
         self._dirty_attributes.add(u'attendees')
 
     @property
@@ -225,6 +250,7 @@ class BaseExchangeCalendarEvent(object):
         for email in optional:
             self._attendees[email] = optional[email]
 
+        self._record_replacement(u'attendees')
         self._dirty_attributes.add(u'attendees')
 
     def add_attendees(self, attendees, required=True):
@@ -235,6 +261,7 @@ class BaseExchangeCalendarEvent(object):
         """
 
         new_attendees = self._build_resource_dictionary(attendees, required=required)
+        self._record_additions(u'attendees', new_attendees, self._attendees)
 
         for email in new_attendees:
             self._attendees[email] = new_attendees[email]
@@ -253,6 +280,7 @@ class BaseExchangeCalendarEvent(object):
             if email in self._attendees:
                 del self._attendees[email]
 
+        self._record_replacement(u'attendees')
         self._dirty_attributes.add(u'attendees')
 
     @property
@@ -268,6 +296,7 @@ class BaseExchangeCalendarEvent(object):
     @resources.setter
     def resources(self, resources):
         self._resources = self._build_resource_dictionary(resources)
+        self._record_replacement(u'resources')
         self._dirty_attributes.add(u'resources')
 
     def add_resources(self, resources):
@@ -277,6 +306,7 @@ class BaseExchangeCalendarEvent(object):
         *resources* can be a list of email addresses or :class:`ExchangeEventAttendee` objects.
         """
         new_resources = self._build_resource_dictionary(resources)
+        self._record_additions(u'resources', new_resources, self._resources)
 
         for key in new_resources:
             self._resources[key] = new_resources[key]
@@ -294,8 +324,45 @@ class BaseExchangeCalendarEvent(object):
             if email in self._resources:
                 del self._resources[email]
 
+        self._record_replacement(u'resources')
         self._dirty_attributes.add(u'resources')
 
+    def _record_additions(self, collection, additions, existing):
+        changes = self._attendee_changes
+        if changes is None:
+            changes = self._attendee_changes = {}
+
+        pending = changes.setdefault(collection, {})
+        if pending is None:
+            return
+
+        # Exchange can append to an attendee list, but not change somebody who's already on it
+        if any(email in existing and email not in pending for email in additions):
+            changes[collection] = None
+        else:
+            pending.update(additions)
+
+    def _record_replacement(self, collection):
+        changes = self._attendee_changes
+        if changes is None:
+            changes = self._attendee_changes = {}
+
+        changes[collection] = None
+
+    def _pending_additions(self, collection):
+        """
+        People added to *collection* (u'attendees' or u'resources') since the event was last saved, as a list
+        of :class:`ExchangeEventResponse`, or None if the whole collection has to be sent because somebody was
+        removed or changed.
+        """
+        changes = self._attendee_changes or {}
+        pending = changes.get(collection, {})
+        return None if pending is None else list(pending.values())
+
+    def _reset_dirty_attributes(self):
+        super(BaseExchangeCalendarEvent, self)._reset_dirty_attributes()
+        self._attendee_changes = None
+
     @property
     def conference_room(self):
         """ Alias to resources - Exchange calls 'em resources, but this is clearer"""
@@ -344,8 +411,14 @@ class BaseExchangeCalendarEvent(object):
         """ Output ourselves as JSON """
         raise NotImplementedError
 
+    def as_msgpack(self):
+        """ Output ourselves as compact MessagePack bytes """
+        raise NotImplementedError
+
     def __getstate__(self):
         """ Implemented so pickle.dumps() and pickle.loads() work """
+        self.materialize()
+
         state = {}
         for attribute in self.DATA_ATTRIBUTES:
             state[attribute] = getattr(self, attribute, None)
@@ -373,19 +446,3 @@ class BaseExchangeCalendarEvent(object):
                     result[item] = ExchangeEventResponse(email=item, required=required, name=None, response=None, last_response=None)
 
         return result
-
-    def _update_properties(self, properties):
-        self._track_dirty_attributes = False
-        for key in properties:
-            setattr(self, key, properties[key])
-        self._track_dirty_attributes = True
-
-    def __setattr__(self, key, value):
-        """ Magically track public attributes, so we can track what we need to flush to the Exchange store """
-        if self._track_dirty_attributes and not key.startswith(u"_"):
-            self._dirty_attributes.add(key)
-
-        object.__setattr__(self, key, value)
-
-    def _reset_dirty_attributes(self):
-        self._dirty_attributes = set()
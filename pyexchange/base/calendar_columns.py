@@ -0,0 +1,80 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+from calendar import timegm
+
+# Column name and NumPy dtype, in order. Times are seconds since the epoch, UTC.
+EVENT_COLUMNS = (
+    (u'id', object),
+    (u'start', 'i8'),
+    (u'end', 'i8'),
+    (u'duration', 'i8'),
+    (u'is_all_day', '?'),
+    (u'availability', object),
+    (u'organizer_email', object),
+    (u'attendee_count', 'i4'),
+    (u'location', object),
+    (u'type', object),
+)
+
+
+def event_columns(events):
+    """
+    Turns a list of events into a dictionary of equal-length lists, one per column in
+    :data:`EVENT_COLUMNS`. Works on :class:`ExchangeEventRecord` tuples as well as event objects,
+    and the result can go straight into ``pandas.DataFrame``.
+
+    Naive datetimes are treated as UTC. Events without a start or an end are left out, the same
+    as in :class:`ExchangeEventIndex`.
+    """
+    columns = dict((name, []) for name, _ in EVENT_COLUMNS)
+
+    ids = columns[u'id']
+    starts = columns[u'start']
+    ends = columns[u'end']
+    durations = columns[u'duration']
+    all_day = columns[u'is_all_day']
+    availability = columns[u'availability']
+    organizer_emails = columns[u'organizer_email']
+    attendee_counts = columns[u'attendee_count']
+    locations = columns[u'location']
+    types = columns[u'type']
+
+    for event in events:
+        if event.start is None or event.end is None:
+            continue
+
+        # utctimetuple() leaves naive datetimes alone, which is what we want
+        start = timegm(event.start.utctimetuple())
+        end = timegm(event.end.utctimetuple())
+        organizer = event.organizer
+
+        ids.append(event.id)
+        starts.append(start)
+        ends.append(end)
+        durations.append(end - start)
+        all_day.append(bool(event.is_all_day))
+        availability.append(event.availability)
+        organizer_emails.append(organizer.email if organizer is not None else None)
+        attendee_counts.append(len(event.attendees or ()))
+        locations.append(event.location)
+        types.append(event.type)
+
+    return columns
+
+
+def event_arrays(events):
+    """
+    Same as :func:`event_columns`, but each column is a NumPy array - int64 for the times. Every
+    array is its own contiguous buffer, so the numeric and boolean columns can go to ``pyarrow``
+    without a copy; the text columns are object arrays, which it has to convert.
+
+    Requires NumPy, which pyexchange doesn't otherwise depend on.
+    """
+    import numpy
+
+    columns = event_columns(events)
+    return dict((name, numpy.array(columns[name], dtype=column_type)) for name, column_type in EVENT_COLUMNS)
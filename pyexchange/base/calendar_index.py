@@ -0,0 +1,243 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import random
+
+from ..utils import convert_datetime_to_utc
+
+
+class _IntervalNode(object):
+    __slots__ = ('start', 'end', 'order', 'key', 'event', 'priority', 'left', 'right', 'max_end')
+
+    def __init__(self, start, end, order, key, event):
+        self.start = start
+        self.end = end
+        self.order = order
+        self.key = key
+        self.event = event
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        self.max_end = end
+
+    def sort_key(self):
+        return (self.start, self.order)
+
+    def refresh(self):
+        max_end = self.end
+        if self.left is not None and self.left.max_end > max_end:
+            max_end = self.left.max_end
+        if self.right is not None and self.right.max_end > max_end:
+            max_end = self.right.max_end
+        self.max_end = max_end
+
+
+class ExchangeEventIndex(object):
+    """
+    In-memory interval index over calendar events, for answering overlap and conflict
+    questions without going back to the Exchange server. ::
+
+        events = service.calendar().list_events(start=start, end=end)
+        index = events.index()
+
+        for event in index.overlapping(proposed_start, proposed_end):
+          print event.subject
+
+    Events are treated as half-open intervals, so a meeting ending at 10:00 doesn't
+    conflict with one starting at 10:00. Naive datetimes are assumed to be UTC.
+
+    Internally this is a randomized balanced tree ordered by start time, where every node
+    also knows the latest end time in its subtree. Queries skip any subtree that ends before
+    the window, so they cost a logarithmic descent plus the events actually returned.
+
+    Events without a start or end can't be placed on the timeline and are ignored.
+    """
+
+    def __init__(self, events=None):
+        self._root = None
+        self._nodes = {}
+        self._order = 0
+
+        for event in events or []:
+            self.add(event)
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, event):
+        return self._key_for(event) in self._nodes
+
+    def __iter__(self):
+        return iter(self._walk())
+
+    def add(self, event):
+        """
+        Adds an event to the index. If the event is already indexed, it's re-indexed at its
+        current start and end, so this is also the way to record a moved event.
+        """
+        key = self._key_for(event)
+
+        if key in self._nodes:
+            self._root = self._remove(self._root, self._nodes.pop(key))
+
+        if event.start is None or event.end is None:
+            return self
+
+        self._order += 1
+        node = _IntervalNode(
+            start=convert_datetime_to_utc(event.start),
+            end=convert_datetime_to_utc(event.end),
+            order=self._order,
+            key=key,
+            event=event,
+        )
+        self._nodes[key] = node
+        self._root = self._insert(self._root, node)
+
+        return self
+
+    # Moving an event is just re-adding it with its new times.
+    update = add
+
+    def remove(self, event):
+        """ Removes an event (for example, one that was cancelled) from the index. Unknown events are ignored. """
+        node = self._nodes.pop(self._key_for(event), None)
+
+        if node is not None:
+            self._root = self._remove(self._root, node)
+
+        return self
+
+    def overlapping(self, start, end):
+        """ Returns all indexed events that overlap the window from *start* to *end*, ordered by start time. """
+        return self._search(convert_datetime_to_utc(start), convert_datetime_to_utc(end), inclusive=False)
+
+    def at(self, point_in_time):
+        """ Returns all indexed events that are happening at *point_in_time*, ordered by start time. """
+        point_in_time = convert_datetime_to_utc(point_in_time)
+        return self._search(point_in_time, point_in_time, inclusive=True)
+
+    def conflicts_for(self, event):
+        """
+        Returns all indexed events that overlap *event*, not including *event* itself.
+        The event doesn't need to be in the index, so this works for proposed times too.
+        """
+        if event.start is None or event.end is None:
+            return []
+
+        key = self._key_for(event)
+        return [other for other in self.overlapping(event.start, event.end) if self._key_for(other) != key]
+
+    def _key_for(self, event):
+        # Events that haven't been saved to Exchange don't have an id yet.
+        if event.id is not None:
+            return event.id
+        return id(event)
+
+    def _walk(self):
+        result = []
+        stack = []
+        node = self._root
+
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+
+            node = stack.pop()
+            result.append(node.event)
+            node = node.right
+
+        return result
+
+    def _search(self, start, end, inclusive):
+        result = []
+        stack = []
+        node = self._root
+
+        # In-order walk, skipping subtrees that end before the window starts
+        # and stopping at the first event that starts after the window ends.
+        while stack or node is not None:
+            while node is not None and node.max_end > start:
+                stack.append(node)
+                node = node.left
+
+            if not stack:
+                break
+
+            node = stack.pop()
+
+            if node.start > end or (node.start == end and not inclusive):
+                break
+
+            if node.end > start:
+                result.append(node.event)
+
+            node = node.right
+
+        return result
+
+    def _insert(self, root, node):
+        if root is None:
+            return node
+
+        if node.sort_key() < root.sort_key():
+            root.left = self._insert(root.left, node)
+            if root.left.priority > root.priority:
+                root = self._rotate_right(root)
+        else:
+            root.right = self._insert(root.right, node)
+            if root.right.priority > root.priority:
+                root = self._rotate_left(root)
+
+        root.refresh()
+        return root
+
+    def _remove(self, root, node):
+        if root is None:
+            return None
+
+        if root is node:
+            return self._merge(root.left, root.right)
+
+        if node.sort_key() < root.sort_key():
+            root.left = self._remove(root.left, node)
+        else:
+            root.right = self._remove(root.right, node)
+
+        root.refresh()
+        return root
+
+    def _merge(self, left, right):
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            left.refresh()
+            return left
+        else:
+            right.left = self._merge(left, right.left)
+            right.refresh()
+            return right
+
+    def _rotate_right(self, root):
+        pivot = root.left
+        root.left = pivot.right
+        pivot.right = root
+        root.refresh()
+        pivot.refresh()
+        return pivot
+
+    def _rotate_left(self, root):
+        pivot = root.right
+        root.right = pivot.left
+        pivot.left = root
+        root.refresh()
+        pivot.refresh()
+        return pivot
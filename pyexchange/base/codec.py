@@ -0,0 +1,468 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import json
+import struct
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from pytz import utc
+
+from .calendar import ExchangeEventOrganizer, ExchangeEventRecord, ExchangeEventResponse
+from ..compat import BASESTRING_TYPES, BINARY_TYPE, INTEGER_TYPES, IS_PYTHON3, TEXT_TYPE
+from ..exceptions import InvalidEventData
+from ..utils import convert_datetime_to_utc
+
+# Bump this whenever EVENT_FIELDS or the way a field is encoded changes.
+EVENT_SCHEMA_VERSION = 1
+
+# Field order is part of the binary format, so changing it means a new schema version.
+EVENT_FIELDS = (
+    u'id', u'change_key', u'subject', u'start', u'end', u'location', u'availability', u'html_body', u'text_body',
+    u'type', u'reminder_minutes_before_start', u'is_all_day', u'recurrence', u'recurrence_end_date',
+    u'recurrence_interval', u'recurrence_days', u'organizer', u'attendees', u'resources', u'conflicting_event_ids',
+)
+
+DATETIME_FIELDS = frozenset([u'start', u'end'])
+DATE_FIELDS = frozenset([u'recurrence_end_date'])
+RESPONSE_LIST_FIELDS = frozenset([u'attendees', u'resources'])
+
+JSON_DATETIME_FORMAT = u'%Y-%m-%dT%H:%M:%SZ'
+JSON_DATETIME_FORMAT_MICROSECONDS = u'%Y-%m-%dT%H:%M:%S.%fZ'
+JSON_DATE_FORMAT = u'%Y-%m-%d'
+
+EPOCH = datetime(1970, 1, 1, tzinfo=utc)
+
+# The msgpack package, if it's installed, is much faster than the MessagePack code at the bottom of
+# this file, and writes the same bytes. On python 2 it would write byte strings as binary, so we
+# don't use it there.
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+if not IS_PYTHON3:
+    msgpack = None
+
+# What corrupt or truncated input makes decoding trip over. RuntimeError covers RecursionError, which
+# python 2 doesn't have.
+DECODING_ERRORS = (ValueError, TypeError, IndexError, KeyError, AttributeError, OverflowError, RuntimeError)
+if msgpack is not None:
+    DECODING_ERRORS += (msgpack.UnpackException,)
+
+
+def event_to_json(event):
+    """
+    Encodes an event - either an event object or an :class:`ExchangeEventRecord` - as a JSON string.
+    Times are written as UTC ISO 8601 strings, and unset properties are left out.
+    """
+    return json.dumps(_json_document(event), sort_keys=True)
+
+
+def event_from_json(data):
+    """ Decodes a string from :func:`event_to_json` back into an :class:`ExchangeEventRecord`. """
+    with _decoding():
+        return _record_from_json_document(json.loads(data))
+
+
+def events_to_json(events):
+    """
+    Encodes a list of events as a JSON array, a chunk at a time, so a large list never has to be
+    held in memory as one string. ::
+
+        for chunk in events_to_json(event_list.events):
+            stream.write(chunk)
+    """
+    yield u'['
+    for index, event in enumerate(events):
+        if index:
+            yield u','
+        yield event_to_json(event)
+    yield u']'
+
+
+def events_from_json(data):
+    """ Decodes a JSON array from :func:`events_to_json` into a list of :class:`ExchangeEventRecord`. """
+    with _decoding():
+        return [_record_from_json_document(document) for document in json.loads(data)]
+
+
+def event_to_msgpack(event):
+    """
+    Encodes an event as MessagePack bytes. The event is a positional array, starting with the schema
+    version, so it's a good deal smaller than the JSON. Times are microseconds since the epoch.
+    """
+    if msgpack is not None:
+        return msgpack.packb(_binary_document(event), use_bin_type=True)
+
+    out = []
+    _pack(_binary_document(event), out)
+    return b''.join(out)
+
+
+def event_from_msgpack(data):
+    """ Decodes bytes from :func:`event_to_msgpack` back into an :class:`ExchangeEventRecord`. """
+    with _decoding():
+        documents = _unpack_all(data)
+        if len(documents) != 1:
+            raise InvalidEventData(u"Trailing data after the encoded event" if documents else u"Truncated MessagePack data")
+
+        return _record_from_binary_document(documents[0])
+
+
+def events_to_msgpack(events):
+    """
+    Encodes a list of events as a stream of MessagePack values, yielding the bytes for one event at a
+    time. Concatenate the chunks and read them back with :func:`events_from_msgpack`.
+    """
+    for event in events:
+        yield event_to_msgpack(event)
+
+
+def events_from_msgpack(data):
+    """ Decodes a stream written by :func:`events_to_msgpack` into a list of :class:`ExchangeEventRecord`. """
+    with _decoding():
+        return [_record_from_binary_document(document) for document in _unpack_all(data)]
+
+
+@contextmanager
+def _decoding():
+    """ Turns whatever corrupt input makes the decoders fall over into :class:`InvalidEventData`. """
+    try:
+        yield
+    except InvalidEventData:
+        raise
+    except DECODING_ERRORS as err:
+        raise InvalidEventData(u"Unable to decode event data: {0!r}".format(err))
+
+
+def _unpack_all(data):
+    """ Every MessagePack value in *data*, which must hold nothing else. """
+    data = bytes(data)
+
+    if msgpack is None:
+        unpacker = _Unpacker(data)
+        documents = []
+        while not unpacker.at_end():
+            documents.append(unpacker.unpack())
+        return documents
+
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False, max_buffer_size=max(len(data), 1))
+    unpacker.feed(data)
+    documents = list(unpacker)
+    if unpacker.tell() != len(data):
+        raise InvalidEventData(u"Truncated MessagePack data")
+    return documents
+
+
+def _json_document(event):
+    document = {u'v': EVENT_SCHEMA_VERSION}
+
+    for field in EVENT_FIELDS:
+        value = getattr(event, field, None)
+        if value is None or (isinstance(value, (list, tuple)) and not value):
+            continue
+
+        if field in DATETIME_FIELDS:
+            value = _datetime_to_string(value)
+        elif field in DATE_FIELDS:
+            value = value.strftime(JSON_DATE_FORMAT)
+        elif field == u'organizer':
+            value = [value.name, value.email]
+        elif field in RESPONSE_LIST_FIELDS:
+            value = [_response_to_list(response, _datetime_to_string) for response in value]
+        elif field == u'conflicting_event_ids':
+            value = list(value)
+
+        document[field] = value
+
+    return document
+
+
+def _record_from_json_document(document):
+    if not isinstance(document, dict) or document.get(u'v') != EVENT_SCHEMA_VERSION:
+        raise InvalidEventData(u"Unsupported event schema version: {0}".format(_version_of(document)))
+
+    properties = {}
+    for field in EVENT_FIELDS:
+        value = document.get(field)
+        if value is None:
+            continue
+
+        if field in DATETIME_FIELDS:
+            value = _datetime_from_string(value)
+        elif field in DATE_FIELDS:
+            value = datetime.strptime(value, JSON_DATE_FORMAT).date()
+
+        properties[field] = value
+
+    return _make_record(properties, _datetime_from_string)
+
+
+def _binary_document(event):
+    document = [EVENT_SCHEMA_VERSION]
+
+    for field in EVENT_FIELDS:
+        value = getattr(event, field, None)
+
+        if value is None:
+            pass
+        elif field in DATETIME_FIELDS:
+            value = _datetime_to_microseconds(value)
+        elif field in DATE_FIELDS:
+            value = value.toordinal()
+        elif field == u'organizer':
+            value = [value.name, value.email]
+        elif field in RESPONSE_LIST_FIELDS:
+            value = [_response_to_list(response, _datetime_to_microseconds) for response in value]
+
+        document.append(value)
+
+    return document
+
+
+def _record_from_binary_document(document):
+    if not isinstance(document, list) or not document or document[0] != EVENT_SCHEMA_VERSION:
+        raise InvalidEventData(u"Unsupported event schema version: {0}".format(_version_of(document)))
+
+    if len(document) != len(EVENT_FIELDS) + 1:
+        raise InvalidEventData(u"Expected {0} event fields, got {1}".format(len(EVENT_FIELDS), len(document) - 1))
+
+    properties = {}
+    for field, value in zip(EVENT_FIELDS, document[1:]):
+        if value is None:
+            continue
+
+        if field in DATETIME_FIELDS:
+            value = _datetime_from_microseconds(value)
+        elif field in DATE_FIELDS:
+            value = date.fromordinal(value)
+
+        properties[field] = value
+
+    return _make_record(properties, _datetime_from_microseconds)
+
+
+def _make_record(properties, parse_datetime):
+    organizer = properties.get(u'organizer')
+    if organizer is not None:
+        properties[u'organizer'] = ExchangeEventOrganizer(name=organizer[0], email=organizer[1])
+
+    for field in RESPONSE_LIST_FIELDS:
+        properties[field] = tuple(_response_from_list(response, parse_datetime) for response in properties.get(field) or ())
+
+    properties[u'conflicting_event_ids'] = list(properties.get(u'conflicting_event_ids') or [])
+
+    return ExchangeEventRecord._make(properties.get(field) for field in ExchangeEventRecord._fields)
+
+
+def _response_to_list(response, format_datetime):
+    last_response = response.last_response
+    if last_response is not None:
+        last_response = format_datetime(last_response)
+
+    return [response.name, response.email, response.response, last_response, response.required]
+
+
+def _response_from_list(response, parse_datetime):
+    name, email, response_type, last_response, required = response
+    if last_response is not None:
+        last_response = parse_datetime(last_response)
+
+    return ExchangeEventResponse(name=name, email=email, response=response_type, last_response=last_response, required=required)
+
+
+def _version_of(document):
+    if isinstance(document, dict):
+        return document.get(u'v')
+    if isinstance(document, list) and document:
+        return document[0]
+    return None
+
+
+def _datetime_to_string(value):
+    value = convert_datetime_to_utc(value)
+    if value.microsecond:
+        return value.strftime(JSON_DATETIME_FORMAT_MICROSECONDS)
+    return value.strftime(JSON_DATETIME_FORMAT)
+
+
+def _datetime_from_string(value):
+    if u'.' in value:
+        return datetime.strptime(value, JSON_DATETIME_FORMAT_MICROSECONDS).replace(tzinfo=utc)
+    return datetime.strptime(value, JSON_DATETIME_FORMAT).replace(tzinfo=utc)
+
+
+def _datetime_to_microseconds(value):
+    delta = convert_datetime_to_utc(value) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _datetime_from_microseconds(value):
+    return EPOCH + timedelta(microseconds=value)
+
+
+# A small MessagePack implementation, covering just the types events need: nil, booleans, integers,
+# floats, strings, binary, arrays and maps. The output can be read by any MessagePack library.
+
+def _pack(value, out):
+    if value is None:
+        out.append(b'\xc0')
+    elif value is True:
+        out.append(b'\xc3')
+    elif value is False:
+        out.append(b'\xc2')
+    elif isinstance(value, INTEGER_TYPES):
+        _pack_integer(value, out)
+    elif isinstance(value, float):
+        out.append(struct.pack('>Bd', 0xcb, value))
+    elif isinstance(value, BASESTRING_TYPES):
+        # On python 2, byte strings coming out of lxml are text too
+        encoded = value.encode('utf-8') if isinstance(value, TEXT_TYPE) else value
+        _pack_length(len(encoded), out, 0xa0, 32, 0xd9, 0xda, 0xdb)
+        out.append(encoded)
+    elif isinstance(value, (BINARY_TYPE, bytearray)):
+        _pack_length(len(value), out, None, 0, 0xc4, 0xc5, 0xc6)
+        out.append(bytes(value))
+    elif isinstance(value, (list, tuple)):
+        _pack_length(len(value), out, 0x90, 16, None, 0xdc, 0xdd)
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        _pack_length(len(value), out, 0x80, 16, None, 0xde, 0xdf)
+        for key in value:
+            _pack(key, out)
+            _pack(value[key], out)
+    else:
+        raise TypeError(u"Can't encode {0!r} as MessagePack".format(value))
+
+
+def _pack_integer(value, out):
+    if 0 <= value < 0x80:
+        out.append(struct.pack('>B', value))
+    elif -0x20 <= value < 0:
+        out.append(struct.pack('>b', value))
+    elif value >= 0:
+        if value <= 0xff:
+            out.append(struct.pack('>BB', 0xcc, value))
+        elif value <= 0xffff:
+            out.append(struct.pack('>BH', 0xcd, value))
+        elif value <= 0xffffffff:
+            out.append(struct.pack('>BI', 0xce, value))
+        elif value <= 0xffffffffffffffff:
+            out.append(struct.pack('>BQ', 0xcf, value))
+        else:
+            raise OverflowError(u"Integer too large for MessagePack: {0}".format(value))
+    else:
+        if value >= -0x80:
+            out.append(struct.pack('>Bb', 0xd0, value))
+        elif value >= -0x8000:
+            out.append(struct.pack('>Bh', 0xd1, value))
+        elif value >= -0x80000000:
+            out.append(struct.pack('>Bi', 0xd2, value))
+        elif value >= -0x8000000000000000:
+            out.append(struct.pack('>Bq', 0xd3, value))
+        else:
+            raise OverflowError(u"Integer too small for MessagePack: {0}".format(value))
+
+
+def _pack_length(length, out, fix_marker, fix_limit, marker8, marker16, marker32):
+    if fix_marker is not None and length < fix_limit:
+        out.append(struct.pack('>B', fix_marker | length))
+    elif marker8 is not None and length <= 0xff:
+        out.append(struct.pack('>BB', marker8, length))
+    elif length <= 0xffff:
+        out.append(struct.pack('>BH', marker16, length))
+    else:
+        out.append(struct.pack('>BI', marker32, length))
+
+
+# marker: (struct format, size) for fixed-width scalars
+_SCALARS = {
+    0xcc: ('>B', 1), 0xcd: ('>H', 2), 0xce: ('>I', 4), 0xcf: ('>Q', 8),
+    0xd0: ('>b', 1), 0xd1: ('>h', 2), 0xd2: ('>i', 4), 0xd3: ('>q', 8),
+    0xca: ('>f', 4), 0xcb: ('>d', 8),
+}
+
+# marker: (struct format of the length, size of the length) for strings, binary, arrays and maps
+_LENGTHS = {
+    0xd9: ('>B', 1), 0xda: ('>H', 2), 0xdb: ('>I', 4),
+    0xc4: ('>B', 1), 0xc5: ('>H', 2), 0xc6: ('>I', 4),
+    0xdc: ('>H', 2), 0xdd: ('>I', 4),
+    0xde: ('>H', 2), 0xdf: ('>I', 4),
+}
+
+
+class _Unpacker(object):
+
+    def __init__(self, data):
+        self.data = bytes(data)
+        self.markers = bytearray(self.data)
+        self.position = 0
+
+    def at_end(self):
+        return self.position >= len(self.data)
+
+    def _read(self, size):
+        start = self.position
+        end = start + size
+        if end > len(self.data):
+            raise InvalidEventData(u"Truncated MessagePack data")
+        self.position = end
+        return self.data[start:end]
+
+    def _read_struct(self, format, size):
+        return struct.unpack(format, self._read(size))[0]
+
+    def unpack(self):
+        if self.at_end():
+            raise InvalidEventData(u"Truncated MessagePack data")
+
+        marker = self.markers[self.position]
+        self.position += 1
+
+        if marker <= 0x7f:
+            return marker
+        if marker >= 0xe0:
+            return marker - 0x100
+        if 0xa0 <= marker <= 0xbf:
+            return self._read(marker & 0x1f).decode('utf-8')
+        if 0x90 <= marker <= 0x9f:
+            return self._unpack_array(marker & 0x0f)
+        if 0x80 <= marker <= 0x8f:
+            return self._unpack_map(marker & 0x0f)
+
+        if marker == 0xc0:
+            return None
+        if marker == 0xc2:
+            return False
+        if marker == 0xc3:
+            return True
+
+        if marker in _SCALARS:
+            return self._read_struct(*_SCALARS[marker])
+
+        if marker in _LENGTHS:
+            length = self._read_struct(*_LENGTHS[marker])
+            if marker in (0xd9, 0xda, 0xdb):
+                return self._read(length).decode('utf-8')
+            if marker in (0xc4, 0xc5, 0xc6):
+                return self._read(length)
+            if marker in (0xdc, 0xdd):
+                return self._unpack_array(length)
+            return self._unpack_map(length)
+
+        raise InvalidEventData(u"Unsupported MessagePack type 0x{0:02x}".format(marker))
+
+    def _unpack_array(self, length):
+        return [self.unpack() for _ in range(length)]
+
+    def _unpack_map(self, length):
+        result = {}
+        for _ in range(length):
+            key = self.unpack()
+            result[key] = self.unpack()
+        return result
@@ -1,3 +1,15 @@
+from collections import namedtuple
+
+from .model import BaseExchangeModel, ExchangeField
+
+# A read-only contact, straight from the server - see find_contacts(as_records=True)
+ExchangeContactRecord = namedtuple('ExchangeContactRecord', [
+    'id', 'change_key', 'folder_id', 'first_name', 'last_name', 'full_name', 'display_name', 'sort_name',
+    'email_address1', 'email_address2', 'email_address3', 'birthday', 'job_title', 'department', 'primary_phone',
+    'business_phone', 'home_phone', 'mobile_phone',
+])
+
+
 class BaseExchangeContactService(object):
     def __init__(self, service, folder_id):
         self.service = service
@@ -10,31 +22,28 @@ class BaseExchangeContactService(object):
         raise NotImplementedError
 
 
-class BaseExchangeContactItem(object):
-    _id = None
-    _change_key = None
-
-    _service = None
-    folder_id = None
-
-    _track_dirty_attributes = False
-    _dirty_attributes = set()  # any attributes that have changed, and we need to update in Exchange
-
-    first_name = None
-    last_name = None
-    full_name = None
-    display_name = None
-    sort_name = None
-    email_address1 = None
-    email_address2 = None
-    email_address3 = None
-    birthday = None
-    job_title = None
-    department = None
-    primary_phone = None
-    business_phone = None
-    home_phone = None
-    mobile_phone = None
+class BaseExchangeContactItem(BaseExchangeModel):
+    _id = ExchangeField()
+    _change_key = ExchangeField()
+
+    service = ExchangeField()
+    folder_id = ExchangeField()
+
+    first_name = ExchangeField()
+    last_name = ExchangeField()
+    full_name = ExchangeField()
+    display_name = ExchangeField()
+    sort_name = ExchangeField()
+    email_address1 = ExchangeField()
+    email_address2 = ExchangeField()
+    email_address3 = ExchangeField()
+    birthday = ExchangeField()
+    job_title = ExchangeField()
+    department = ExchangeField()
+    primary_phone = ExchangeField()
+    business_phone = ExchangeField()
+    home_phone = ExchangeField()
+    mobile_phone = ExchangeField()
 
     def __init__(self, service, id=None, xml=None, folder_id=None, **kwargs):
         self.service = service
@@ -72,22 +81,6 @@ class BaseExchangeContactItem(object):
         """ **Read-only.** When you change a contact, Exchange makes you pass a change key to prevent overwriting a previous version. """
         return self._change_key
 
-    def _update_properties(self, properties):
-        self._track_dirty_attributes = False
-        for key in properties:
-            setattr(self, key, properties[key])
-        self._track_dirty_attributes = True
-
-    def __setattr__(self, key, value):
-        """ Magically track public attributes, so we can track what we need to flush to the Exchange store """
-        if self._track_dirty_attributes and not key.startswith(u"_"):
-            self._dirty_attributes.add(key)
-
-        object.__setattr__(self, key, value)
-
-    def _reset_dirty_attributes(self):
-        self._dirty_attributes = set()
-
     def validate(self):
         """ Validates that all required fields are present """
         if not self.display_name:
@@ -0,0 +1,32 @@
+from collections import namedtuple
+
+# A mailbox as Exchange's directory describes it - see resolve_names() and expand_dl()
+ExchangeMailbox = namedtuple('ExchangeMailbox', ['name', 'email', 'routing_type', 'mailbox_type'])
+
+# Mailbox types that are distribution lists, and so can be expanded
+DISTRIBUTION_LIST_TYPES = (u'PublicDL', u'PrivateDL')
+
+# A stretch of time a mailbox is taken, with its free/busy status (Busy, Tentative, OOF or NoData)
+ExchangeBusyPeriod = namedtuple('ExchangeBusyPeriod', ['start', 'end', 'busy_type'])
+
+# What a room (or anyone) has on over a window. If Exchange couldn't tell us, busy_periods is
+# empty and error is the exception it gave instead.
+ExchangeAvailability = namedtuple('ExchangeAvailability', ['email', 'busy_periods', 'error'])
+
+
+class BaseExchangeRoomService(object):
+    def __init__(self, service, refresh_interval=3600):
+        self.service = service
+        self.refresh_interval = refresh_interval
+
+    def room_lists(self):
+        raise NotImplementedError
+
+    def rooms(self, room_list=None):
+        raise NotImplementedError
+
+    def availability(self, rooms, start, end):
+        raise NotImplementedError
+
+    def refresh(self):
+        raise NotImplementedError
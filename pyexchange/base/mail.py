@@ -1,5 +1,14 @@
 # -*- coding: utf-8 -*-
 import base64
+from collections import namedtuple
+
+from .model import BaseExchangeModel, ExchangeField
+
+# A read-only mail, straight from the server - see list_mails(as_records=True)
+ExchangeMailRecord = namedtuple('ExchangeMailRecord', [
+    'id', 'change_key', 'subject', 'sender_mail', 'sender_name', 'from_mail', 'from_name', 'culture',
+    'has_attachments', 'size', 'importance', 'received',
+])
 
 
 class BaseExchangeMailService(object):
@@ -8,33 +17,34 @@ class BaseExchangeMailService(object):
         self.folder_id = folder_id
 
 
-class BaseExchangeMailItem(object):
-    _id = None
-    _change_key = None
-    _service = None
-    folder_id = None
-
-    _track_dirty_attributes = False
-    _dirty_attributes = set()  # any attributes that have changed, and we need to update in Exchange
-
-    subject = None
-    email_address = None
-    sender_name = None
-    sender_email = None
-    from_name = None
-    from_email = None
-    culture = None
-    has_attachments = None
-    size = None
-    importance = None
-    received = None
+class BaseExchangeMailItem(BaseExchangeModel):
+    _id = ExchangeField()
+    _change_key = ExchangeField()
+    service = ExchangeField()
+    folder_id = ExchangeField()
+
+    subject = ExchangeField()
+    email_address = ExchangeField()
+    sender_name = ExchangeField()
+    sender_email = ExchangeField()
+    from_name = ExchangeField()
+    from_email = ExchangeField()
+    culture = ExchangeField()
+    has_attachments = ExchangeField()
+    size = ExchangeField()
+    importance = ExchangeField()
+    received = ExchangeField()
+    # as parsed out of the Exchange response
+    sender_mail = ExchangeField()
+    from_mail = ExchangeField()
+    mail_body = ExchangeField()
     # extended properties
-    datetime_sent = None
-    datetime_created = None
-    mimecontent = None  # base64 encoded
-    attachments = []
-    recipients_to = []
-    recipients_cc = []
+    datetime_sent = ExchangeField()
+    datetime_created = ExchangeField()
+    mimecontent = ExchangeField()  # base64 encoded
+    attachments = ExchangeField(default_factory=list)
+    recipients_to = ExchangeField(default_factory=list)
+    recipients_cc = ExchangeField(default_factory=list)
 
     @property
     def sender(self):
@@ -73,20 +83,3 @@ class BaseExchangeMailItem(object):
     def change_key(self):
         """ **Read-only.** When you change a contact, Exchange makes you pass a change key to prevent overwriting a previous version. """
         return self._change_key
-
-    def _update_properties(self, properties):
-        self._track_dirty_attributes = False
-        for key in properties:
-            setattr(self, key, properties[key])
-        self._track_dirty_attributes = True
-
-    def __setattr__(self, key, value):
-        """ Magically track public attributes, so we can track what we need to flush to the Exchange store """
-        if self._track_dirty_attributes and not key.startswith(u"_"):
-            self._dirty_attributes.add(key)
-
-        object.__setattr__(self, key, value)
-
-    def _reset_dirty_attributes(self):
-        self._dirty_attributes = set()
-
@@ -0,0 +1,189 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+from ..compat import with_metaclass
+
+
+class ExchangeField(object):
+    """
+    An attribute on an Exchange item, stored in a slot on the instance.
+
+    Assigning to a public field records it as dirty (once the item has been loaded), so we know
+    what to flush to the Exchange store. Fields whose name starts with an underscore are never tracked.
+
+    If the field has never been assigned, reading it returns *default*, or a fresh value from
+    *default_factory* for mutable defaults like lists and dicts. Items built lazily from XML parse
+    the field out of the retained element instead, the first time it's read.
+    """
+
+    __slots__ = ('name', 'default', 'default_factory', 'storage', 'tracked')
+
+    def __init__(self, default=None, default_factory=None):
+        self.name = None
+        self.default = default
+        self.default_factory = default_factory
+        self.storage = None
+        self.tracked = False
+
+    def _bind(self, name, storage):
+        self.name = name
+        self.storage = storage
+        self.tracked = not name.startswith(u'_')
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        try:
+            return self.storage.__get__(instance, owner)
+        except AttributeError:
+            return self._missing(instance)
+
+    def __set__(self, instance, value):
+        self.storage.__set__(instance, value)
+
+        if self.tracked and instance._track_dirty_attributes:
+            instance._dirty_attributes.add(self.name)
+
+    def __delete__(self, instance):
+        try:
+            self.storage.__delete__(instance)
+        except AttributeError:
+            pass
+
+    def _missing(self, instance):
+        source = getattr(instance, '_source', None)
+        if source is not None:
+            loader = instance._lazy_loader(self.name)
+            if loader is not None:
+                value = loader(instance, source)
+                if value is None:
+                    # Not in the XML - the same as an eagerly loaded item, which never sets it
+                    value = self._default()
+                self.storage.__set__(instance, value)
+                return value
+
+        if self.default_factory is None:
+            return self.default
+
+        value = self.default_factory()
+        self.storage.__set__(instance, value)
+        return value
+
+    def _default(self):
+        return self.default if self.default_factory is None else self.default_factory()
+
+
+class ExchangeModelMeta(type):
+    """
+    Turns every :class:`ExchangeField` declared on a class into a slot, so items don't carry a
+    per-instance ``__dict__``. Subclasses that don't declare any slots of their own get an empty
+    ``__slots__`` automatically, otherwise they would quietly bring the ``__dict__`` back.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        fields = dict((key, value) for key, value in namespace.items() if isinstance(value, ExchangeField))
+
+        slots = tuple(namespace.get('__slots__', ()))
+        namespace['__slots__'] = slots + tuple(_storage_name(key) for key in sorted(fields))
+
+        cls = super(ExchangeModelMeta, mcs).__new__(mcs, name, bases, namespace)
+
+        for key, field in fields.items():
+            field._bind(key, cls.__dict__[_storage_name(key)])
+
+        all_fields = {}
+        for base in reversed(cls.__mro__[1:]):
+            all_fields.update(getattr(base, '_fields', {}))
+        all_fields.update(fields)
+        cls._fields = all_fields
+
+        return cls
+
+
+def _storage_name(key):
+    return '_slot_' + key
+
+
+class BaseExchangeModel(with_metaclass(ExchangeModelMeta, object)):
+    """ Base class for Exchange items, providing compact storage and dirty attribute tracking. """
+
+    __slots__ = ('_dirty', '_source', '__weakref__')
+
+    _track_dirty_attributes = ExchangeField(False)
+
+    @property
+    def _dirty_attributes(self):
+        """ Any attributes that have changed, and we need to update in Exchange. """
+        try:
+            dirty = self._dirty
+        except AttributeError:
+            dirty = None
+
+        # Most items are only ever read, so don't pay for a set until something changes
+        if dirty is None:
+            dirty = self._dirty = set()
+
+        return dirty
+
+    @_dirty_attributes.setter
+    def _dirty_attributes(self, value):
+        self._dirty = value
+
+    def _update_properties(self, properties):
+        fields = self._fields
+
+        self._track_dirty_attributes = False
+        for key in properties:
+            field = fields.get(key)
+            if field is not None:
+                # Write straight into the slot - there's nothing to track while loading.
+                field.storage.__set__(self, properties[key])
+            else:
+                setattr(self, key, properties[key])
+        self._track_dirty_attributes = True
+
+    def _reset_dirty_attributes(self):
+        self._dirty = None
+
+    def _lazy_loader(self, name):
+        """
+        For items that keep the XML they were built from, returns a function ``loader(item, source)``
+        that parses field *name* out of it, or None if the field can't be loaded lazily.
+        """
+        return None
+
+    def materialize(self):
+        """
+        Parses any lazily loaded fields that haven't been read yet, then drops the reference to the
+        XML they came from, so the response document can be garbage collected.
+
+        Does nothing for items that were loaded eagerly.
+        """
+        source = getattr(self, '_source', None)
+        if source is not None:
+            for name, field in self._fields.items():
+                if self._lazy_loader(name) is not None:
+                    field.__get__(self, type(self))
+            self._source = None
+
+        return self
+
+    def __getstate__(self):
+        """ Implemented so pickle.dumps() and pickle.loads() work """
+        self.materialize()
+
+        state = {}
+        for key, field in self._fields.items():
+            try:
+                state[key] = field.storage.__get__(self, type(self))
+            except AttributeError:
+                pass
+        return state
+
+    def __setstate__(self, state):
+        self._update_properties(dict((key, value) for key, value in state.items() if hasattr(type(self), key)))
+        self._reset_dirty_attributes()
@@ -5,6 +5,7 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
 import logging
+import threading
 
 from lxml import etree
 from lxml.builder import ElementMaker
@@ -20,30 +21,70 @@ S = ElementMaker(namespace=SOAP_NS, nsmap=SOAP_NAMESPACES)
 
 log = logging.getLogger('pyexchange')
 
+_parsers = threading.local()
+
+
+def response_parser(huge_tree=False):
+    """
+    This thread's parser for responses from Exchange. An lxml parser can't be used by two threads at
+    once, but can be used again and again, so each thread makes its own the first time it needs one.
+
+    The parser doesn't expand entities or load anything over the network, so a response can't make
+    us read files or swell to many times its size. It drops whitespace between elements, and doesn't
+    index ``xml:id`` attributes, which we never look up. *huge_tree* lifts libxml2's limits on how
+    deep and how big a document can be - only for servers you trust.
+    """
+    parsers = getattr(_parsers, 'parsers', None)
+    if parsers is None:
+        parsers = _parsers.parsers = {}
+
+    parser = parsers.get(huge_tree)
+    if parser is None:
+        parser = parsers[huge_tree] = etree.XMLParser(
+            remove_blank_text=True,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=huge_tree,
+            collect_ids=False,
+        )
+    return parser
+
 
 class ExchangeServiceSOAP(object):
 
     EXCHANGE_DATE_FORMAT = u"%Y-%m-%dT%H:%M:%SZ"
 
-    def __init__(self, connection):
+    def __init__(self, connection, huge_tree=False):
         self.connection = connection
+        self.huge_tree = huge_tree
 
-    def send(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8"):
+    def send(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8", check_errors=True):
         request_xml = self._wrap_soap_xml_request(xml)
-        log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
+        if log.isEnabledFor(logging.INFO):
+            if isinstance(request_xml, bytes):
+                log.info(request_xml)
+            elif etree.iselement(request_xml):
+                log.info(etree.tostring(request_xml, encoding=encoding, pretty_print=True))
+            else:
+                log.info(u'Streaming the request body')
         response = self._send_soap_request(request_xml, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
-        return self._parse(response, encoding=encoding)
+        return self._parse(response, encoding=encoding, check_errors=check_errors)
 
-    def _parse(self, response, encoding="utf-8"):
+    def _parse(self, response, encoding="utf-8", check_errors=True):
 
         try:
-            tree = etree.XML(response.encode(encoding))
+            tree = etree.XML(response.encode(encoding), response_parser(self.huge_tree))
         except (etree.XMLSyntaxError, TypeError) as err:
             raise FailedExchangeException(u"Unable to parse response from Exchange - check your login information. Error: %s" % err)
 
-        self._check_for_errors(tree)
+        if check_errors:
+            self._check_for_errors(tree)
+        else:
+            # The caller will look at the response codes itself, but a SOAP fault means nothing worked
+            self._check_for_SOAP_fault(tree)
 
-        log.info(etree.tostring(tree, encoding=encoding, pretty_print=True))
+        if log.isEnabledFor(logging.INFO):
+            log.info(etree.tostring(tree, encoding=encoding, pretty_print=True))
         return tree
 
     def _check_for_errors(self, xml_tree):
@@ -60,7 +101,8 @@ class ExchangeServiceSOAP(object):
             raise FailedExchangeException(u"SOAP Fault from Exchange server", fault.text)
 
     def _send_soap_request(self, xml, headers=None, retries=2, timeout=30, encoding="utf-8"):
-        body = etree.tostring(xml, encoding=encoding)
+        # Requests from a template come already serialized, and streamed ones are serialized as they go
+        body = etree.tostring(xml, encoding=encoding) if etree.iselement(xml) else xml
 
         response = self.connection.send(body, headers, retries, timeout)
         return response
@@ -95,7 +137,9 @@ class ExchangeServiceSOAP(object):
 
         result = {}
 
-        log.info(etree.tostring(element, pretty_print=True))
+        # Serializing the element is expensive, so only do it if someone will see it
+        if log.isEnabledFor(logging.INFO):
+            log.info(etree.tostring(element, pretty_print=True))
 
         for key in property_map:
             item = property_map[key]
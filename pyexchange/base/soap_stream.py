@@ -0,0 +1,129 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+from contextlib import contextmanager
+
+from lxml import etree
+
+CHUNK_SIZE = 64 * 1024
+
+
+class SOAPRequestStream(object):
+    """
+    A SOAP request body that's written out as it's sent, rather than built as one tree first. ::
+
+        def write(xf):
+            with xf.element(M_GET_ITEM, nsmap=...):
+                ...
+                for id in ids:
+                    write_item(xf, T.ItemId(Id=id))
+                    yield
+
+        SOAPRequestStream(u'GetItem', write)
+
+    *write* is a generator function that's handed an ``etree.xmlfile`` to write the operation element
+    into, and writes each item with :func:`write_item`. It yields after each item, which is where what's been written is handed on once there's
+    ``chunk_size`` of it. Only one item at a time is ever held as elements, however many the request
+    carries.
+
+    A stream can be written any number of times - it's written again if the request is retried - so
+    whatever *write* iterates over should be a list, not a generator.
+    """
+
+    __slots__ = ('operation', 'write', 'chunk_size')
+
+    def __init__(self, operation, write, chunk_size=CHUNK_SIZE):
+        self.operation = operation
+        self.write = write
+        self.chunk_size = chunk_size
+
+    def chunks(self):
+        """ Yields the body as UTF-8 bytes, in pieces of about ``chunk_size``. """
+        output = _ChunkBuffer()
+
+        with etree.xmlfile(output, encoding=u'utf-8') as xf:
+            for _ in self.write(_StreamWriter(xf, output)):
+                if output.size >= self.chunk_size:
+                    yield output.take()
+
+        if output.size:
+            yield output.take()
+
+    def element(self):
+        """ The body as an element, for anything that needs a tree rather than bytes. """
+        return etree.fromstring(b''.join(self.chunks()))
+
+
+def write_item(xf, element):
+    """
+    Writes *element* into *xf*, declaring only the namespaces it uses that the elements it's written
+    inside don't already declare - ``xf.write()`` would declare them all again on every item.
+    """
+    # Every declaration the element needs ends up on its own start tag
+    etree.cleanup_namespaces(element, top_nsmap={element.prefix: etree.QName(element).namespace})
+    serialized = etree.tostring(element, encoding=u'utf-8', xml_declaration=False)
+
+    # Nothing in the start tag can be a '>' - lxml escapes it in attribute values
+    end = serialized.index(b'>')
+    start_tag = serialized[:end]
+    for prefix, namespace in element.nsmap.items():
+        if xf.declared.get(prefix) == namespace:
+            attribute = u'xmlns:%s' % prefix if prefix is not None else u'xmlns'
+            start_tag = start_tag.replace((u' %s="%s"' % (attribute, namespace)).encode(u'utf-8'), b'', 1)
+
+    xf.write_serialized(start_tag + serialized[end:])
+
+
+class _StreamWriter(object):
+    """
+    What *write* is handed: the ``etree.xmlfile``, plus the namespaces the elements open in it declare,
+    and a way for :func:`write_item` to write what it's serialized itself.
+    """
+
+    def __init__(self, xf, output):
+        self.xf = xf
+        self.output = output
+        self.declared = {}
+
+    @contextmanager
+    def element(self, tag, attrib=None, nsmap=None, **extra):
+        outer = self.declared
+        if nsmap:
+            self.declared = dict(outer)
+            self.declared.update(nsmap)
+
+        try:
+            with self.xf.element(tag, attrib, nsmap=nsmap, **extra):
+                yield
+        finally:
+            self.declared = outer
+
+    def write(self, *args, **kwargs):
+        self.xf.write(*args, **kwargs)
+
+    def write_serialized(self, data):
+        # What xf has buffered goes first
+        self.xf.flush()
+        self.output.write(data)
+
+
+class _ChunkBuffer(object):
+    """ Where ``etree.xmlfile`` writes to: collects what it's given until it's taken. """
+
+    def __init__(self):
+        self.pieces = []
+        self.size = 0
+
+    def write(self, data):
+        if data:
+            self.pieces.append(data)
+            self.size += len(data)
+
+    def take(self):
+        chunk = b''.join(self.pieces)
+        self.pieces = []
+        self.size = 0
+        return chunk
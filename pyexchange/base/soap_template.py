@@ -0,0 +1,155 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import re
+
+from lxml import etree
+
+from ..compat import BINARY_TYPE, _unicode
+from .soap import S, SOAP_NS
+
+# Private use characters mark the holes while a template is being compiled. They can't turn up in
+# anything we build templates from, and lxml writes them out as they are.
+_VALUE = u'\ue000%s\ue003'
+_EACH_START = u'\ue001%s\ue003'
+_EACH_END = u'\ue002%s\ue003'
+_MARKER = re.compile(u'([\ue000-\ue002])([^\ue003]*)\ue003')
+
+_BODY = u'\ue004'
+
+# What lxml won't put in a document
+_INVALID_CHARACTERS = re.compile(u'[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+_ATTRIBUTE_ESCAPES = ((u'&', u'&amp;'), (u'<', u'&lt;'), (u'>', u'&gt;'), (u'"', u'&quot;'),
+                      (u'\n', u'&#10;'), (u'\r', u'&#13;'), (u'\t', u'&#9;'))
+_TEXT_ESCAPES = ((u'&', u'&amp;'), (u'<', u'&lt;'), (u'>', u'&gt;'), (u'\r', u'&#13;'))
+
+
+class SOAPRequestBody(object):
+    """ A SOAP request body that's already been serialized (as UTF-8), and the name of its operation. """
+
+    __slots__ = ('operation', 'body')
+
+    def __init__(self, operation, body):
+        self.operation = operation
+        self.body = body
+
+    def element(self):
+        """ The body as an element, for anything that needs a tree rather than bytes. """
+        return etree.fromstring(self.body)
+
+
+class SOAPTemplate(object):
+    """
+    A request shape that's built and serialized once, with holes for the values that change. ::
+
+        GET_ITEM = SOAPTemplate(lambda hole: M.GetItem(
+            M.ItemShape(T.BaseShape(hole(u'format'))),
+            M.ItemIds(*hole.each(u'ids', lambda id: T.ItemId(Id=id))),
+        ))
+        GET_ITEM.render(format=u'IdOnly', ids=[u'AAA', u'BBB'])
+
+    *build* is called once with a :class:`TemplateHoles`, and returns the request's operation element.
+    A hole can be a whole attribute value or a whole text node; ``hole.each`` repeats an element for
+    each value in a list. Rendering escapes the values the way lxml would, so the bytes are the same
+    as building the same request with ElementMaker and serializing it inside a SOAP envelope.
+    """
+
+    def __init__(self, build):
+        element = build(TemplateHoles())
+        self.operation = etree.QName(element).localname
+
+        # Serialized inside an envelope, so namespace declarations come out as they do in a real request
+        envelope = etree.tostring(S.Envelope(S.Body(element)), encoding=u'utf-8').decode(u'utf-8')
+        body = envelope[envelope.index(u'<s:Body>') + len(u'<s:Body>'):envelope.rindex(u'</s:Body>')]
+
+        self.parts = _compile(body)
+
+    def render(self, **values):
+        """ Returns a :class:`SOAPRequestBody` with the holes filled in from *values*. """
+        return SOAPRequestBody(self.operation, u''.join(_render(self.parts, values)).encode(u'utf-8'))
+
+
+class TemplateHoles(object):
+    """ Makes the placeholders a :class:`SOAPTemplate` is built with. """
+
+    def __call__(self, name):
+        return _VALUE % name
+
+    def each(self, name, build):
+        """ Repeats ``build(hole)`` for each value of *name*, which is a list. Use it as ``*hole.each(...)``. """
+        return [_EACH_START % name, build(_VALUE % name), _EACH_END % name]
+
+
+def envelope_parts(envelope):
+    """
+    Splits a serialized SOAP envelope around its body. *envelope* is an ``S.Envelope`` element whose
+    ``S.Body`` holds nothing yet. Returns the UTF-8 bytes before and after where the body goes.
+    """
+    envelope.find(u'{%s}Body' % SOAP_NS).text = _BODY
+    before, after = etree.tostring(envelope, encoding=u'utf-8').decode(u'utf-8').split(_BODY)
+    return before.encode(u'utf-8'), after.encode(u'utf-8')
+
+
+def _compile(text):
+    """ Turns serialized text with markers in it into a list of literal strings and holes. """
+    parts = []
+    stack = [parts]
+    position = 0
+
+    for match in _MARKER.finditer(text):
+        literal = text[position:match.start()]
+        if literal:
+            stack[-1].append(literal)
+        position = match.end()
+
+        kind, name = match.group(1), match.group(2)
+        if kind == u'\ue000':
+            # A hole's value is the whole attribute value, or else the whole text node
+            stack[-1].append((name, _ATTRIBUTE_ESCAPES if literal.endswith(u'="') else _TEXT_ESCAPES))
+        elif kind == u'\ue001':
+            repeated = []
+            stack[-1].append((name, repeated))
+            stack.append(repeated)
+        else:
+            stack.pop()
+
+    if text[position:]:
+        parts.append(text[position:])
+
+    return parts
+
+
+def _render(parts, values):
+    for part in parts:
+        if not isinstance(part, tuple):
+            yield part
+            continue
+
+        name, rule = part
+        if isinstance(rule, list):
+            for value in values[name]:
+                scoped = dict(values)
+                scoped[name] = value
+                for piece in _render(rule, scoped):
+                    yield piece
+        else:
+            yield _escape(values[name], rule)
+
+
+def _escape(value, escapes):
+    if isinstance(value, BINARY_TYPE):
+        value = value.decode(u'ascii')
+    elif not isinstance(value, type(u'')):
+        value = _unicode(value)
+
+    if _INVALID_CHARACTERS.search(value):
+        raise ValueError(u'All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters')
+
+    for character, escaped in escapes:
+        if character in value:
+            value = value.replace(character, escaped)
+    return value
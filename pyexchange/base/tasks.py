@@ -1,3 +1,15 @@
+from collections import namedtuple
+
+from .model import BaseExchangeModel, ExchangeField
+
+# A read-only task, straight from the server - see get_all_tasks(as_records=True)
+ExchangeTaskRecord = namedtuple('ExchangeTaskRecord', [
+    'id', 'change_key', 'folder_id', 'subject', 'body', 'categories', 'is_draft', 'sent_at', 'created_at',
+    'due_date', 'is_complete', 'owner', 'start_date', 'status', 'status_description', 'last_modified_by',
+    'last_modified_at',
+])
+
+
 class BaseExchangeTaskService(object):
     def __init__(self, service, folder_id):
         self.service = service
@@ -10,31 +22,28 @@ class BaseExchangeTaskService(object):
         raise NotImplementedError
 
 
-class BaseExchangeTaskItem(object):
-    _id = None
-    _change_key = None
-
-    _service = None
-    folder_id = None
-
-    _track_dirty_attributes = False
-    _dirty_attributes = set()  # any attributes that have changed, and we need to update in Exchange
-
-    subject = None
-    body = None
-    categories = None
-    is_draft = None
-    sent_at = None
-    created_at = None
-    due_date = None
-    recurrence = None
-    is_complete = None
-    owner = None
-    start_date = None
-    status = None
-    status_description = None
-    last_modified_by = None
-    last_modified_at = None
+class BaseExchangeTaskItem(BaseExchangeModel):
+    _id = ExchangeField()
+    _change_key = ExchangeField()
+
+    service = ExchangeField()
+    folder_id = ExchangeField()
+
+    subject = ExchangeField()
+    body = ExchangeField()
+    categories = ExchangeField()
+    is_draft = ExchangeField()
+    sent_at = ExchangeField()
+    created_at = ExchangeField()
+    due_date = ExchangeField()
+    recurrence = ExchangeField()
+    is_complete = ExchangeField()
+    owner = ExchangeField()
+    start_date = ExchangeField()
+    status = ExchangeField()
+    status_description = ExchangeField()
+    last_modified_by = ExchangeField()
+    last_modified_at = ExchangeField()
 
     def __init__(self, service, id=None, xml=None, folder_id=None, **kwargs):
         self.service = service
@@ -72,22 +81,6 @@ class BaseExchangeTaskItem(object):
         """ **Read-only.** When you change a contact, Exchange makes you pass a change key to prevent overwriting a previous version. """
         return self._change_key
 
-    def _update_properties(self, properties):
-        self._track_dirty_attributes = False
-        for key in properties:
-            setattr(self, key, properties[key])
-        self._track_dirty_attributes = True
-
-    def __setattr__(self, key, value):
-        """ Magically track public attributes, so we can track what we need to flush to the Exchange store """
-        if self._track_dirty_attributes and not key.startswith(u"_"):
-            self._dirty_attributes.add(key)
-
-        object.__setattr__(self, key, value)
-
-    def _reset_dirty_attributes(self):
-        self._dirty_attributes = set()
-
     def validate(self):
         """ Validates that all required fields are present """
         if not self.display_name:
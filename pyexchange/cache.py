@@ -0,0 +1,378 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import hashlib
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+try:
+    from collections import OrderedDict
+except ImportError:  # python 2.6
+    from ordereddict import OrderedDict
+
+log = logging.getLogger('pyexchange')
+
+CachedItem = namedtuple('CachedItem', ['id', 'kind', 'change_key', 'properties', 'stored_at'])
+
+
+class ExchangeItemCache(object):
+    """
+    A local cache of items read from Exchange, keyed by ItemId. Each entry holds the item's parsed
+    properties and the change key they were read at.
+
+    Pass one to the service to use it::
+
+        service = Exchange2010Service(connection=connection, cache=ExchangeItemCache(path='/var/tmp/exchange.db'))
+
+    Entries younger than *ttl* seconds are served as they are. Older entries are checked against
+    the server (by change key) before they're used - see :meth:`Exchange2010Service.revalidate_cache`.
+
+    The most recently used *max_items* entries are kept in memory. If *path* is given, entries are
+    also written to an sqlite database there, which keeps at most *max_stored_items* of them, so the
+    cache survives restarts. Only point *path* at a file you control - entries are pickled.
+    """
+
+    def __init__(self, path=None, ttl=300, max_items=1000, max_stored_items=100000, clock=time.time):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.max_stored_items = max_stored_items
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.refetches = 0
+        self.evictions = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._database = None
+        self._stored = 0
+
+        if path is not None:
+            self._database = sqlite3.connect(path, check_same_thread=False)
+            self._database.execute(
+                u'CREATE TABLE IF NOT EXISTS items '
+                u'(id TEXT PRIMARY KEY, kind TEXT, change_key TEXT, properties BLOB, stored_at REAL)'
+            )
+            self._database.execute(u'CREATE INDEX IF NOT EXISTS items_stored_at ON items (stored_at)')
+            self._database.commit()
+            # Kept up to date as rows come and go, so puts don't have to count them
+            self._stored = self._database.execute(u'SELECT COUNT(*) FROM items').fetchone()[0]
+
+    def get(self, id):
+        """ Returns the :class:`CachedItem` for *id*, fresh or not, or None if we don't have it. """
+        with self._lock:
+            entry = self._memory.pop(id, None)
+            if entry is None and self._database is not None:
+                entry = self._load(id)
+
+            if entry is not None:
+                self._remember(entry)
+
+            return entry
+
+    def is_fresh(self, entry):
+        """ True if *entry* is recent enough to use without asking the server. """
+        return self.clock() - entry.stored_at < self.ttl
+
+    def put(self, id, kind, change_key, properties):
+        entry = CachedItem(id=id, kind=kind, change_key=change_key, properties=properties, stored_at=self.clock())
+
+        with self._lock:
+            self._memory.pop(id, None)
+            self._remember(entry)
+
+            if self._database is not None:
+                stored = self._database.execute(u'SELECT 1 FROM items WHERE id = ?', (id,)).fetchone()
+                self._database.execute(
+                    u'INSERT OR REPLACE INTO items (id, kind, change_key, properties, stored_at) VALUES (?, ?, ?, ?, ?)',
+                    (id, kind, change_key, sqlite3.Binary(pickle.dumps(properties, 2)), entry.stored_at),
+                )
+                if stored is None:
+                    self._stored += 1
+                self._prune_database()
+                self._database.commit()
+
+        return entry
+
+    def touch(self, id):
+        """ Marks *id* as fresh again, once the server has confirmed it hasn't changed. """
+        with self._lock:
+            entry = self.get(id)
+            if entry is not None:
+                entry = entry._replace(stored_at=self.clock())
+                self._memory[id] = entry
+
+                if self._database is not None:
+                    self._database.execute(u'UPDATE items SET stored_at = ? WHERE id = ?', (entry.stored_at, id))
+                    self._database.commit()
+
+            return entry
+
+    def invalidate(self, id):
+        with self._lock:
+            self._memory.pop(id, None)
+
+            if self._database is not None:
+                self._stored -= self._database.execute(u'DELETE FROM items WHERE id = ?', (id,)).rowcount
+                self._database.commit()
+
+    def stale_ids(self):
+        """ Ids of every cached item that's past its TTL. """
+        cutoff = self.clock() - self.ttl
+
+        with self._lock:
+            ids = set(id for id, entry in self._memory.items() if entry.stored_at <= cutoff)
+
+            if self._database is not None:
+                rows = self._database.execute(u'SELECT id FROM items WHERE stored_at <= ?', (cutoff,))
+                # The database copy of something in memory may be older than the memory one
+                ids.update(row[0] for row in rows if row[0] not in self._memory)
+
+            return sorted(ids)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+            if self._database is not None:
+                self._database.execute(u'DELETE FROM items')
+                self._database.commit()
+                self._stored = 0
+
+    def stats(self):
+        """ Hit, miss, revalidation, refetch and eviction counts, plus the number of items in memory. """
+        return {
+            u'hits': self.hits,
+            u'misses': self.misses,
+            u'revalidations': self.revalidations,
+            u'refetches': self.refetches,
+            u'evictions': self.evictions,
+            u'size': len(self._memory),
+        }
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _remember(self, entry):
+        self._memory[entry.id] = entry
+
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _load(self, id):
+        row = self._database.execute(
+            u'SELECT kind, change_key, properties, stored_at FROM items WHERE id = ?', (id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        kind, change_key, properties, stored_at = row
+        try:
+            properties = pickle.loads(bytes(properties))
+        except Exception:
+            log.warning(u'Dropping unreadable cache entry for %s', id)
+            self._stored -= self._database.execute(u'DELETE FROM items WHERE id = ?', (id,)).rowcount
+            self._database.commit()
+            return None
+
+        return CachedItem(id=id, kind=kind, change_key=change_key, properties=properties, stored_at=stored_at)
+
+    def _prune_database(self):
+        excess = self._stored - self.max_stored_items
+
+        if excess > 0:
+            pruned = self._database.execute(
+                u'DELETE FROM items WHERE id IN (SELECT id FROM items ORDER BY stored_at LIMIT ?)', (excess,)
+            ).rowcount
+            self._stored -= pruned
+            self.evictions += pruned
+
+
+class ExchangeDirectoryCache(object):
+    """
+    An in-memory cache for directory lookups - resolved names, distribution list members and the
+    like - keyed by whatever the caller likes. Every service has one, as ``service.directory_cache``,
+    shared by all of its lookups.
+
+    Answers are kept for *ttl* seconds. Empty answers ("nobody by that name") are remembered too,
+    but only for *negative_ttl* seconds, so somebody who's just joined doesn't stay unresolvable for
+    long. At most *max_items* answers are kept, least recently used first out.
+    """
+
+    def __init__(self, ttl=3600, negative_ttl=300, max_items=10000, clock=time.time):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_items = max_items
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        """ Returns the answer cached for *key*, or None if there isn't one or it has expired. """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+            if entry is None or entry[1] <= self.clock():
+                self.misses += 1
+                return None
+
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        ttl = self.ttl if value else self.negative_ttl
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, self.clock() + ttl)
+
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Hit, miss and eviction counts, plus the number of answers held. """
+        return {
+            u'hits': self.hits,
+            u'misses': self.misses,
+            u'evictions': self.evictions,
+            u'size': len(self._entries),
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ExchangeResponseCache(object):
+    """
+    Keeps parsed responses to requests whose answers rarely change - by default GetFolder, FindFolder
+    and ConvertId. Pass one to the service to use it::
+
+        service = Exchange2010Service(connection=connection, response_cache=ExchangeResponseCache())
+
+    Responses are keyed by a hash of the request, the account and URL it was sent with and the mailbox
+    it was sent as, and kept for *ttl* seconds. At most *max_items* are kept, least recently used first out.
+
+    Folder changes sent through the service (CreateFolder, MoveFolder, DeleteFolder and so on - see
+    :attr:`INVALIDATED_BY`) drop the cached folder responses. Call :meth:`invalidate` if folders are
+    changed some other way.
+    """
+
+    OPERATIONS = frozenset([u'GetFolder', u'FindFolder', u'ConvertId'])
+
+    FOLDER_OPERATIONS = frozenset([u'GetFolder', u'FindFolder'])
+
+    # Operation -> the cached operations whose answers it can change
+    INVALIDATED_BY = {
+        u'CreateFolder': FOLDER_OPERATIONS,
+        u'UpdateFolder': FOLDER_OPERATIONS,
+        u'MoveFolder': FOLDER_OPERATIONS,
+        u'CopyFolder': FOLDER_OPERATIONS,
+        u'DeleteFolder': FOLDER_OPERATIONS,
+        u'EmptyFolder': FOLDER_OPERATIONS,
+    }
+
+    def __init__(self, ttl=300, max_items=1000, operations=OPERATIONS, clock=time.time):
+        self.ttl = ttl
+        self.max_items = max_items
+        self.operations = frozenset(operations)
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def key(self, operation, identity, body):
+        """ The cache key for a request: its operation, who it's sent as, and a hash of *body*. """
+        return operation, identity, hashlib.sha1(body).hexdigest()
+
+    def get(self, key):
+        """ Returns the response cached for *key*, or None if there isn't one or it has expired. """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+            if entry is None or entry[1] <= self.clock():
+                self.misses += 1
+                return None
+
+            self._entries[key] = entry
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, response):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (response, self.clock() + self.ttl)
+
+            while len(self._entries) > self.max_items:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return response
+
+    def invalidate(self, operations=None):
+        """ Drops cached responses to *operations*, or every cached response if that isn't given. """
+        with self._lock:
+            if operations is None:
+                dropped = list(self._entries)
+            else:
+                dropped = [key for key in self._entries if key[0] in operations]
+
+            for key in dropped:
+                del self._entries[key]
+            self.invalidations += len(dropped)
+
+    def invalidate_for(self, operation):
+        """ Drops whatever a request for *operation* might have made out of date. """
+        operations = self.INVALIDATED_BY.get(operation)
+        if operations:
+            self.invalidate(operations)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """ Hit, miss, eviction and invalidation counts, plus the number of responses held. """
+        with self._lock:
+            return {
+                u'hits': self.hits,
+                u'misses': self.misses,
+                u'evictions': self.evictions,
+                u'invalidations': self.invalidations,
+                u'size': len(self._entries),
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,121 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import logging
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger('pyexchange')
+
+CLOSED = u'closed'
+OPEN = u'open'
+HALF_OPEN = u'half-open'
+
+
+class ExchangeCircuitBreaker(object):
+    """
+    Tracks how one Exchange endpoint is doing, so we can stop sending it requests while it's broken.
+
+    The breaker starts *closed*. It looks at the last *window* requests, and once it has seen at
+    least *minimum_calls*, it *opens* if *failure_rate* of them failed or *slow_call_rate* of them
+    took longer than *slow_call_seconds*. While it's open, :meth:`allow` says no. After
+    *open_seconds* it goes *half-open* and lets *half_open_calls* requests through to test the water:
+    if they all succeed (and aren't slow) it closes again, and if any fails it opens again.
+
+    It also keeps exponentially weighted moving averages of the endpoint's latency and error rate,
+    weighting each new request by *smoothing*, for :meth:`score`.
+    """
+
+    def __init__(self, window=20, minimum_calls=10, failure_rate=0.5, slow_call_seconds=10, slow_call_rate=0.8,
+                 open_seconds=30, half_open_calls=1, smoothing=0.2, clock=time.time):
+        self.window = window
+        self.minimum_calls = minimum_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.smoothing = smoothing
+        self.clock = clock
+
+        self.state = CLOSED
+        self.opened_at = None
+        self.times_opened = 0
+        self.latency = None
+        self.error_rate = 0.0
+        self.in_flight = 0
+
+        self._calls = deque(maxlen=window)
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """ True if a request may go to this endpoint now. Every allowed request must be :meth:`record`-ed. """
+        with self._lock:
+            if self.state == OPEN:
+                if self.clock() - self.opened_at < self.open_seconds:
+                    return False
+                self.state = HALF_OPEN
+                self._probes = self._probe_successes = 0
+
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    return False
+                self._probes += 1
+
+            self.in_flight += 1
+            return True
+
+    def record(self, succeeded, seconds):
+        """ Notes how an allowed request went: whether it *succeeded*, and how many *seconds* it took. """
+        slow = seconds >= self.slow_call_seconds
+
+        with self._lock:
+            self.in_flight = max(self.in_flight - 1, 0)
+
+            if self.latency is None:
+                self.latency = float(seconds)
+            else:
+                self.latency += self.smoothing * (seconds - self.latency)
+            self.error_rate += self.smoothing * ((0.0 if succeeded else 1.0) - self.error_rate)
+
+            if self.state == HALF_OPEN:
+                if succeeded and not slow:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self.state = CLOSED
+                        self._calls.clear()
+                else:
+                    self._open()
+                return
+
+            self._calls.append((not succeeded, slow))
+
+            if self.state == CLOSED and len(self._calls) >= self.minimum_calls:
+                failures = sum(1 for failed, _ in self._calls if failed)
+                slow_calls = sum(1 for _, was_slow in self._calls if was_slow)
+
+                if failures >= self.failure_rate * len(self._calls) or slow_calls >= self.slow_call_rate * len(self._calls):
+                    self._open()
+
+    def score(self):
+        """
+        How much we'd rather not use this endpoint: its average latency, inflated by its error rate -
+        failing one request in ten makes it look twice as slow - and by the requests it already has in
+        flight. Lower is better, and an endpoint we haven't heard from yet scores 0, so it gets tried.
+        """
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1 + 10 * self.error_rate) * (1 + self.in_flight)
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self.times_opened += 1
+        self._calls.clear()
+        log.warning(u'Circuit breaker opened - not sending requests here for %s seconds', self.open_seconds)
@@ -11,4 +11,19 @@ def _unicode(item):
     if IS_PYTHON3:
         return str(item)
     else:
-        return unicode(item)
\ No newline at end of file
+        return unicode(item)
+
+
+def with_metaclass(meta, *bases):
+    """ Creates a base class with a metaclass, in a way that works in both python 2 and 3. """
+    return meta('NewBase', bases, {})
+
+
+if IS_PYTHON3:
+    TEXT_TYPE = str
+    BINARY_TYPE = bytes
+    INTEGER_TYPES = (int,)
+else:
+    TEXT_TYPE = unicode  # noqa: F821
+    BINARY_TYPE = str
+    INTEGER_TYPES = (int, long)  # noqa: F821
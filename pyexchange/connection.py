@@ -5,33 +5,90 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
 import requests
+from requests.cookies import remove_cookie_by_name
+from requests.packages.urllib3.exceptions import NewConnectionError
 from requests_ntlm import HttpNtlmAuth
 
 import logging
+import threading
+import time
 
-from .exceptions import FailedExchangeException
+try:
+    from collections import OrderedDict
+except ImportError:  # python 2.6
+    from ordereddict import OrderedDict
+
+from .circuit_breaker import ExchangeCircuitBreaker, OPEN
+from .exceptions import FailedExchangeException, ExchangeCircuitOpenException, ExchangeEndpointUnavailableException
 
 log = logging.getLogger('pyexchange')
 
+# Exchange's front end sets this to say which back end server holds the mailbox a request was anchored to
+AFFINITY_COOKIE = u'X-BackEndOverrideCookie'
+
+
+def _never_connected(error):
+    """ True if a ConnectionError happened while connecting (refused, DNS, connect timeout), before anything was sent. """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+
+    reason = error.args[0] if error.args else None
+    # urllib3 wraps it in a MaxRetryError
+    reason = getattr(reason, 'reason', reason)
+    return isinstance(reason, NewConnectionError)
+
 
 class ExchangeBaseConnection(object):
     """ Base class for Exchange connections."""
 
+    # True if send() can take the body as an iterable of byte strings, and send it in chunks as it's
+    # produced. NTLM sends the body a second time once the handshake is done, so the connection we
+    # ship can't - a body streamed to it is written into a buffer first.
+    streams_request_bodies = False
+
     def send(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
         raise NotImplementedError
 
 
 class ExchangeNTLMAuthConnection(ExchangeBaseConnection):
-    """ Connection to Exchange that uses NTLM authentication """
-
-    def __init__(self, url, username, password, verify_certificate=True, **kwargs):
+    """
+    Connection to Exchange that uses NTLM authentication
+
+    Requests with an ``X-AnchorMailbox`` header (see :meth:`Exchange2010Service.anchor`) are pinned to
+    the back end server holding that mailbox: the affinity cookie Exchange sends back is remembered for
+    the mailbox (for the last *max_affinity_mailboxes* of them), and requests for mailboxes on the same
+    back end share a session, and so a pool of connections, of their own. At most
+    *max_affinity_sessions* of those are kept.
+
+    Each URL - *url*, then any *fallback_urls*, in that order - has an :class:`ExchangeCircuitBreaker`
+    built from the *circuit_breaker* settings. Requests go to the first URL whose breaker lets them
+    through, and move on to the next one if the server can't be reached at all. If every breaker is
+    open, we raise :class:`ExchangeCircuitOpenException` straight away, without sending anything.
+
+    With *prefer_fastest*, URLs are tried healthiest first instead, by each breaker's
+    :meth:`~ExchangeCircuitBreaker.score` - average latency, weighed down by recent errors. A server
+    that answers with a 5xx error or stops answering raises :class:`ExchangeEndpointUnavailableException`,
+    which the service's retry policy retries for reads, so those move to the next best URL without
+    the caller noticing.
+    """
+
+    def __init__(self, url, username, password, verify_certificate=True, max_affinity_sessions=32, max_affinity_mailboxes=10000,
+                 fallback_urls=None, circuit_breaker=None, prefer_fastest=False, **kwargs):
         self.url = url
+        self.urls = [url] + list(fallback_urls or [])
+        self.circuit_breakers = OrderedDict((u, ExchangeCircuitBreaker(**(circuit_breaker or {}))) for u in self.urls)
+        self.prefer_fastest = prefer_fastest
         self.username = username
         self.password = password
         self.verify_certificate = verify_certificate
+        self.max_affinity_sessions = max_affinity_sessions
+        self.max_affinity_mailboxes = max_affinity_mailboxes
         self.handler = None
         self.session = None
         self.password_manager = None
+        self.affinity = OrderedDict()
+        self.affinity_sessions = OrderedDict()
+        self._affinity_lock = threading.Lock()
 
     def build_password_manager(self):
         if self.password_manager:
@@ -56,19 +113,130 @@ class ExchangeNTLMAuthConnection(ExchangeBaseConnection):
 
         return self.session
 
+    def build_affinity_session(self, back_end):
+        log.debug(u'Constructing opener for back end %s', back_end)
+
+        session = requests.Session()
+        session.auth = self.build_password_manager()
+        session.cookies.set(AFFINITY_COOKIE, back_end)
+        session.back_end = back_end
+
+        return session
+
     def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
         if not self.session:
             self.session = self.build_session()
 
-        try:
-            response = self.session.post(self.url, data=body, headers=headers, verify = self.verify_certificate)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as err:
-            log.debug(err.response.content)
-            raise FailedExchangeException(u'Unable to connect to Exchange: %s' % err)
+        anchor = headers.get(u'X-AnchorMailbox') if headers else None
+        session = self._session_for(anchor)
+
+        response = last_error = None
+        for url, breaker in self._endpoints():
+            if not breaker.allow():
+                continue
+
+            try:
+                response = self._post(session, url, body, headers, timeout, breaker)
+                break
+            except requests.exceptions.ConnectionError as err:
+                if not _never_connected(err):
+                    # The connection dropped once the request was on its way, so the server may have acted
+                    # on it - sending it somewhere else could make the same change twice
+                    raise ExchangeEndpointUnavailableException(u'Unable to connect to Exchange: %s' % err, url=url)
+
+                # Nothing reached the server, so it's safe to try the next URL with anything
+                log.warning(u'Unable to connect to %s: %s', url, err)
+                last_error = err
+            except requests.exceptions.RequestException as err:
+                if err.response is not None:
+                    log.debug(err.response.content)
+                if isinstance(err, requests.exceptions.Timeout) or (err.response is not None and err.response.status_code >= 500):
+                    raise ExchangeEndpointUnavailableException(u'Unable to connect to Exchange: %s' % err, url=url,
+                                                               failover_available=self._can_fail_over(url))
+                raise FailedExchangeException(u'Unable to connect to Exchange: %s' % err)
+
+        if response is None:
+            if last_error is not None:
+                raise FailedExchangeException(u'Unable to connect to Exchange: %s' % last_error)
+            raise ExchangeCircuitOpenException(u'Every Exchange endpoint has had too many failures lately: %s' % u', '.join(self.urls))
+
+        if anchor is not None:
+            self._learn_affinity(anchor, response, session)
 
         log.info(u'Got response: {code}'.format(code=response.status_code))
         log.debug(u'Got response headers: {headers}'.format(headers=response.headers))
         log.debug(u'Got body: {body}'.format(body=response.text))
 
         return response.text
+
+    def _endpoints(self):
+        endpoints = list(self.circuit_breakers.items())
+        if self.prefer_fastest:
+            endpoints.sort(key=lambda endpoint: endpoint[1].score())
+        return endpoints
+
+    def _can_fail_over(self, failed_url):
+        if not self.prefer_fastest:
+            return False
+        failed_score = self.circuit_breakers[failed_url].score()
+        return any(
+            breaker.state != OPEN and breaker.score() < failed_score
+            for url, breaker in self.circuit_breakers.items() if url != failed_url
+        )
+
+    def _post(self, session, url, body, headers, timeout, breaker):
+        started = time.time()
+        succeeded = False
+
+        try:
+            response = session.post(url, data=body, headers=headers, timeout=timeout, verify=self.verify_certificate)
+            response.raise_for_status()
+            succeeded = True
+            return response
+        except requests.exceptions.HTTPError as err:
+            # A 4xx says something about the request, not about the server
+            succeeded = err.response is not None and err.response.status_code < 500
+            raise
+        finally:
+            breaker.record(succeeded, time.time() - started)
+
+    def _session_for(self, anchor):
+        if anchor is None:
+            return self.session
+
+        with self._affinity_lock:
+            back_end = self.affinity.pop(anchor.lower(), None)
+            if back_end is None:
+                return self.session
+            self.affinity[anchor.lower()] = back_end
+
+            session = self.affinity_sessions.pop(back_end, None)
+            if session is None:
+                session = self.build_affinity_session(back_end)
+            self.affinity_sessions[back_end] = session
+
+            while len(self.affinity_sessions) > self.max_affinity_sessions:
+                # Not closed - another thread may still be sending on it. Its connections go once it's collected.
+                self.affinity_sessions.popitem(last=False)
+
+            return session
+
+    def _learn_affinity(self, anchor, response, session):
+        back_end = response.cookies.get(AFFINITY_COOKIE)
+        if back_end is None:
+            return
+
+        if session is self.session:
+            # The shared session mustn't send this mailbox's back end along with everyone else's requests.
+            # Another thread's request might slip out with it first, which only costs that request a hop.
+            remove_cookie_by_name(self.session.cookies, AFFINITY_COOKIE)
+        elif back_end != session.back_end:
+            # The mailbox has moved - keep the session pointed at the back end it's for
+            session.cookies.set(AFFINITY_COOKIE, session.back_end)
+
+        with self._affinity_lock:
+            self.affinity.pop(anchor.lower(), None)
+            self.affinity[anchor.lower()] = back_end
+
+            while len(self.affinity) > self.max_affinity_mailboxes:
+                self.affinity.popitem(last=False)
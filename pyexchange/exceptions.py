@@ -39,6 +39,44 @@ class ExchangeInternalServerTransientErrorException(FailedExchangeException):
     pass
 
 
+class ExchangeServerBusyException(FailedExchangeException):
+    """
+    Raised when Exchange is throttling us - ErrorServerBusy and the other throttling codes.
+    back_off_milliseconds is how long Exchange asked us to wait before trying again, if it said.
+    """
+
+    def __init__(self, message, back_off_milliseconds=None):
+        super(ExchangeServerBusyException, self).__init__(message)
+        self.back_off_milliseconds = back_off_milliseconds
+
+
+class ExchangeCircuitOpenException(FailedExchangeException):
+    """Raised, without sending anything, when every endpoint we could use has had too many failures lately."""
+    pass
+
+
+class ExchangeEndpointUnavailableException(FailedExchangeException):
+    """
+    Raised when an Exchange server answers with a 5xx error or stops answering part way. url is the server's
+    URL, and failover_available says whether the connection has another one it would send a retry to.
+    """
+
+    def __init__(self, message, url=None, failover_available=False):
+        super(ExchangeEndpointUnavailableException, self).__init__(message)
+        self.url = url
+        self.failover_available = failover_available
+
+
+class ExchangeImpersonationDeniedException(FailedExchangeException):
+    """Raised when the account we're logged in as isn't allowed to impersonate the mailbox we asked for."""
+    pass
+
+
 class InvalidEventType(Exception):
     """Raised when a method for an event gets called on the wrong type of event."""
     pass
+
+
+class InvalidEventData(ValueError):
+    """Raised when serialized event data is corrupt, or was written with a schema version we don't understand."""
+    pass
@@ -5,28 +5,60 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
 
+import copy
 import logging
-from ..base.calendar import BaseExchangeCalendarEvent, BaseExchangeCalendarService, ExchangeEventOrganizer, ExchangeEventResponse
-from ..base.contacts import BaseExchangeContactService, BaseExchangeContactItem
+from ..base.calendar import BaseExchangeCalendarEvent, BaseExchangeCalendarService, ExchangeEventOrganizer, ExchangeEventResponse, ExchangeEventRecord, ExchangeMailboxEvents, ExchangeFanOutSummary
+from ..base.calendar_columns import event_columns, event_arrays
+from ..base.calendar_index import ExchangeEventIndex
+from ..base.codec import event_to_json, event_to_msgpack
+from ..base.directory import BaseExchangeRoomService, ExchangeMailbox, ExchangeBusyPeriod, ExchangeAvailability, DISTRIBUTION_LIST_TYPES
+from ..base.contacts import BaseExchangeContactService, BaseExchangeContactItem, ExchangeContactRecord
 from ..base.folder import BaseExchangeFolder, BaseExchangeFolderService
-from ..base.mail import BaseExchangeMailService, BaseExchangeMailItem
-from ..base.tasks import BaseExchangeTaskService, BaseExchangeTaskItem
+from ..base.mail import BaseExchangeMailService, BaseExchangeMailItem, ExchangeMailRecord
+from ..base.tasks import BaseExchangeTaskService, BaseExchangeTaskItem, ExchangeTaskRecord
 from ..base.soap import ExchangeServiceSOAP, S
-from ..exceptions import FailedExchangeException, ExchangeStaleChangeKeyException, ExchangeItemNotFoundException, ExchangeInternalServerTransientErrorException, ExchangeIrresolvableConflictException, InvalidEventType
+from ..base.soap_stream import SOAPRequestStream
+from ..base.soap_template import SOAPRequestBody, envelope_parts
+from ..exceptions import FailedExchangeException, ExchangeStaleChangeKeyException, ExchangeItemNotFoundException, ExchangeInternalServerTransientErrorException, ExchangeIrresolvableConflictException, ExchangeImpersonationDeniedException, ExchangeServerBusyException, InvalidEventType
+from ..cache import ExchangeDirectoryCache
 from ..compat import BASESTRING_TYPES
+from ..hedging import NOT_SENT
+from ..throttling import UNLIMITED
+from ..utils import SingleFlight, concurrent_map, convert_datetime_to_utc
 
 from . import soap_request
 
 from lxml import etree
 from copy import deepcopy
-from datetime import date
+from datetime import date, datetime, timedelta
+from pytz import utc
+import threading
+import time
 import warnings
 
 log = logging.getLogger("pyexchange")
 
+# Serialized envelopes for templated requests, by impersonation - see Exchange2010Service._envelope_parts
+_ENVELOPE_PARTS = {}
+MAX_CACHED_ENVELOPES = 1000
+
 
 class Exchange2010Service(ExchangeServiceSOAP):
 
+    def __init__(self, connection, cache=None, directory_cache=None, throttling=None, retry_policy=None, hedging=None, batch_window=None, response_cache=None, huge_tree=False):
+        super(Exchange2010Service, self).__init__(connection, huge_tree=huge_tree)
+        self.cache = cache
+        self.directory_cache = directory_cache if directory_cache is not None else ExchangeDirectoryCache()
+        self.throttling = throttling
+        self.retry_policy = retry_policy
+        self.hedging = hedging
+        self.response_cache = response_cache
+        self.single_flight = SingleFlight(share=deepcopy)
+        self.item_loader = Exchange2010ItemLoader(window=batch_window) if batch_window is not None else None
+        self.impersonation = None
+        self.anchor_mailbox = None
+        self._room_service = None
+
     def calendar(self, id="calendar"):
         return Exchange2010CalendarService(service=self, calendar_id=id)
 
@@ -42,6 +74,39 @@ class Exchange2010Service(ExchangeServiceSOAP):
     def tasks(self, folder_id="tasks"):
         return Exchange2010TaskService(service=self, folder_id=folder_id)
 
+    def impersonate(self, address, id_type=u'PrimarySmtpAddress'):
+        """
+        Returns a copy of this service whose requests act as *address*, using EWS impersonation. ::
+
+            their_events = service.impersonate(u'somebody@example.com').calendar().list_events(start, end)
+
+        The copy shares this service's connection and caches, so it's cheap to make one per mailbox
+        or per call. The account the connection logs in with needs the ApplicationImpersonation role.
+        *id_type* says what *address* is: PrimarySmtpAddress, SmtpAddress, PrincipalName or SID.
+        """
+        clone = self.anchor(address) if id_type in (u'PrimarySmtpAddress', u'SmtpAddress') else copy.copy(self)
+        clone.impersonation = (address, id_type)
+        clone._room_service = None
+        return clone
+
+    def anchor(self, address):
+        """
+        Returns a copy of this service whose requests say they're about *address*'s mailbox, with an
+        ``X-AnchorMailbox`` header. Exchange's front end can then send them straight to the back end
+        server holding that mailbox, and the connection keeps them there - see
+        :class:`ExchangeNTLMAuthConnection`. :meth:`impersonate` does this for you.
+        """
+        clone = copy.copy(self)
+        clone.anchor_mailbox = address
+        clone._room_service = None
+        return clone
+
+    def rooms(self):
+        """ The room directory. It's the same object every time, so the room lists it loads are shared. """
+        if self._room_service is None:
+            self._room_service = Exchange2010RoomService(service=self)
+        return self._room_service
+
     def convert_id(self, from_id, destination_format, format='EwsId',
                    mailbox='a@b.com'):
         body = soap_request.convert_id(from_id, destination_format,
@@ -49,23 +114,280 @@ class Exchange2010Service(ExchangeServiceSOAP):
         response = self.send(body)
         return response.xpath(u'//m:ConvertIdResponseMessage/m:AlternateId/@Id')
 
+    def resolve_names(self, queries, max_workers=8):
+        """
+        Resolves names, aliases or partial addresses into mailboxes. Returns a dictionary of
+        query -> list of :class:`ExchangeMailbox`, which is empty if nothing matched. ::
+
+            service.resolve_names([u'jsmith', u'Jane Doe'])
+
+        Queries that only differ in case or surrounding space are looked up once. EWS resolves one
+        entry per request, so each query that isn't in ``directory_cache`` costs one request; they're
+        sent concurrently on up to *max_workers* threads.
+        """
+        if isinstance(queries, BASESTRING_TYPES):
+            queries = [queries]
+
+        keys = dict((query, _directory_key(query)) for query in queries)
+        answers = {}
+        to_resolve = {}
+
+        for query, key in keys.items():
+            if key in answers or key in to_resolve:
+                continue
+
+            cached = self.directory_cache.get((u'resolve', key))
+            if cached is None:
+                to_resolve[key] = query.strip()
+            else:
+                answers[key] = cached
+
+        for query, mailboxes, error in concurrent_map(self._resolve_name, to_resolve.values(), max_workers=max_workers):
+            if error is not None:
+                raise error
+            key = _directory_key(query)
+            answers[key] = self.directory_cache.put((u'resolve', key), mailboxes)
+
+        return dict((query, list(answers[key])) for query, key in keys.items())
+
+    def _resolve_name(self, query):
+        response = self.send(soap_request.resolve_names(query), check_errors=False)
+
+        # More than one match comes back as a warning, but the matches are all there
+        if _directory_response_code(response, u'm:ResolveNamesResponseMessage', u'ErrorNameResolutionMultipleResults') is None:
+            return ()
+
+        return tuple(_parse_mailbox(node) for node in response.xpath(u'//t:Resolution/t:Mailbox', namespaces=soap_request.NAMESPACES))
+
+    def expand_dl(self, address, recursive=True, max_workers=8):
+        """
+        Returns the members of a distribution list, as :class:`ExchangeMailbox` tuples. ::
+
+            service.expand_dl(u'all-hands@example.com')
+
+        By default nested lists are expanded too, one level at a time with the lists at each level
+        fetched concurrently on up to *max_workers* threads, and only the mailboxes that aren't lists
+        are returned, each once. Lists that contain each other are fine. With ``recursive=False``, you
+        get the list's direct members, nested lists included.
+
+        Every list's direct members are kept in ``directory_cache``, so overlapping lists are only
+        fetched once. An address that isn't a distribution list has no members.
+        """
+        if not recursive:
+            return list(self._distribution_list_members(address))
+
+        seen_lists = set([_directory_key(address)])
+        seen_members = set()
+        members = []
+        level = [address]
+
+        while level:
+            expanded = {}
+            for list_address, result, error in concurrent_map(self._distribution_list_members, level, max_workers=max_workers):
+                if error is not None:
+                    raise error
+                expanded[list_address] = result
+
+            next_level = []
+            for list_address in level:
+                for mailbox in expanded[list_address]:
+                    # Private lists live in someone's contacts and have no address to expand them by
+                    if mailbox.mailbox_type in DISTRIBUTION_LIST_TYPES and mailbox.email:
+                        key = _directory_key(mailbox.email)
+                        if key not in seen_lists:
+                            seen_lists.add(key)
+                            next_level.append(mailbox.email)
+                    else:
+                        key = _directory_key(mailbox.email or mailbox.name or u'')
+                        if key not in seen_members:
+                            seen_members.add(key)
+                            members.append(mailbox)
+
+            level = next_level
+
+        return members
+
+    def _distribution_list_members(self, address):
+        key = (u'expand', _directory_key(address))
+        members = self.directory_cache.get(key)
+
+        if members is None:
+            response = self.send(soap_request.expand_dl(address.strip()), check_errors=False)
+
+            if _directory_response_code(response, u'm:ExpandDLResponseMessage') is None:
+                members = ()
+            else:
+                members = tuple(_parse_mailbox(node) for node in response.xpath(u'//m:DLExpansion/t:Mailbox', namespaces=soap_request.NAMESPACES))
+
+            self.directory_cache.put(key, members)
+
+        return members
+
+    def list_events_for(self, mailboxes, start, end, max_workers=8, fields=None, as_records=True, impersonate=False):
+        """
+        Lists the events between *start* and *end* in each of *mailboxes*' calendars, on up to
+        *max_workers* threads. ::
+
+            fan_out = service.list_events_for(mailboxes, start, end, fields=[u'start', u'end', u'availability'])
+            for result in fan_out:
+                if result.error is None:
+                    dashboard.add(result.mailbox, result.events)
+            print(fan_out.summary().failures)
+
+        Iterating gives an :class:`ExchangeMailboxEvents` per mailbox as each one finishes. A mailbox
+        that fails doesn't stop the others - its error is on its result and in :meth:`summary`.
+        Events are :class:`ExchangeEventRecord` tuples unless *as_records* is False, and *fields*
+        works as it does for ``list_events``. Nothing is sent until you start iterating or ask for the summary.
+
+        Calendars are read with delegate access, unless *impersonate* is set, in which case each
+        mailbox is read as itself - see :meth:`impersonate`.
+        """
+        return Exchange2010CalendarFanOut(self, mailboxes, start, end, max_workers=max_workers, fields=fields, as_records=as_records, impersonate=impersonate)
+
+    def send(self, xml, headers=None, retries=4, timeout=30, encoding="utf-8", check_errors=True):
+        """
+        Sends a request. If ``throttling`` is set, it waits for a slot first: requests acting as an
+        impersonated mailbox are limited by that mailbox's budget, the rest by the account we log in as.
+
+        If ``retry_policy`` is set, requests that only read are sent again on transient errors, as it
+        allows, and if ``hedging`` is set, the operations it covers get a second copy sent when they're slow.
+
+        If the same read, for the same mailbox, is already on its way from another thread, we wait
+        for its answer instead of sending another one, and get our own copy of the response. Reads
+        that ``response_cache`` covers are answered from it while they're fresh, and changes drop the
+        cached answers they affect.
+
+        A :class:`SOAPRequestStream` is written out as it's sent, if the connection can take a body in
+        pieces, and otherwise into one buffer first. Either way it's never shared with other threads or
+        cached, since that would mean holding all of it.
+        """
+        key = self.impersonation[0] if self.impersonation is not None else getattr(self.connection, 'username', None)
+        limiter = self.throttling.limiter_for(key) if self.throttling is not None else UNLIMITED
+
+        def with_retries(function, idempotent):
+            if self.retry_policy is None:
+                return function()
+            return self.retry_policy.call(function, idempotent=idempotent)
+
+        def send_now(request):
+            return super(Exchange2010Service, self).send(request, headers=headers, retries=retries, timeout=timeout, encoding=encoding, check_errors=check_errors)
+
+        def send_once():
+            with limiter.request():
+                return send_now(xml)
+
+        if isinstance(xml, (SOAPRequestBody, SOAPRequestStream)) and encoding.lower().replace(u'-', u'') != u'utf8':
+            xml = xml.element()
+
+        operation = xml.operation if isinstance(xml, (SOAPRequestBody, SOAPRequestStream)) else etree.QName(xml).localname
+
+        if self.hedging is not None and operation in self.hedging.operations and operation in IDEMPOTENT_OPERATIONS:
+            def copy():
+                # Both copies can be in flight at once, and putting an element in an envelope moves it
+                return deepcopy(xml) if etree.iselement(xml) else xml
+
+            def primary():
+                with limiter.request():
+                    return send_now(copy())
+
+            def hedge():
+                # A hedge that has to wait for a slot is too late to help, and would hold up somebody else
+                with limiter.request(timeout=0) as acquired:
+                    return send_now(copy()) if acquired else NOT_SENT
+
+            def attempt():
+                return self.hedging.call(primary, hedge)
+        else:
+            attempt = send_once
+
+        if operation not in IDEMPOTENT_OPERATIONS:
+            try:
+                return with_retries(attempt, idempotent=False)
+            finally:
+                # Even a failed change may have changed something
+                if self.response_cache is not None:
+                    self.response_cache.invalidate_for(operation)
+
+        if isinstance(xml, SOAPRequestStream):
+            return with_retries(attempt, idempotent=True)
+
+        # Who's asking, and where - services with different logins or servers can share a cache
+        identity = (getattr(self.connection, 'username', None), getattr(self.connection, 'url', None),
+                    self.impersonation, self.anchor_mailbox, check_errors)
+        body = xml.body if isinstance(xml, SOAPRequestBody) else etree.tostring(xml, method='c14n')
+
+        cache, cache_key = self.response_cache, None
+        if cache is not None and operation in cache.operations:
+            cache_key = cache.key(operation, identity, body)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return deepcopy(cached)
+
+        response = self.single_flight.do(identity + (body,), lambda: with_retries(attempt, idempotent=True))
+
+        if cache_key is not None:
+            cache.put(cache_key, deepcopy(response))
+        return response
+
     def _send_soap_request(self, body, headers=None, retries=2, timeout=30, encoding="utf-8"):
         headers = {
             "Accept": "text/xml",
             "Content-type": "text/xml; charset=%s " % encoding
         }
+        if self.anchor_mailbox is not None:
+            headers["X-AnchorMailbox"] = self.anchor_mailbox
+            headers["X-PreferServerAffinity"] = "true"
         return super(Exchange2010Service, self)._send_soap_request(body, headers=headers, retries=retries, timeout=timeout, encoding=encoding)
 
     def _wrap_soap_xml_request(self, exchange_xml):
+        if isinstance(exchange_xml, SOAPRequestBody):
+            before, after = self._envelope_parts()
+            return before + exchange_xml.body + after
+
+        if isinstance(exchange_xml, SOAPRequestStream):
+            before, after = self._envelope_parts()
+            if getattr(self.connection, 'streams_request_bodies', False):
+                return _chain_chunks(before, exchange_xml.chunks(), after)
+            return b''.join(_chain_chunks(before, exchange_xml.chunks(), after))
+
         return S.Envelope(
-            S.Header(
-                soap_request.T.RequestServerVersion(
-                    Version="Exchange2010",
-                ),
-            ),
+            self._soap_header(),
             S.Body(exchange_xml),
         )
 
+    def _soap_header(self):
+        header = S.Header(
+            soap_request.T.RequestServerVersion(
+                Version="Exchange2010",
+            ),
+        )
+
+        if self.impersonation is not None:
+            header.append(soap_request.exchange_impersonation(*self.impersonation))
+
+        return header
+
+    def _envelope_parts(self):
+        """ The serialized envelope, header and all, before and after the body - made once per mailbox we act as. """
+        parts = _ENVELOPE_PARTS.get(self.impersonation)
+        if parts is None:
+            if len(_ENVELOPE_PARTS) >= MAX_CACHED_ENVELOPES:
+                _ENVELOPE_PARTS.clear()
+            parts = _ENVELOPE_PARTS[self.impersonation] = envelope_parts(S.Envelope(self._soap_header(), S.Body()))
+        return parts
+
+    def _check_for_SOAP_fault(self, xml_tree):
+        # Exchange says what went wrong in the fault's detail - raise something specific if we can
+        codes = xml_tree.xpath(u'//s:Fault/detail/e:ResponseCode', namespaces=soap_request.FAULT_NAMESPACES)
+
+        if codes:
+            error = _exception_for_response_code(codes[0].text, _back_off_milliseconds(codes[0].getparent()))
+            if error is not None:
+                log.debug(etree.tostring(codes[0].getparent(), pretty_print=True))
+                raise error
+
+        super(Exchange2010Service, self)._check_for_SOAP_fault(xml_tree)
+
     def _check_for_errors(self, xml_tree):
         super(Exchange2010Service, self)._check_for_errors(xml_tree)
         self._check_for_exchange_fault(xml_tree)
@@ -81,26 +403,401 @@ class Exchange2010Service(ExchangeServiceSOAP):
         if not response_codes:
             raise FailedExchangeException(u"Exchange server did not return a status response", None)
 
-        # The full (massive) list of possible return responses is here.
-        # http://msdn.microsoft.com/en-us/library/aa580757(v=exchg.140).aspx
         for code in response_codes:
-            if code.text == u"ErrorChangeKeyRequiredForWriteOperations":
-                # change key is missing or stale. we can fix that, so throw a special error
-                raise ExchangeStaleChangeKeyException(u"Exchange Fault (%s) from Exchange server" % code.text)
-            elif code.text == u"ErrorItemNotFound":
-                # exchange_invite_key wasn't found on the server
-                raise ExchangeItemNotFoundException(u"Exchange Fault (%s) from Exchange server" % code.text)
-            elif code.text == u"ErrorIrresolvableConflict":
-                # tried to update an item with an old change key
-                raise ExchangeIrresolvableConflictException(u"Exchange Fault (%s) from Exchange server" % code.text)
-            elif code.text == u"ErrorInternalServerTransientError":
-                # temporary internal server error. throw a special error so we can retry
-                raise ExchangeInternalServerTransientErrorException(u"Exchange Fault (%s) from Exchange server" % code.text)
-            elif code.text == u"ErrorCalendarOccurrenceIndexIsOutOfRecurrenceRange":
-                # just means some or all of the requested instances are out of range
-                pass
-            elif code.text != u"NoError":
-                raise FailedExchangeException(u"Exchange Fault (%s) from Exchange server" % code.text)
+            error = _exception_for_response_code(code.text, _back_off_milliseconds(code.getparent()))
+            if error is not None:
+                raise error
+
+    def _get_items(self, ids, format=u'AllProperties'):
+        """
+        Fetches many items with one GetItem request. Rather than failing the whole lot because one of
+        them has gone missing, returns an ``(item element, exception)`` pair per id, in request order.
+        """
+        response_xml = self.send(soap_request.render_get_item(exchange_id=list(ids), format=format), check_errors=False)
+        messages = response_xml.xpath(u'//m:GetItemResponseMessage', namespaces=soap_request.NAMESPACES)
+
+        if len(messages) != len(ids):
+            raise FailedExchangeException(u"Asked Exchange for %d items, but got %d responses" % (len(ids), len(messages)))
+
+        result = []
+        for message in messages:
+            error = _message_error(message)
+
+            item = None
+            if error is None:
+                items = message.find(u'm:Items', namespaces=soap_request.NAMESPACES)
+                item = items[0] if items is not None and len(items) else None
+
+            result.append((item, error))
+
+        return result
+
+    def _load_items(self, ids, format=u'AllProperties'):
+        """
+        Fetches the items with *ids* with as few GetItem requests as we can - each id once, however
+        often it's listed, and up to ``Exchange2010ItemLoader.MAX_BATCH`` to a request. Returns the item
+        elements, in *format*, in the order asked for, or raises the first error.
+        """
+        ids = list(ids)
+        unique = []
+        seen = set()
+        for id in ids:
+            if id not in seen:
+                seen.add(id)
+                unique.append(id)
+
+        items = {}
+        for offset in range(0, len(unique), Exchange2010ItemLoader.MAX_BATCH):
+            batch = unique[offset:offset + Exchange2010ItemLoader.MAX_BATCH]
+            for id, (item, error) in zip(batch, self._get_items(batch, format=format)):
+                items[id] = _loaded_item(id, item, error)
+
+        return [items[id] for id in ids]
+
+    def _get_cached_item(self, kind, id):
+        """
+        Returns the :class:`CachedItem` for *id*, going to Exchange only if we haven't got it, or if
+        it's past its TTL and its change key has moved. The properties are a copy, safe to change.
+        """
+        cache = self.cache
+        entry = cache.get(id)
+        if entry is not None and entry.kind != kind:
+            entry = None
+
+        if entry is not None and not cache.is_fresh(entry):
+            if id in self.revalidate_cache([id]):
+                cache.misses += 1
+            else:
+                cache.hits += 1
+            entry = cache.get(id)
+            if entry is None:
+                raise ExchangeItemNotFoundException(u"Item %s is no longer in the Exchange store" % id)
+        elif entry is not None:
+            cache.hits += 1
+        else:
+            cache.misses += 1
+            errors = self._fetch_into_cache([(id, kind)])
+            if id in errors:
+                raise errors[id]
+            entry = cache.get(id)
+
+        return entry._replace(properties=_copy_properties(entry.properties))
+
+    def _fetch_into_cache(self, ids_and_kinds):
+        """ Fetches items into the cache in one request. Returns a dictionary of id -> exception for any that failed. """
+        ids = [id for id, _ in ids_and_kinds]
+        errors = {}
+
+        for (id, kind), (item, error) in zip(ids_and_kinds, self._get_items(ids)):
+            if error is None and item is None:
+                error = ExchangeItemNotFoundException(u"Exchange returned no item for %s" % id)
+
+            if error is not None:
+                if isinstance(error, ExchangeItemNotFoundException):
+                    self.cache.invalidate(id)
+                errors[id] = error
+                continue
+
+            change_key = _parse_item_id(item)[1]
+            self.cache.put(id, kind, change_key, CACHED_ITEM_PARSERS[kind](self, item))
+
+        return errors
+
+    def revalidate_cache(self, ids=None):
+        """
+        Checks cached items against Exchange with a single ``IdOnly`` GetItem, then refetches - in one
+        more request - only the items whose change key has moved. Items that have been deleted are
+        dropped from the cache. ::
+
+            service.revalidate_cache()  # everything past its TTL
+
+        If *ids* isn't given, checks every item that's past its TTL. Returns the ids that were refetched.
+        """
+        cache = self.cache
+        if cache is None:
+            return []
+
+        if ids is None:
+            ids = cache.stale_ids()
+
+        entries = [entry for entry in (cache.get(id) for id in ids) if entry is not None]
+        if not entries:
+            return []
+
+        cache.revalidations += len(entries)
+
+        changed = []
+        for entry, (item, error) in zip(entries, self._get_items([entry.id for entry in entries], format=u'IdOnly')):
+            if error is not None:
+                if isinstance(error, ExchangeItemNotFoundException):
+                    cache.invalidate(entry.id)
+                else:
+                    log.warning(u"Couldn't revalidate cached item %s: %s", entry.id, error)
+            elif item is not None and _parse_item_id(item)[1] == entry.change_key:
+                cache.touch(entry.id)
+            else:
+                changed.append(entry)
+
+        if changed:
+            cache.refetches += len(changed)
+            errors = self._fetch_into_cache([(entry.id, entry.kind) for entry in changed])
+            for id, error in errors.items():
+                if not isinstance(error, ExchangeItemNotFoundException):
+                    log.warning(u"Couldn't refetch cached item %s: %s", id, error)
+
+        return [entry.id for entry in changed]
+
+    def _invalidate_cached_item(self, id):
+        if self.cache is not None and id is not None:
+            self.cache.invalidate(id)
+
+
+# Operations that only read, so are safe to send again
+IDEMPOTENT_OPERATIONS = frozenset([
+    u'GetItem', u'FindItem', u'GetFolder', u'FindFolder', u'ConvertId', u'ResolveNames', u'ExpandDL',
+    u'GetRoomLists', u'GetRooms', u'GetUserAvailabilityRequest', u'GetAttachment',
+])
+
+CALENDAR_ITEM_UPDATE_OPERATION_TYPES = (
+    u'SendToNone', u'SendOnlyToAll', u'SendOnlyToChanged',
+    u'SendToAllAndSaveCopy', u'SendToChangedAndSaveCopy',
+)
+
+# Response codes that mean Exchange is throttling us
+THROTTLING_RESPONSE_CODES = (
+    u"ErrorServerBusy", u"ErrorExceededConnectionCount", u"ErrorExceededSubscriptionCount",
+    u"ErrorExceededFindCountLimit", u"ErrorTooManyObjectsOpened",
+)
+
+
+def _exception_for_response_code(code, back_off_milliseconds=None):
+    """
+    Returns the exception to raise for an Exchange response code, or None if the code means success.
+    *back_off_milliseconds* is Exchange's hint for how long to wait, if it gave one.
+    """
+
+    # The full (massive) list of possible return responses is here.
+    # http://msdn.microsoft.com/en-us/library/aa580757(v=exchg.140).aspx
+    if code == u"NoError":
+        return None
+    elif code == u"ErrorChangeKeyRequiredForWriteOperations":
+        # change key is missing or stale. we can fix that, so throw a special error
+        return ExchangeStaleChangeKeyException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorItemNotFound":
+        # exchange_invite_key wasn't found on the server
+        return ExchangeItemNotFoundException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorIrresolvableConflict":
+        # tried to update an item with an old change key
+        return ExchangeIrresolvableConflictException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code in (u"ErrorInternalServerTransientError", u"ErrorMailboxStoreUnavailable", u"ErrorMailboxMoveInProgress"):
+        # temporary internal server error. throw a special error so we can retry
+        return ExchangeInternalServerTransientErrorException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code in THROTTLING_RESPONSE_CODES:
+        # we're over a throttling budget. throw a special error so callers can slow down
+        return ExchangeServerBusyException(u"Exchange Fault (%s) from Exchange server" % code, back_off_milliseconds)
+    elif code in (u"ErrorImpersonateUserDenied", u"ErrorImpersonationDenied", u"ErrorImpersonationFailed"):
+        # the account we log in as can't act as the mailbox we asked for
+        return ExchangeImpersonationDeniedException(u"Exchange Fault (%s) from Exchange server" % code)
+    elif code == u"ErrorCalendarOccurrenceIndexIsOutOfRecurrenceRange":
+        # just means some or all of the requested instances are out of range
+        return None
+    else:
+        return FailedExchangeException(u"Exchange Fault (%s) from Exchange server" % code)
+
+
+def _message_error(message):
+    """ The exception for one response message in a batch, or None if it succeeded. """
+    code = message.findtext(u'm:ResponseCode', namespaces=soap_request.NAMESPACES)
+    if code is None:
+        return FailedExchangeException(u"Exchange server did not return a status response", None)
+    return _exception_for_response_code(code, _back_off_milliseconds(message))
+
+
+def _chain_chunks(before, chunks, after):
+    yield before
+    for chunk in chunks:
+        yield chunk
+    yield after
+
+
+def _back_off_milliseconds(element):
+    """ Exchange's BackOffMilliseconds hint from a response message or fault detail, if there is one. """
+    values = element.xpath(u'.//t:MessageXml/t:Value[@Name="BackOffMilliseconds"]', namespaces=soap_request.NAMESPACES)
+
+    try:
+        return int(values[0].text) if values else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _directory_key(query):
+    return query.strip().lower()
+
+
+def _directory_response_code(response, message_tag, *allowed_codes):
+    """
+    Checks the response code of a ResolveNames or ExpandDL response. Returns the code, or None if
+    Exchange found nothing, which isn't an error for a directory lookup. Raises for anything else.
+    """
+    code = response.findtext(u'.//' + message_tag + u'/m:ResponseCode', namespaces=soap_request.NAMESPACES)
+
+    if code is None:
+        raise FailedExchangeException(u"Exchange server did not return a status response", None)
+    elif code == u'ErrorNameResolutionNoResults':
+        return None
+    elif code in allowed_codes:
+        return code
+
+    error = _exception_for_response_code(code)
+    if error is not None:
+        raise error
+
+    return code
+
+
+def _parse_mailbox(node):
+    return ExchangeMailbox(
+        name=node.findtext(u't:Name', namespaces=soap_request.NAMESPACES),
+        email=node.findtext(u't:EmailAddress', namespaces=soap_request.NAMESPACES),
+        routing_type=node.findtext(u't:RoutingType', namespaces=soap_request.NAMESPACES),
+        mailbox_type=node.findtext(u't:MailboxType', namespaces=soap_request.NAMESPACES),
+    )
+
+
+def _event_field_uris(fields):
+    if fields is None:
+        return None
+
+    unknown = [field for field in fields if field not in LISTABLE_EVENT_FIELDS]
+    if unknown:
+        raise ValueError(u"Can't list events with just %s - pick from %s" % (u', '.join(unknown), u', '.join(sorted(LISTABLE_EVENT_FIELDS))))
+
+    return [LISTABLE_EVENT_FIELDS[field] for field in fields]
+
+
+def _copy_properties(properties):
+    # Cached properties are shared, so hand out copies of anything mutable
+    return dict((key, list(value) if isinstance(value, list) else value) for key, value in properties.items())
+
+
+class Exchange2010ItemLoader(object):
+    """
+    Batches single-item lookups made from different threads. The first :meth:`load` waits *window*
+    seconds for others to ask for more items (as the same mailbox), then fetches them all with one
+    GetItem, at most *max_batch* ids of it, each id only once. Everyone gets back their own copy of
+    their item, or the error Exchange gave for it.
+
+    Turn it on with ``Exchange2010Service(connection, batch_window=0.005)``, and ``get_event``,
+    ``get_contact`` and ``get_task`` go through it. From asyncio, await ``get_event_async``,
+    ``get_contact_async`` or ``get_task_async`` - coroutines waiting at the same time are batched
+    together. To fetch a known list of items in one go, single-threaded, use ``get_events``,
+    ``get_contacts`` or ``get_tasks`` instead.
+    """
+
+    MAX_BATCH = 100
+
+    def __init__(self, window=0.005, max_batch=MAX_BATCH):
+        self.window = window
+        self.max_batch = max_batch
+        self.loads = 0
+        self.requests = 0
+
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def load(self, service, id):
+        """ Returns the item element for *id*, fetched along with whatever else is asked for meanwhile. """
+        key = (service.impersonation, service.anchor_mailbox)
+
+        with self._lock:
+            self.loads += 1
+
+            batch = self._batches.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._batches[key] = _ItemBatch()
+
+            slot = batch.add(id)
+            if len(batch.ids) >= self.max_batch:
+                del self._batches[key]
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+                self.requests += 1
+            batch.fetch(service)
+        else:
+            batch.done.wait()
+
+        return batch.result(slot)
+
+    def stats(self):
+        """ Items asked for, and the GetItem requests it took. """
+        with self._lock:
+            return {u'loads': self.loads, u'requests': self.requests}
+
+
+class _ItemBatch(object):
+
+    def __init__(self):
+        self.ids = []
+        self.positions = {}
+        self.slots = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.answers = None
+        self.error = None
+
+    def add(self, id):
+        if id not in self.positions:
+            self.positions[id] = len(self.ids)
+            self.ids.append(id)
+
+        self.slots.append(id)
+        return len(self.slots) - 1
+
+    def fetch(self, service):
+        try:
+            items = service._get_items(self.ids)
+            # Everyone gets an element of their own, so they can parse at the same time
+            self.answers = [
+                (deepcopy(item) if item is not None else None, error)
+                for item, error in (items[self.positions[id]] for id in self.slots)
+            ]
+        except BaseException as err:
+            # Even KeyboardInterrupt - whoever's waiting must get an error rather than no answer
+            self.error = err
+            if not isinstance(err, Exception):
+                raise
+        finally:
+            self.done.set()
+
+    def result(self, slot):
+        if self.error is not None:
+            raise self.error
+
+        item, error = self.answers[slot]
+        return _loaded_item(self.slots[slot], item, error)
+
+
+def _in_executor(function, *args):
+    """
+    Calls ``function(*args)`` on the running asyncio loop's default executor, and returns the future
+    to await. asyncio is only imported when it's used, so this module still loads on python 2.
+    """
+    import asyncio
+    return asyncio.get_event_loop().run_in_executor(None, function, *args)
+
+
+def _loaded_item(id, item, error):
+    if error is not None:
+        raise error
+    if item is None:
+        raise ExchangeItemNotFoundException(u"Exchange returned no item for %s" % id)
+    return item
 
 
 class Exchange2010CalendarService(BaseExchangeCalendarService):
@@ -111,20 +808,131 @@ class Exchange2010CalendarService(BaseExchangeCalendarService):
     def get_event(self, id):
         return Exchange2010CalendarEvent(service=self.service, id=id)
 
+    def get_event_async(self, id):
+        """ :meth:`get_event` for asyncio: ``event = await calendar.get_event_async(id)``. """
+        return _in_executor(self.get_event, id)
+
+    def get_events(self, ids):
+        """ Fetches the events with these ids, all in one request, in the order given. """
+        return [Exchange2010CalendarEvent(service=self.service, xml=item) for item in self.service._load_items(ids)]
+
     def new_event(self, **properties):
         return Exchange2010CalendarEvent(service=self.service, calendar_id=self.calendar_id, **properties)
 
-    def list_events(self, start=None, end=None, details=False, delegate_for=None):
-        return Exchange2010CalendarEventList(service=self.service, calendar_id=self.calendar_id, start=start, end=end, details=details, delegate_for=delegate_for)
+    def create_events(self, events):
+        """
+        Creates new events in this calendar with one CreateItem request, and returns them. ::
+
+            events = service.calendar().create_events([
+              service.calendar().new_event(subject=u"Standup", start=start, end=end),
+              ...
+            ])
+
+        The request is written out an event at a time as it's sent, so it can carry thousands of them.
+        If Exchange couldn't create some of them, the first error is raised; the events it did create
+        have their ids set.
+        """
+        events = list(events)
+        for event in events:
+            event.validate()
+
+        response_xml = self.service.send(soap_request.stream_new_events(events, calendar_id=self.calendar_id), check_errors=False)
+        messages = response_xml.xpath(u'//m:CreateItemResponseMessage', namespaces=soap_request.NAMESPACES)
+
+        if len(messages) != len(events):
+            raise FailedExchangeException(u"Asked Exchange to create %d events, but got %d responses" % (len(events), len(messages)))
+
+        first_error = None
+        for event, message in zip(events, messages):
+            error = _message_error(message)
+
+            if error is None:
+                event._id, event._change_key = _parse_item_id(_find_calendar_item(message))
+            elif first_error is None:
+                first_error = error
+
+        if first_error is not None:
+            raise first_error
+
+        return events
+
+    def update_events(self, events, calendar_item_update_operation_type=u'SendToAllAndSaveCopy'):
+        """
+        Saves the changes to many events with one UpdateItem request, and returns the events that had
+        any. ::
+
+            for event in events:
+              event.location = u'New location'
+            service.calendar().update_events(events)
+
+        Works like :meth:`Exchange2010CalendarEvent.update`, but the change keys are refreshed with one
+        GetItem per 100 events, and the request is written out an event at a time as it's sent. If
+        Exchange couldn't update some of them, the first error is raised; the events it did update are
+        saved.
+        """
+        if calendar_item_update_operation_type not in CALENDAR_ITEM_UPDATE_OPERATION_TYPES:
+            raise ValueError('calendar_item_update_operation_type has unknown value')
+
+        events = [event for event in events if event._dirty_attributes]
+        for event in events:
+            if not event.id:
+                raise TypeError(u"You can't update an event that hasn't been created yet.")
+            event.validate()
+
+        if not events:
+            return events
+
+        for event, item in zip(events, self.service._load_items([event.id for event in events], format=u'IdOnly')):
+            _, event._change_key = _parse_item_id(item)
+
+        changes = [(event, list(event._dirty_attributes)) for event in events]
+        body = soap_request.stream_update_items(changes, calendar_item_update_operation_type)
+        response_xml = self.service.send(body, check_errors=False)
+        messages = response_xml.xpath(u'//m:UpdateItemResponseMessage', namespaces=soap_request.NAMESPACES)
+
+        if len(messages) != len(events):
+            raise FailedExchangeException(u"Asked Exchange to update %d events, but got %d responses" % (len(events), len(messages)))
+
+        first_error = None
+        for event, message in zip(events, messages):
+            error = _message_error(message)
+
+            if error is None:
+                self.service._invalidate_cached_item(event._id)
+                items = message.find(u'm:Items', namespaces=soap_request.NAMESPACES)
+                if items is not None and len(items):
+                    _, event._change_key = _parse_item_id(items[0])
+                event._reset_dirty_attributes()
+            elif first_error is None:
+                first_error = error
+
+        if first_error is not None:
+            raise first_error
+
+        return events
+
+    def list_events(self, start=None, end=None, details=False, delegate_for=None, as_records=False, lazy=False, fields=None):
+        return Exchange2010CalendarEventList(service=self.service, calendar_id=self.calendar_id, start=start, end=end, details=details, delegate_for=delegate_for, as_records=as_records, lazy=lazy, fields=fields)
 
 
 class Exchange2010CalendarEventList(object):
     """
     Creates & Stores a list of Exchange2010CalendarEvent items in the "self.events" variable.
+
+    If *as_records* is set, "self.events" holds read-only :class:`ExchangeEventRecord` tuples
+    built straight from the response instead, which is much cheaper when you only need to read.
+
+    If *lazy* is set, each event keeps its piece of the response and only parses a property the
+    first time it's read. Call ``event.materialize()`` to parse the rest and let go of the XML.
+
+    If *fields* is set, only those properties (see :data:`LISTABLE_EVENT_FIELDS`) are asked for,
+    and the rest are left empty.
     """
 
-    def __init__(self, service=None, calendar_id=u'calendar', start=None, end=None, details=False, delegate_for=None):
+    def __init__(self, service=None, calendar_id=u'calendar', start=None, end=None, details=False, delegate_for=None, as_records=False, lazy=False, fields=None):
         self.service = service
+        self.as_records = as_records
+        self.lazy = lazy
         self.count = 0
         self.start = start
         self.end = end
@@ -134,13 +942,13 @@ class Exchange2010CalendarEventList(object):
         self.delegate_for = delegate_for
 
         # This request uses a Calendar-specific query between two dates.
-        body = soap_request.get_calendar_items(format=u'AllProperties', calendar_id=calendar_id, start=self.start, end=self.end, delegate_for=self.delegate_for)
+        body = soap_request.get_calendar_items(format=u'AllProperties', calendar_id=calendar_id, start=self.start, end=self.end, delegate_for=self.delegate_for, field_uris=_event_field_uris(fields))
         response_xml = self.service.send(body)
         self._parse_response_for_all_events(response_xml)
 
         # Populate the event ID list, for convenience reasons.
         for event in self.events:
-            self.event_ids.append(event._id)
+            self.event_ids.append(event.id)
 
         # If we have requested all the details, basically repeat the previous 3 steps,
         # but instead of start/stop, we have a list of ID fields.
@@ -161,7 +969,7 @@ class Exchange2010CalendarEventList(object):
             log.debug(u'Found %s items' % self.count)
 
             for item in items:
-                self._add_event(xml=soap_request.M.Items(deepcopy(item)))
+                self._add_event(xml=item)
         else:
             log.debug(u'No calendar items found with search parameters.')
 
@@ -169,8 +977,11 @@ class Exchange2010CalendarEventList(object):
 
     def _add_event(self, xml=None):
         log.debug(u'Adding new event to all events list.')
-        event = Exchange2010CalendarEvent(service=self.service, xml=xml)
-        log.debug(u'Subject of new event is %s' % event.subject)
+        if self.as_records:
+            event = _calendar_record(self.service, xml)
+        else:
+            event = Exchange2010CalendarEvent(service=self.service, xml=xml, lazy=self.lazy)
+        log.debug(u'Id of new event is %s', event.id)
         self.events.append(event)
         return self
 
@@ -188,7 +999,7 @@ class Exchange2010CalendarEventList(object):
 
             # Send the SOAP request with the list of exchange ID values.
             log.debug(u"Requesting all event details for events: {event_list}".format(event_list=str(self.event_ids)))
-            body = soap_request.get_item(exchange_id=self.event_ids, format=u'AllProperties')
+            body = soap_request.render_get_item(exchange_id=self.event_ids, format=u'AllProperties')
             response_xml = self.service.send(body)
 
             # Re-parse the results for all the details!
@@ -196,12 +1007,134 @@ class Exchange2010CalendarEventList(object):
 
         return self
 
+    def index(self):
+        """
+        Builds an :class:`ExchangeEventIndex` over the events in this list, for answering
+        overlap and conflict questions locally. ::
+
+            index = service.calendar().list_events(start=start, end=end).index()
+            busy = index.at(datetime(2050, 5, 1, 15, 0, tzinfo=utc))
+        """
+        return ExchangeEventIndex(self.events)
+
+    def to_columns(self):
+        """
+        Returns the events as a dictionary of columns (start/end as epoch seconds, duration,
+        organizer email, attendee count...) for analytics. ::
+
+            frame = pandas.DataFrame(service.calendar().list_events(start=start, end=end, as_records=True).to_columns())
+
+        Combine with *as_records* to skip building event objects entirely.
+        """
+        return event_columns(self.events)
+
+    def to_arrays(self):
+        """ Like :meth:`to_columns`, but each column is a NumPy array. Requires NumPy. """
+        return event_arrays(self.events)
+
+
+class Exchange2010CalendarFanOut(object):
+    """
+    The results of :meth:`Exchange2010Service.list_events_for`, as they come in. Iterate over it for
+    an :class:`ExchangeMailboxEvents` per mailbox, in the order they finish; iterating again replays
+    what's finished so far and then waits for the rest.
+    """
+
+    def __init__(self, service, mailboxes, start, end, max_workers=8, fields=None, as_records=True, impersonate=False):
+        self.service = service
+        self.impersonate = impersonate
+        self.start = start
+        self.end = end
+        self.fields = fields
+        self.as_records = as_records
+
+        # Catch bad field names here, rather than once per mailbox
+        _event_field_uris(fields)
+
+        self.mailboxes = []
+        seen = set()
+        for mailbox in mailboxes:
+            mailbox = _mailbox_email(mailbox)
+            if _directory_key(mailbox) not in seen:
+                seen.add(_directory_key(mailbox))
+                self.mailboxes.append(mailbox)
+
+        self.results = []
+        self._started_at = None
+        self._finished_at = None
+        self._pending = concurrent_map(self._list_events, self.mailboxes, max_workers=max_workers)
+
+    def __iter__(self):
+        index = 0
+        while index < len(self.results) or self._wait_for_next():
+            yield self.results[index]
+            index += 1
+
+    def summary(self):
+        """ Waits for every mailbox, then returns an :class:`ExchangeFanOutSummary`. """
+        while self._wait_for_next():
+            pass
+
+        failures = dict((result.mailbox, result.error) for result in self.results if result.error is not None)
+
+        return ExchangeFanOutSummary(
+            mailboxes=len(self.mailboxes),
+            succeeded=len(self.mailboxes) - len(failures),
+            failures=failures,
+            seconds=self._finished_at - self._started_at,
+            timings=dict((result.mailbox, result.seconds) for result in self.results),
+        )
+
+    def _wait_for_next(self):
+        if self._started_at is None:
+            self._started_at = time.time()
+
+        try:
+            # _list_events catches its own errors, so it always has a result
+            mailbox, (events, error, seconds), _ = next(self._pending)
+        except StopIteration:
+            if self._finished_at is None:
+                self._finished_at = time.time()
+            return False
+
+        self.results.append(ExchangeMailboxEvents(mailbox=mailbox, events=events, error=error, seconds=seconds))
+        return True
+
+    def _list_events(self, mailbox):
+        started_at = time.time()
+
+        if self.impersonate:
+            service, delegate_for = self.service.impersonate(mailbox), None
+        else:
+            service, delegate_for = self.service.anchor(mailbox), mailbox
+
+        try:
+            events = Exchange2010CalendarEventList(
+                service=service, start=self.start, end=self.end, delegate_for=delegate_for,
+                as_records=self.as_records, fields=self.fields,
+            ).events
+        except Exception as err:
+            log.warning(u"Couldn't list events for %s: %s", mailbox, err)
+            return [], err, time.time() - started_at
+
+        return events, None, time.time() - started_at
+
 
 class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     def _init_from_service(self, id):
         log.debug(u'Creating new Exchange2010CalendarEvent object from ID')
-        body = soap_request.get_item(exchange_id=id, format=u'AllProperties')
+        if getattr(self.service, 'cache', None) is not None:
+            cached = self.service._get_cached_item(u'event', id)
+            self._update_properties(self._event_properties(cached.properties))
+            self._id, self._change_key = id, cached.change_key
+            self._reset_dirty_attributes()
+            return self
+
+        if getattr(self.service, 'item_loader', None) is not None:
+            return self._init_from_xml(self.service.item_loader.load(self.service, id))
+
+        body = soap_request.render_get_item(exchange_id=id, format=u'AllProperties')
         response_xml = self.service.send(body)
         properties = self._parse_response_for_get_event(response_xml)
 
@@ -213,20 +1146,35 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
         return self
 
-    def _init_from_xml(self, xml=None):
+    def _init_from_xml(self, xml=None, lazy=False):
         log.debug(u'Creating new Exchange2010CalendarEvent object from XML')
 
-        properties = self._parse_response_for_get_event(xml)
-        self._update_properties(properties)
-        self._id, self._change_key = self._parse_id_and_change_key_from_response(xml)
+        item = _find_calendar_item(xml)
+        if lazy and item is not None:
+            self._source = item
+        else:
+            properties = self._parse_response_for_get_event(item)
+            self._update_properties(properties)
+        self._id, self._change_key = _parse_item_id(item)
 
         log.debug(u'Created new event object with ID: %s' % self._id)
         self._reset_dirty_attributes()
 
         return self
 
+    def _lazy_loader(self, name):
+        return CALENDAR_ITEM_LOADERS.get(name)
+
     def as_json(self):
-        raise NotImplementedError
+        """
+        Returns the event as a JSON string, including attendees, resources and recurrence.
+        Read it back with :func:`pyexchange.base.codec.event_from_json`.
+        """
+        return event_to_json(self)
+
+    def as_msgpack(self):
+        """ Like :meth:`as_json`, but returns compact MessagePack bytes. See :func:`pyexchange.base.codec.event_from_msgpack`. """
+        return event_to_msgpack(self)
 
     def validate(self):
 
@@ -337,11 +1285,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
             if kwargs['send_only_to_changed_attendees']:
                 calendar_item_update_operation_type = u'SendToChangedAndSaveCopy'
 
-        VALID_UPDATE_OPERATION_TYPES = (
-            u'SendToNone', u'SendOnlyToAll', u'SendOnlyToChanged',
-            u'SendToAllAndSaveCopy', u'SendToChangedAndSaveCopy',
-        )
-        if calendar_item_update_operation_type not in VALID_UPDATE_OPERATION_TYPES:
+        if calendar_item_update_operation_type not in CALENDAR_ITEM_UPDATE_OPERATION_TYPES:
             raise ValueError('calendar_item_update_operation_type has unknown value')
 
         self.validate()
@@ -352,6 +1296,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
             body = soap_request.update_item(self, self._dirty_attributes, calendar_item_update_operation_type=calendar_item_update_operation_type)
             self.service.send(body)
+            self.service._invalidate_cached_item(self._id)
             self._reset_dirty_attributes()
         else:
             log.info(u"Update was called, but there's nothing to update. Doing nothing.")
@@ -372,6 +1317,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
         self.refresh_change_key()
         self.service.send(soap_request.delete_event(self))
+        self.service._invalidate_cached_item(self._id)
         # TODO rsanders high - check return status to make sure it was actually sent
         return None
 
@@ -398,6 +1344,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
         if not new_id:
             raise ValueError(u"MoveItem returned success but requested item not moved")
 
+        self.service._invalidate_cached_item(self._id)
         self._id = new_id
         self._change_key = new_change_key
         self.calendar_id = folder_id
@@ -462,7 +1409,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
         items = response_xml.xpath(u'//m:GetItemResponseMessage/m:Items', namespaces=soap_request.NAMESPACES)
         events = []
         for item in items:
-            event = Exchange2010CalendarEvent(service=self.service, xml=deepcopy(item))
+            event = Exchange2010CalendarEvent(service=self.service, xml=item)
             if event.id:
                 events.append(event)
 
@@ -485,13 +1432,13 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
         if not self.conflicting_event_ids:
             return []
 
-        body = soap_request.get_item(exchange_id=self.conflicting_event_ids, format="AllProperties")
+        body = soap_request.render_get_item(exchange_id=self.conflicting_event_ids, format="AllProperties")
         response_xml = self.service.send(body)
 
         items = response_xml.xpath(u'//m:GetItemResponseMessage/m:Items', namespaces=soap_request.NAMESPACES)
         events = []
         for item in items:
-            event = Exchange2010CalendarEvent(service=self.service, xml=deepcopy(item))
+            event = Exchange2010CalendarEvent(service=self.service, xml=item)
             if event.id:
                 events.append(event)
 
@@ -499,7 +1446,7 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
 
     def refresh_change_key(self):
 
-        body = soap_request.get_item(exchange_id=self._id, format=u"IdOnly")
+        body = soap_request.render_get_item(exchange_id=self._id, format=u"IdOnly")
         response_xml = self.service.send(body)
         self._id, self._change_key = self._parse_id_and_change_key_from_response(response_xml)
 
@@ -516,218 +1463,264 @@ class Exchange2010CalendarEvent(BaseExchangeCalendarEvent):
             return None, None
 
     def _parse_response_for_get_event(self, response):
-        result = self._parse_event_properties(response)
+        return self._event_properties(_parse_calendar_item(self.service, _find_calendar_item(response)))
 
-        organizer_properties = self._parse_event_organizer(response)
-        if organizer_properties is not None:
-            if 'email' not in organizer_properties:
-                organizer_properties['email'] = None
-            result[u'organizer'] = ExchangeEventOrganizer(**organizer_properties)
+    def _event_properties(self, result):
+        """ Maps the output of _parse_calendar_item onto our attribute names. """
+        result = dict(result)
 
-        attendee_properties = self._parse_event_attendees(response)
-        result[u'_attendees'] = self._build_resource_dictionary([ExchangeEventResponse(**attendee) for attendee in attendee_properties])
+        result[u'_type'] = result.pop(u'type', None)
+        result[u'_attendees'] = _attendee_dictionary(result.pop(u'attendees', ()))
+        result[u'_resources'] = _attendee_dictionary(result.pop(u'resources', ()))
+        result[u'_conflicting_event_ids'] = result.pop(u'conflicting_event_ids', [])
 
-        resource_properties = self._parse_event_resources(response)
-        result[u'_resources'] = self._build_resource_dictionary([ExchangeEventResponse(**resource) for resource in resource_properties])
+        return result
 
-        result['_conflicting_event_ids'] = self._parse_event_conflicts(response)
 
-        return result
+# Paths are relative to a single <t:CalendarItem>, so we can parse each item of a
+# list response in place instead of deepcopying it out first.
+CALENDAR_ITEM_PROPERTY_MAP = {
+    u'subject': {
+        u'xpath': u't:Subject',
+    },
+    u'location': {
+        u'xpath': u't:Location',
+    },
+    u'availability': {
+        u'xpath': u't:LegacyFreeBusyStatus',
+    },
+    u'start': {
+        u'xpath': u't:Start',
+        u'cast': u'datetime',
+    },
+    u'end': {
+        u'xpath': u't:End',
+        u'cast': u'datetime',
+    },
+    u'html_body': {
+        u'xpath': u't:Body[@BodyType="HTML"]',
+    },
+    u'text_body': {
+        u'xpath': u't:Body[@BodyType="Text"]',
+    },
+    u'type': {
+        u'xpath': u't:CalendarItemType',
+    },
+    u'reminder_minutes_before_start': {
+        u'xpath': u't:ReminderMinutesBeforeStart',
+        u'cast': u'int',
+    },
+    u'is_all_day': {
+        u'xpath': u't:IsAllDayEvent',
+        u'cast': u'bool',
+    },
+    u'recurrence_end_date': {
+        u'xpath': u't:Recurrence/t:EndDateRecurrence/t:EndDate',
+        u'cast': u'date_only_naive',
+    },
+    u'recurrence_interval': {
+        u'xpath': u't:Recurrence/*/t:Interval',
+        u'cast': u'int',
+    },
+    u'recurrence_days': {
+        u'xpath': u't:Recurrence/t:WeeklyRecurrence/t:DaysOfWeek',
+    },
+}
+
+# The event properties that can be asked for one by one when listing events, and the Exchange
+# properties they come from. FindItem won't return bodies, attendees or recurrence.
+LISTABLE_EVENT_FIELDS = {
+    u'subject': u'item:Subject',
+    u'location': u'calendar:Location',
+    u'availability': u'calendar:LegacyFreeBusyStatus',
+    u'start': u'calendar:Start',
+    u'end': u'calendar:End',
+    u'type': u'calendar:CalendarItemType',
+    u'reminder_minutes_before_start': u'item:ReminderMinutesBeforeStart',
+    u'is_all_day': u'calendar:IsAllDayEvent',
+    u'organizer': u'calendar:Organizer',
+}
+
+ORGANIZER_PROPERTY_MAP = {
+    u'name': {
+        u'xpath': u't:Name'
+    },
+    u'email': {
+        u'xpath': u't:EmailAddress'
+    },
+}
+
+_MAILBOX_TAG = u'{%s}Mailbox' % soap_request.TYPE_NS
+_NAME_TAG = u'{%s}Name' % soap_request.TYPE_NS
+_EMAIL_ADDRESS_TAG = u'{%s}EmailAddress' % soap_request.TYPE_NS
+_RESPONSE_TYPE_TAG = u'{%s}ResponseType' % soap_request.TYPE_NS
+_LAST_RESPONSE_TIME_TAG = u'{%s}LastResponseTime' % soap_request.TYPE_NS
+
+RECURRENCE_TYPES = (
+    (u't:DailyRecurrence', u'daily'),
+    (u't:WeeklyRecurrence', u'weekly'),
+    (u't:AbsoluteMonthlyRecurrence', u'monthly'),
+    (u't:AbsoluteYearlyRecurrence', u'yearly'),
+)
+
+
+def _find_calendar_item(xml):
+    """ Returns the <t:CalendarItem> out of a GetItem/FindItem response (or an <m:Items> node), or None. """
+    if xml is None or etree.QName(xml).localname == u'CalendarItem':
+        return xml
+
+    items = xml.xpath(u'descendant-or-self::m:Items/t:CalendarItem', namespaces=soap_request.NAMESPACES)
+    return items[0] if items else None
+
+
+def _parse_item_id(item):
+    if item is not None:
+        id_element = item.find(u't:ItemId', namespaces=soap_request.NAMESPACES)
+        if id_element is not None:
+            return id_element.get(u"Id", None), id_element.get(u"ChangeKey", None)
 
-    def _parse_event_properties(self, response):
+    return None, None
 
-        property_map = {
-            u'subject': {
-                u'xpath': u'//m:Items/t:CalendarItem/t:Subject',
-                },
-            u'location':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:Location',
-                    },
-            u'availability':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:LegacyFreeBusyStatus',
-                    },
-            u'start':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:Start',
-                    u'cast': u'datetime',
-                    },
-            u'end':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:End',
-                    u'cast': u'datetime',
-                    },
-            u'html_body':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:Body[@BodyType="HTML"]',
-                    },
-            u'text_body':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:Body[@BodyType="Text"]',
-                    },
-            u'_type':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:CalendarItemType',
-                    },
-            u'reminder_minutes_before_start':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:ReminderMinutesBeforeStart',
-                    u'cast': u'int',
-                    },
-            u'is_all_day':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:IsAllDayEvent',
-                    u'cast': u'bool',
-                    },
-            u'recurrence_end_date':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/t:EndDateRecurrence/t:EndDate',
-                    u'cast': u'date_only_naive',
-                    },
-            u'recurrence_interval':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/*/t:Interval',
-                    u'cast': u'int',
-                    },
-            u'recurrence_days':
-                {
-                    u'xpath': u'//m:Items/t:CalendarItem/t:Recurrence/t:WeeklyRecurrence/t:DaysOfWeek',
-                    },
-            }
 
-        result = self.service._xpath_to_dict(element=response, property_map=property_map, namespace_map=soap_request.NAMESPACES)
+def _parse_calendar_item(service, item):
+    """
+    Parses a <t:CalendarItem> into a dictionary, keyed the same way as :class:`ExchangeEventRecord`.
+    Attendees and resources come back as lists of :class:`ExchangeEventResponse`.
+    """
+    if item is None:
+        return {}
+
+    result = service._xpath_to_dict(element=item, property_map=CALENDAR_ITEM_PROPERTY_MAP, namespace_map=soap_request.NAMESPACES)
 
-        try:
-            recurrence_node = response.xpath(u'//m:Items/t:CalendarItem/t:Recurrence', namespaces=soap_request.NAMESPACES)[0]
-        except IndexError:
-            recurrence_node = None
+    recurrence = _parse_recurrence(item)
+    if recurrence is not None:
+        result[u'recurrence'] = recurrence
 
-        if recurrence_node is not None:
+    organizer = _parse_organizer(service, item)
+    if organizer is not None:
+        result[u'organizer'] = organizer
 
-            if recurrence_node.find('t:DailyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-                result['recurrence'] = 'daily'
+    result[u'attendees'] = _parse_attendees(service, item)
+    result[u'resources'] = _parse_event_attendees(service, item, u't:Resources/t:Attendee', required=True)
+    result[u'conflicting_event_ids'] = _parse_conflicting_event_ids(item)
 
-            elif recurrence_node.find('t:WeeklyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-                result['recurrence'] = 'weekly'
+    return result
 
-            elif recurrence_node.find('t:AbsoluteMonthlyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-                result['recurrence'] = 'monthly'
 
-            elif recurrence_node.find('t:AbsoluteYearlyRecurrence', namespaces=soap_request.NAMESPACES) is not None:
-                result['recurrence'] = 'yearly'
+def _parse_recurrence(item):
+    recurrence_node = item.find(u't:Recurrence', namespaces=soap_request.NAMESPACES)
+    if recurrence_node is not None:
+        for tag, recurrence in RECURRENCE_TYPES:
+            if recurrence_node.find(tag, namespaces=soap_request.NAMESPACES) is not None:
+                return recurrence
 
-        return result
+    return None
 
-    def _parse_event_organizer(self, response):
 
-        organizer = response.xpath(u'//m:Items/t:CalendarItem/t:Organizer/t:Mailbox', namespaces=soap_request.NAMESPACES)
+def _parse_organizer(service, item):
+    organizer = item.find(u't:Organizer/t:Mailbox', namespaces=soap_request.NAMESPACES)
+    if organizer is None:
+        return None
 
-        property_map = {
-            u'name':
-                {
-                    u'xpath': u't:Name'
-                },
-            u'email':
-                {
-                    u'xpath': u't:EmailAddress'
-                },
-            }
+    organizer_properties = service._xpath_to_dict(element=organizer, property_map=ORGANIZER_PROPERTY_MAP, namespace_map=soap_request.NAMESPACES)
+    return ExchangeEventOrganizer(name=organizer_properties.get(u'name'), email=organizer_properties.get(u'email'))
 
-        if organizer:
-            return self.service._xpath_to_dict(element=organizer[0], property_map=property_map, namespace_map=soap_request.NAMESPACES)
-        else:
-            return None
 
-    def _parse_event_resources(self, response):
-        property_map = {
-            u'name':
-                {
-                    u'xpath': u't:Mailbox/t:Name'
-                },
-            u'email':
-                {
-                    u'xpath': u't:Mailbox/t:EmailAddress'
-                },
-            u'response':
-                {
-                    u'xpath': u't:ResponseType'
-                },
-            u'last_response':
-                {
-                    u'xpath': u't:LastResponseTime',
-                    u'cast': u'datetime'
-                },
-            }
+def _parse_attendees(service, item):
+    required = _parse_event_attendees(service, item, u't:RequiredAttendees/t:Attendee', required=True)
+    optional = _parse_event_attendees(service, item, u't:OptionalAttendees/t:Attendee', required=False)
+    return required + optional
 
-        result = []
 
-        resources = response.xpath(u'//m:Items/t:CalendarItem/t:Resources/t:Attendee', namespaces=soap_request.NAMESPACES)
+def _parse_conflicting_event_ids(item):
+    conflicting_ids = item.xpath(u't:ConflictingMeetings/t:CalendarItem/t:ItemId', namespaces=soap_request.NAMESPACES)
+    return [id_element.get(u"Id") for id_element in conflicting_ids]
 
-        for attendee in resources:
-            attendee_properties = self.service._xpath_to_dict(element=attendee, property_map=property_map, namespace_map=soap_request.NAMESPACES)
-            attendee_properties[u'required'] = True
 
-            if u'last_response' not in attendee_properties:
-                attendee_properties[u'last_response'] = None
+def _parse_event_attendees(service, item, xpath, required):
+    """
+    Parses every <t:Attendee> under *xpath* in one pass. Meetings can have thousands of attendees,
+    so this walks the elements directly rather than going through _xpath_to_dict for each one.
+    """
+    result = []
+
+    for attendee in item.iterfind(xpath, namespaces=soap_request.NAMESPACES):
+        name = email = response = last_response = None
+
+        for child in attendee:
+            tag = child.tag
+            if tag == _MAILBOX_TAG:
+                for mailbox_child in child:
+                    if mailbox_child.tag == _EMAIL_ADDRESS_TAG:
+                        email = mailbox_child
+                    elif mailbox_child.tag == _NAME_TAG:
+                        name = mailbox_child.text
+            elif tag == _RESPONSE_TYPE_TAG:
+                response = child.text
+            elif tag == _LAST_RESPONSE_TIME_TAG:
+                last_response = _parse_response_time(service, child.text)
+
+        # Skip attendees without an email address element, same as we always have
+        if email is not None:
+            result.append(ExchangeEventResponse(
+                name=name, email=email.text, response=response, last_response=last_response, required=required,
+            ))
+
+    return result
+
+
+def _parse_response_time(service, text):
+    # strptime is the slowest part of parsing a big attendee list, and Exchange always sends
+    # YYYY-MM-DDTHH:MM:SSZ, so pick that apart by hand. Anything else goes the long way round.
+    if text is not None and len(text) == 20 and text[4] == u'-' and text[10] == u'T' and text[19] == u'Z':
+        try:
+            return datetime(int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                            int(text[11:13]), int(text[14:16]), int(text[17:19]), tzinfo=utc)
+        except ValueError:
+            pass
 
-            if u'email' in attendee_properties:
-                result.append(attendee_properties)
+    return service._parse_date(text)
 
-        return result
 
-    def _parse_event_attendees(self, response):
+def _attendee_dictionary(attendees):
+    # Attendees from the server always have an email address, so skip _build_resource_dictionary's checks
+    return dict((attendee.email, attendee) for attendee in attendees)
 
-        property_map = {
-            u'name':
-                {
-                    u'xpath': u't:Mailbox/t:Name'
-                },
-            u'email':
-                {
-                    u'xpath': u't:Mailbox/t:EmailAddress'
-                },
-            u'response':
-                {
-                    u'xpath': u't:ResponseType'
-                },
-            u'last_response':
-                {
-                    u'xpath': u't:LastResponseTime',
-                    u'cast': u'datetime'
-                },
-            }
 
-        result = []
+def _calendar_record(service, item):
+    """ Builds an :class:`ExchangeEventRecord` straight from a <t:CalendarItem>, without creating an event object. """
+    properties = _parse_calendar_item(service, item)
+    properties[u'id'], properties[u'change_key'] = _parse_item_id(item)
+    properties[u'attendees'] = tuple(properties.get(u'attendees', ()))
+    properties[u'resources'] = tuple(properties.get(u'resources', ()))
 
-        required_attendees = response.xpath(u'//m:Items/t:CalendarItem/t:RequiredAttendees/t:Attendee', namespaces=soap_request.NAMESPACES)
-        for attendee in required_attendees:
-            attendee_properties = self.service._xpath_to_dict(element=attendee, property_map=property_map, namespace_map=soap_request.NAMESPACES)
-            attendee_properties[u'required'] = True
+    return ExchangeEventRecord._make(properties.get(field) for field in ExchangeEventRecord._fields)
 
-            if u'last_response' not in attendee_properties:
-                attendee_properties[u'last_response'] = None
 
-            if u'email' in attendee_properties:
-                result.append(attendee_properties)
+def _lazy_property(key):
+    property_map = {key: CALENDAR_ITEM_PROPERTY_MAP[key]}
 
-        optional_attendees = response.xpath(u'//m:Items/t:CalendarItem/t:OptionalAttendees/t:Attendee', namespaces=soap_request.NAMESPACES)
+    def load(event, item):
+        return event.service._xpath_to_dict(element=item, property_map=property_map, namespace_map=soap_request.NAMESPACES).get(key)
 
-        for attendee in optional_attendees:
-            attendee_properties = self.service._xpath_to_dict(element=attendee, property_map=property_map, namespace_map=soap_request.NAMESPACES)
-            attendee_properties[u'required'] = False
+    return load
 
-            if u'last_response' not in attendee_properties:
-                attendee_properties[u'last_response'] = None
 
-            if u'email' in attendee_properties:
-                result.append(attendee_properties)
+# How a lazily loaded Exchange2010CalendarEvent parses each field from its retained <t:CalendarItem>.
+CALENDAR_ITEM_LOADERS = dict((key, _lazy_property(key)) for key in CALENDAR_ITEM_PROPERTY_MAP if key != u'type')
+CALENDAR_ITEM_LOADERS.update({
+    u'_type': _lazy_property(u'type'),
+    u'recurrence': lambda event, item: _parse_recurrence(item),
+    u'organizer': lambda event, item: _parse_organizer(event.service, item),
+    u'_attendees': lambda event, item: _attendee_dictionary(_parse_attendees(event.service, item)),
+    u'_resources': lambda event, item: _attendee_dictionary(_parse_event_attendees(event.service, item, u't:Resources/t:Attendee', required=True)),
+    u'_conflicting_event_ids': lambda event, item: _parse_conflicting_event_ids(item),
+})
 
-        return result
 
-    def _parse_event_conflicts(self, response):
-        conflicting_ids = response.xpath(u'//m:Items/t:CalendarItem/t:ConflictingMeetings/t:CalendarItem/t:ItemId', namespaces=soap_request.NAMESPACES)
-        return [id_element.get(u"Id") for id_element in conflicting_ids]
+def _item_record(record_type, service, xml, property_map):
+    properties = service._xpath_to_dict(element=xml, property_map=property_map, namespace_map=soap_request.NAMESPACES)
+    return record_type._make(properties.get(field) for field in record_type._fields)
 
 
 class Exchange2010FolderService(BaseExchangeFolderService):
@@ -1002,17 +1995,84 @@ class Exchange2010FolderList(object):
         self.folders.append(folder)
 
 
+CONTACT_PROPERTY_MAP = {
+    u'id': {
+        u'xpath': u'descendant-or-self::t:Contact/t:ItemId/@Id',
+    },
+    u'change_key': {
+        u'xpath': u'descendant-or-self::t:Contact/t:ItemId/@ChangeKey',
+    },
+    u'folder_id': {
+        u'xpath': u'descendant-or-self::t:Contact/t:ParentFolderId/@Id',
+    },
+    u'first_name': {
+        u'xpath': u'descendant-or-self::t:Contact/t:CompleteName/t:FirstName',
+    },
+    u'last_name': {
+        u'xpath': u'descendant-or-self::t:Contact/t:CompleteName/t:LastName',
+    },
+    u'full_name': {
+        u'xpath': u'descendant-or-self::t:Contact/t:CompleteName/t:FullName',
+    },
+    u'display_name': {
+        u'xpath': u'descendant-or-self::t:Contact/t:DisplayName',
+    },
+    u'sort_name': {
+        u'xpath': u'descendant-or-self::t:Contact/t:FileAs',
+    },
+    u'email_address1': {
+        u'xpath': u"descendant-or-self::t:Contact/t:EmailAddresses/t:Entry[@Key='EmailAddress1']",
+    },
+    u'email_address2': {
+        u'xpath': u"descendant-or-self::t:Contact/t:EmailAddresses/t:Entry[@Key='EmailAddress2']",
+    },
+    u'email_address3': {
+        u'xpath': u"descendant-or-self::t:Contact/t:EmailAddresses/t:Entry[@Key='EmailAddress3']",
+    },
+    u'birthday': {
+        u'xpath': u'descendant-or-self::t:Contact/t:Birthday',
+    },
+    u'job_title': {
+        u'xpath': u'descendant-or-self::t:Contact/t:JobTitle',
+    },
+    u'department': {
+        u'xpath': u'descendant-or-self::t:Contact/t:Department',
+    },
+    u'primary_phone': {
+        u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='PrimaryPhone']",
+    },
+    u'business_phone': {
+        u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='BusinessPhone']",
+    },
+    u'home_phone': {
+        u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='HomePhone']",
+    },
+    u'mobile_phone': {
+        u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='MobilePhone']",
+    },
+}
+
+
 class Exchange2010ContactService(BaseExchangeContactService):
     def get_contact(self, id):
         return Exchange2010ContactItem(service=self.service, id=id)
 
+    def get_contact_async(self, id):
+        """ :meth:`get_contact` for asyncio: ``contact = await contacts.get_contact_async(id)``. """
+        return _in_executor(self.get_contact, id)
+
+    def get_contacts(self, ids):
+        """ Fetches the contacts with these ids, all in one request, in the order given. """
+        return [Exchange2010ContactItem(service=self.service, xml=item) for item in self.service._load_items(ids)]
+
     def find_contacts(self, query=None, initial_name=None, final_name=None,
-                      max_entries=100):
+                      max_entries=100, as_records=False):
         """
         :param str query: AQS query string
         :param str initial_name: Lower bound on contact names (lexicographically)
         :param str final_name: Upper bound on contact names
         :param int max_entries: Maximum number of matches
+        :param bool as_records: Return read-only ExchangeContactRecord tuples instead of contact items
         """
         body = soap_request.find_contact_items(
             self.folder_id, query_string=query, initial_name=initial_name,
@@ -1021,24 +2081,27 @@ class Exchange2010ContactService(BaseExchangeContactService):
         response_xml = self.service.send(body)
         return Exchange2010ContactList(service=self.service,
                                        folder_id=self.folder_id,
-                                       xml_result=response_xml)
+                                       xml_result=response_xml,
+                                       as_records=as_records)
 
-    def get_all_contacts(self):
+    def get_all_contacts(self, as_records=False):
         """
         Return a list of all contacts in the current folder.
         """
         return Exchange2010ContactList(service=self.service,
-                                       folder_id=self.folder_id)
+                                       folder_id=self.folder_id,
+                                       as_records=as_records)
 
 
 class Exchange2010ContactList(object):
     """
     Creates & Stores a list of Exchange2010ContactItem objects in the
-    "self.items" variable.
+    "self.items" variable, or ExchangeContactRecord tuples if as_records is set.
     """
-    def __init__(self, service, folder_id=None, xml_result=None):
+    def __init__(self, service, folder_id=None, xml_result=None, as_records=False):
         self.service = service
         self.folder_id = folder_id
+        self.as_records = as_records
         self.count = 0
         self.items = []
 
@@ -1058,6 +2121,10 @@ class Exchange2010ContactList(object):
             return
 
         self.count = len(contacts)
+        if self.as_records:
+            self.items = [_item_record(ExchangeContactRecord, self.service, contact_xml, CONTACT_PROPERTY_MAP) for contact_xml in contacts]
+            return
+
         for contact_xml in contacts:
             log.debug(u'Adding contact item to contact list...')
             contact = Exchange2010ContactItem(service=self.service,
@@ -1075,14 +2142,21 @@ class Exchange2010ContactList(object):
 
 class Exchange2010ContactItem(BaseExchangeContactItem):
     def _init_from_service(self, id):
-        body = soap_request.get_item(exchange_id=id, format=u'AllProperties')
+        if getattr(self.service, 'cache', None) is not None:
+            return self._init_from_properties(self.service._get_cached_item(u'contact', id).properties)
+
+        if getattr(self.service, 'item_loader', None) is not None:
+            return self._init_from_xml(self.service.item_loader.load(self.service, id))
+
+        body = soap_request.render_get_item(exchange_id=id, format=u'AllProperties')
         response_xml = self.service.send(body)
 
         return self._init_from_xml(response_xml)
 
     def _init_from_xml(self, xml):
-        properties = self._parse_contact_properties(xml)
+        return self._init_from_properties(self._parse_contact_properties(xml))
 
+    def _init_from_properties(self, properties):
         self._id = properties.pop('id')
         self._change_key = properties.pop('change_key')
 
@@ -1093,64 +2167,8 @@ class Exchange2010ContactItem(BaseExchangeContactItem):
     def _parse_contact_properties(self, response):
         # Use relative selectors here so that we can call this in the
         # context of each Contact element without deepcopying.
-        property_map = {
-            u'id': {
-                u'xpath': u'descendant-or-self::t:Contact/t:ItemId/@Id',
-            },
-            u'change_key': {
-                u'xpath': u'descendant-or-self::t:Contact/t:ItemId/@ChangeKey',
-            },
-            u'folder_id': {
-                u'xpath': u'descendant-or-self::t:Contact/t:ParentFolderId/@Id',
-            },
-            u'first_name': {
-                u'xpath': u'descendant-or-self::t:Contact/t:CompleteName/t:FirstName',
-            },
-            u'last_name': {
-                u'xpath': u'descendant-or-self::t:Contact/t:CompleteName/t:LastName',
-            },
-            u'full_name': {
-                u'xpath': u'descendant-or-self::t:Contact/t:CompleteName/t:FullName',
-            },
-            u'display_name': {
-                u'xpath': u'descendant-or-self::t:Contact/t:DisplayName',
-            },
-            u'sort_name': {
-                u'xpath': u'descendant-or-self::t:Contact/t:FileAs',
-            },
-            u'email_address1': {
-                u'xpath': u"descendant-or-self::t:Contact/t:EmailAddresses/t:Entry[@Key='EmailAddress1']",
-            },
-            u'email_address2': {
-                u'xpath': u"descendant-or-self::t:Contact/t:EmailAddresses/t:Entry[@Key='EmailAddress2']",
-            },
-            u'email_address3': {
-                u'xpath': u"descendant-or-self::t:Contact/t:EmailAddresses/t:Entry[@Key='EmailAddress3']",
-            },
-            u'birthday': {
-                u'xpath': u'descendant-or-self::t:Contact/t:Birthday',
-            },
-            u'job_title': {
-                u'xpath': u'descendant-or-self::t:Contact/t:JobTitle',
-            },
-            u'department': {
-                u'xpath': u'descendant-or-self::t:Contact/t:Department',
-            },
-            u'primary_phone': {
-                u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='PrimaryPhone']",
-            },
-            u'business_phone': {
-                u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='BusinessPhone']",
-            },
-            u'home_phone': {
-                u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='HomePhone']",
-            },
-            u'mobile_phone': {
-                u'xpath': u"descendant-or-self::t:Contact/t:PhoneNumbers/t:Entry[@Key='MobilePhone']",
-            },
-        }
         return self.service._xpath_to_dict(
-            element=response, property_map=property_map,
+            element=response, property_map=CONTACT_PROPERTY_MAP,
             namespace_map=soap_request.NAMESPACES,
         )
 
@@ -1158,9 +2176,49 @@ class Exchange2010ContactItem(BaseExchangeContactItem):
         return "<Exchange2010ContactItem: {}>".format(self.display_name.encode('utf-8'))
 
 
+MAIL_PROPERTY_MAP = {
+    u'id': {
+        u'xpath': u'descendant-or-self::t:Message/t:ItemId/@Id',
+    },
+    u'change_key': {
+        u'xpath': u'descendant-or-self::t:Message/t:ItemId/@ChangeKey',
+    },
+    u'subject': {
+        u'xpath': u'descendant-or-self::t:Subject',
+    },
+    u'sender_mail': {
+        u'xpath': u'descendant-or-self::t:Message/t:Sender/t:Mailbox/t:EmailAddress',
+    },
+    u'sender_name': {
+        u'xpath': u'descendant-or-self::t:Message/t:Sender/t:Mailbox/t:Name',
+    },
+    u'from_mail': {
+        u'xpath': u'descendant-or-self::t:Message/t:From/t:Mailbox/t:EmailAddress',
+    },
+    u'from_name': {
+        u'xpath': u'descendant-or-self::t:Message/t:From/t:Mailbox/t:Name',
+    },
+    u'culture': {
+        u'xpath': u'descendant-or-self::t:Message/t:Culture',
+    },
+    u'has_attachments': {
+        u'xpath': u'descendant-or-self::t:Message/t:HasAttachments',
+    },
+    u'size': {
+        u'xpath': u'descendant-or-self::t:Message/t:Size',
+    },
+    u'importance': {
+        u'xpath': u'descendant-or-self::t:Message/t:Importance',
+    },
+    u'received': {
+        u'xpath': u'descendant-or-self::t:Message/t:DateTimeReceived',
+    },
+}
+
+
 class Exchange2010MailService(BaseExchangeMailService):
-    def list_mails(self):
-        return Exchange2010MailList(service=self.service, folder_id=self.folder_id)
+    def list_mails(self, as_records=False):
+        return Exchange2010MailList(service=self.service, folder_id=self.folder_id, as_records=as_records)
 
     def get_attachment(self, attachment_id):
         """
@@ -1197,9 +2255,10 @@ class Exchange2010MailService(BaseExchangeMailService):
 
 
 class Exchange2010MailList(object):
-    def __init__(self, service=None, folder_id=u'inbox', xml_result=None):
+    def __init__(self, service=None, folder_id=u'inbox', xml_result=None, as_records=False):
         self.service = service
         self.mail_folder_id = folder_id
+        self.as_records = as_records
         self.items = []
 
         if xml_result is None:
@@ -1215,6 +2274,9 @@ class Exchange2010MailList(object):
         loads additional mail info via soap
         if there are no items, nothing is done (empty items would cause soap error 500)
         """
+        if self.as_records:
+            raise TypeError(u"Records are read-only; list the mails without as_records to load extended properties.")
+
         if self.items:
             body = soap_request.get_mail_items(self.items)
             logging.info(etree.tostring(body))
@@ -1247,6 +2309,10 @@ class Exchange2010MailList(object):
             return
 
         self.count = len(mails)
+        if self.as_records:
+            self.items = [_item_record(ExchangeMailRecord, self.service, mail_xml, MAIL_PROPERTY_MAP) for mail_xml in mails]
+            return
+
         for mail_xml in mails:
             log.debug(u'Adding contact item to contact list...')
             mail = Exchange2010MailItem(service=self.service,
@@ -1259,7 +2325,7 @@ class Exchange2010MailList(object):
 
 class Exchange2010MailItem(BaseExchangeMailItem):
     def _init_from_service(self, id):
-        body = soap_request.get_item(exchange_id=id, format=u'AllProperties')
+        body = soap_request.render_get_item(exchange_id=id, format=u'AllProperties')
         response_xml = self.service.send(body)
 
         return self._init_from_xml(response_xml)
@@ -1309,46 +2375,8 @@ class Exchange2010MailItem(BaseExchangeMailItem):
         # Use relative selectors here so that we can call this in the
         # context of each Contact element without deepcopying.
 
-        property_map = {
-            u'id': {
-                u'xpath': u'descendant-or-self::t:Message/t:ItemId/@Id',
-            },
-            u'change_key': {
-                u'xpath': u'descendant-or-self::t:Message/t:ItemId/@ChangeKey',
-            },
-            u'subject': {
-                u'xpath': u'descendant-or-self::t:Subject',
-            },
-            u'sender_mail': {
-                u'xpath': u'descendant-or-self::t:Message/t:Sender/t:Mailbox/t:EmailAddress',
-            },
-            u'sender_name': {
-                u'xpath': u'descendant-or-self::t:Message/t:Sender/t:Mailbox/t:Name',
-            },
-            u'from_mail': {
-                u'xpath': u'descendant-or-self::t:Message/t:From/t:Mailbox/t:EmailAddress',
-            },
-            u'from_name': {
-                u'xpath': u'descendant-or-self::t:Message/t:From/t:Mailbox/t:Name',
-            },
-            u'culture': {
-                u'xpath': u'descendant-or-self::t:Message/t:Culture',
-            },
-            u'has_attachments': {
-                u'xpath': u'descendant-or-self::t:Message/t:HasAttachments',
-            },
-            u'size': {
-                u'xpath': u'descendant-or-self::t:Message/t:Size',
-            },
-            u'importance': {
-                u'xpath': u'descendant-or-self::t:Message/t:Importance',
-            },
-            u'received': {
-                u'xpath': u'descendant-or-self::t:Message/t:DateTimeReceived',
-            },
-        }
         return self.service._xpath_to_dict(
-            element=xml, property_map=property_map,
+            element=xml, property_map=MAIL_PROPERTY_MAP,
             namespace_map=soap_request.NAMESPACES,
         )
 
@@ -1446,26 +2474,103 @@ class Exchange2010MailItem(BaseExchangeMailItem):
         return "<Exchange2010MailItem: {}>".format(self.subject.encode('utf-8'))
 
 
+TASK_PROPERTY_MAP = {
+    u'id': {
+        u'xpath': u'descendant-or-self::t:Task/t:ItemId/@Id',
+    },
+    u'change_key': {
+        u'xpath': u'descendant-or-self::t:Task/t:ItemId/@ChangeKey',
+    },
+    u'folder_id': {
+        u'xpath': u'descendant-or-self::t:Task/t:ParentFolderId/@Id',
+    },
+    u'subject': {
+        u'xpath': u'descendant-or-self::t:Task/t:Subject',
+    },
+    u'body': {
+        u'xpath': u'descendant-or-self::t:Task/t:Body[@BodyType=\'Text\']',
+    },
+    u'categories': {
+        u'xpath': u'descendant-or-self::t:Task/t:Categories/t:String',
+    },
+    u'is_draft': {
+        u'xpath': u'descendant-or-self::t:Task/t:IsDraft',
+        u'cast': u'bool',
+    },
+    u'sent_at': {
+        u'xpath': u'descendant-or-self::t:Task/t:DateTimeSent',
+        u'cast': u'datetime',
+    },
+    u'created_at': {
+        u'xpath': u'descendant-or-self::t:Task/t:DateTimeCreated',
+        u'cast': u'datetime',
+    },
+    u'due_date': {
+        u'xpath': u"descendant-or-self::t:Task/t:DueDate",
+        u'cast': u'datetime',
+    },
+    # TODO: find a way to represent recurrence
+    # https://msdn.microsoft.com/en-us/library/office/aa564273(v=exchg.150).aspx
+    #u'recurrence': {
+    #    u'xpath': u"descendant-or-self::t:Task/t:Recurrence",
+    #},
+    u'is_complete': {
+        u'xpath': u'descendant-or-self::t:Task/t:IsComplete',
+        u'cast': u'bool',
+    },
+    u'owner': {
+        u'xpath': u'descendant-or-self::t:Task/t:Owner',
+    },
+    u'start_date': {
+        u'xpath': u'descendant-or-self::t:Task/t:StartDate',
+        u'cast': u'datetime',
+    },
+    u'status': {
+        u'xpath': u"descendant-or-self::t:Task/t:Status",
+    },
+    u'status_description': {
+        u'xpath': u"descendant-or-self::t:Task/t:StatusDescription",
+    },
+    u'last_modified_by': {
+        u'xpath': u"descendant-or-self::t:Task/t:LastModifiedName",
+    },
+    u'last_modified_at': {
+        u'xpath': u"descendant-or-self::t:Task/t:LastModifiedTime",
+        u'cast': u'datetime',
+    },
+}
+
+
 class Exchange2010TaskService(BaseExchangeTaskService):
     def get_task(self, id):
         return Exchange2010TaskItem(service=self.service, id=id)
 
-    def get_all_tasks(self):
+    def get_task_async(self, id):
+        """ :meth:`get_task` for asyncio: ``task = await tasks.get_task_async(id)``. """
+        return _in_executor(self.get_task, id)
+
+    def get_tasks(self, ids):
+        """ Fetches the tasks with these ids, all in one request, in the order given. """
+        return [Exchange2010TaskItem(service=self.service, xml=item) for item in self.service._load_items(ids)]
+
+    def get_all_tasks(self, as_records=False):
         """
         Return a list of all tasks in the current folder.
         """
         return Exchange2010TaskList(service=self.service,
-                                    folder_id=self.folder_id)
+                                    folder_id=self.folder_id,
+                                    as_records=as_records)
 
 
 class Exchange2010TaskList(object):
     """
     Creates & Stores a list of Exchange2010ContactItem objects in the
-    "self.items" variable.
+    "self.items" variable, or ExchangeTaskRecord tuples if as_records is set.
     """
-    def __init__(self, service, folder_id=None, xml_result=None):
+    def __init__(self, service, folder_id=None, xml_result=None, as_records=False):
         self.service = service
         self.folder_id = folder_id
+        self.as_records = as_records
         self.count = 0
         self.items = []
 
@@ -1485,6 +2590,10 @@ class Exchange2010TaskList(object):
             return
 
         self.count = len(tasks)
+        if self.as_records:
+            self.items = [_item_record(ExchangeTaskRecord, self.service, task_xml, TASK_PROPERTY_MAP) for task_xml in tasks]
+            return
+
         for task_xml in tasks:
             log.debug(u'Adding task item to task list...')
             task = Exchange2010TaskItem(service=self.service,
@@ -1502,14 +2611,21 @@ class Exchange2010TaskList(object):
 
 class Exchange2010TaskItem(BaseExchangeTaskItem):
     def _init_from_service(self, id):
-        body = soap_request.get_item(exchange_id=id, format=u'AllProperties')
+        if getattr(self.service, 'cache', None) is not None:
+            return self._init_from_properties(self.service._get_cached_item(u'task', id).properties)
+
+        if getattr(self.service, 'item_loader', None) is not None:
+            return self._init_from_xml(self.service.item_loader.load(self.service, id))
+
+        body = soap_request.render_get_item(exchange_id=id, format=u'AllProperties')
         response_xml = self.service.send(body)
 
         return self._init_from_xml(response_xml)
 
     def _init_from_xml(self, xml):
-        properties = self._parse_task_properties(xml)
+        return self._init_from_properties(self._parse_task_properties(xml))
 
+    def _init_from_properties(self, properties):
         self._id = properties.pop('id')
         self._change_key = properties.pop('change_key')
 
@@ -1520,75 +2636,217 @@ class Exchange2010TaskItem(BaseExchangeTaskItem):
     def _parse_task_properties(self, response):
         # Use relative selectors here so that we can call this in the
         # context of each Contact element without deepcopying.
-        property_map = {
-            u'id': {
-                u'xpath': u'descendant-or-self::t:Task/t:ItemId/@Id',
-            },
-            u'change_key': {
-                u'xpath': u'descendant-or-self::t:Task/t:ItemId/@ChangeKey',
-            },
-            u'folder_id': {
-                u'xpath': u'descendant-or-self::t:Task/t:ParentFolderId/@Id',
-            },
-            u'subject': {
-                u'xpath': u'descendant-or-self::t:Task/t:Subject',
-            },
-            u'body': {
-                u'xpath': u'descendant-or-self::t:Task/t:Body[@BodyType=\'Text\']',
-            },
-            u'categories': {
-                u'xpath': u'descendant-or-self::t:Task/t:Categories/t:String',
-            },
-            u'is_draft': {
-                u'xpath': u'descendant-or-self::t:Task/t:IsDraft',
-                u'cast': u'bool',
-            },
-            u'sent_at': {
-                u'xpath': u'descendant-or-self::t:Task/t:DateTimeSent',
-                u'cast': u'datetime',
-            },
-            u'created_at': {
-                u'xpath': u'descendant-or-self::t:Task/t:DateTimeCreated',
-                u'cast': u'datetime',
-            },
-            u'due_date': {
-                u'xpath': u"descendant-or-self::t:Task/t:DueDate",
-                u'cast': u'datetime',
-            },
-            # TODO: find a way to represent recurrence
-            # https://msdn.microsoft.com/en-us/library/office/aa564273(v=exchg.150).aspx
-            #u'recurrence': {
-            #    u'xpath': u"descendant-or-self::t:Task/t:Recurrence",
-            #},
-            u'is_complete': {
-                u'xpath': u'descendant-or-self::t:Task/t:IsComplete',
-                u'cast': u'bool',
-            },
-            u'owner': {
-                u'xpath': u'descendant-or-self::t:Task/t:Owner',
-            },
-            u'start_date': {
-                u'xpath': u'descendant-or-self::t:Task/t:StartDate',
-                u'cast': u'datetime',
-            },
-            u'status': {
-                u'xpath': u"descendant-or-self::t:Task/t:Status",
-            },
-            u'status_description': {
-                u'xpath': u"descendant-or-self::t:Task/t:StatusDescription",
-            },
-            u'last_modified_by': {
-                u'xpath': u"descendant-or-self::t:Task/t:LastModifiedName",
-            },
-            u'last_modified_at': {
-                u'xpath': u"descendant-or-self::t:Task/t:LastModifiedTime",
-                u'cast': u'datetime',
-            },
-        }
         return self.service._xpath_to_dict(
-            element=response, property_map=property_map,
+            element=response, property_map=TASK_PROPERTY_MAP,
             namespace_map=soap_request.NAMESPACES,
         )
 
     def __repr__(self):
         return "<Exchange2010TaskItem: {}>".format(self.subject.encode('utf-8'))
+
+
+class Exchange2010RoomService(BaseExchangeRoomService):
+    """
+    The organization's rooms, from GetRoomLists and GetRooms. Room lists, and the rooms in each, are
+    loaded the first time they're asked for and kept for *refresh_interval* seconds. ::
+
+        directory = service.rooms()
+        rooms = directory.rooms(u'building-one@example.com')
+        availability = directory.availability(rooms, start, end)
+
+    Checking rooms with :meth:`availability` costs one request per 100 rooms, where listing each
+    room's calendar with ``list_events(delegate_for=...)`` costs one per room.
+    """
+
+    # Exchange's limits for a single GetUserAvailability request
+    MAX_MAILBOXES_PER_REQUEST = 100
+    MAX_WINDOW = timedelta(days=42)
+
+    def __init__(self, service, refresh_interval=3600, clock=time.time):
+        super(Exchange2010RoomService, self).__init__(service, refresh_interval=refresh_interval)
+        self.clock = clock
+        self._room_lists = None
+        self._rooms = {}
+        # Only guards the dictionaries - lookups happen outside it, so two threads may both load something
+        self._lock = threading.Lock()
+
+    def room_lists(self):
+        """ Every room list, as :class:`ExchangeMailbox` tuples. """
+        with self._lock:
+            cached = self._room_lists
+
+        if cached is None or self._has_expired(cached):
+            response = self.service.send(soap_request.get_room_lists())
+            room_lists = [_parse_mailbox(node) for node in response.xpath(u'//m:RoomLists/t:Address', namespaces=soap_request.NAMESPACES)]
+            cached = (self.clock(), room_lists)
+
+            with self._lock:
+                self._room_lists = cached
+
+        return list(cached[1])
+
+    def rooms(self, room_list=None, max_workers=4):
+        """
+        The rooms in *room_list* (an address or an :class:`ExchangeMailbox`), or in every room list if
+        it isn't given, as :class:`ExchangeMailbox` tuples. Rooms that are in several lists are only
+        returned once.
+        """
+        if room_list is not None:
+            return list(self._rooms_in(_mailbox_email(room_list)))
+
+        room_lists = [room_list.email for room_list in self.room_lists()]
+        found = {}
+        for room_list, rooms, error in concurrent_map(self._rooms_in, room_lists, max_workers=max_workers):
+            if error is not None:
+                raise error
+            found[room_list] = rooms
+
+        seen = set()
+        result = []
+        for room_list in room_lists:
+            for room in found[room_list]:
+                key = _directory_key(room.email or u'')
+                if key not in seen:
+                    seen.add(key)
+                    result.append(room)
+
+        return result
+
+    def availability(self, rooms, start, end, interval=30, max_workers=4):
+        """
+        What each room has on between *start* and *end*. Returns a dictionary of room address ->
+        :class:`ExchangeAvailability`, whose busy periods are in UTC, in order, and leave out time
+        that's marked free. *rooms* can be addresses or :class:`ExchangeMailbox` tuples.
+
+        Rooms are asked about 100 at a time, and windows longer than 42 days are split up, as
+        Exchange requires; the requests are sent concurrently on up to *max_workers* threads. A room
+        Exchange can't answer for gets an ``error`` rather than failing the whole call.
+        """
+        start = convert_datetime_to_utc(start)
+        end = convert_datetime_to_utc(end)
+
+        emails = []
+        seen = set()
+        for room in rooms:
+            email = _mailbox_email(room)
+            if _directory_key(email) not in seen:
+                seen.add(_directory_key(email))
+                emails.append(email)
+
+        windows = []
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + self.MAX_WINDOW, end)
+            windows.append((window_start, window_end))
+            window_start = window_end
+
+        batch_size = self.MAX_MAILBOXES_PER_REQUEST
+        requests = [
+            (tuple(emails[index:index + batch_size]), window)
+            for index in range(0, len(emails), batch_size)
+            for window in windows
+        ]
+
+        busy_periods = dict((email, set()) for email in emails)
+        errors = {}
+
+        def ask(request):
+            batch, (window_start, window_end) = request
+            return self._availability_for(batch, window_start, window_end, interval)
+
+        for (batch, _), answers, error in concurrent_map(ask, requests, max_workers=max_workers):
+            if error is not None:
+                answers = [(email, (), error) for email in batch]
+
+            for email, periods, error in answers:
+                if error is not None:
+                    errors.setdefault(email, error)
+                else:
+                    busy_periods[email].update(periods)
+
+        return dict(
+            (email, ExchangeAvailability(
+                email=email,
+                busy_periods=[] if email in errors else sorted(busy_periods[email]),
+                error=errors.get(email),
+            ))
+            for email in emails
+        )
+
+    def refresh(self):
+        """ Forgets the room lists and rooms, so they're loaded again next time they're asked for. """
+        with self._lock:
+            self._room_lists = None
+            self._rooms = {}
+
+    def _has_expired(self, cached):
+        return self.clock() - cached[0] >= self.refresh_interval
+
+    def _rooms_in(self, room_list):
+        key = _directory_key(room_list)
+        with self._lock:
+            cached = self._rooms.get(key)
+
+        if cached is None or self._has_expired(cached):
+            response = self.service.send(soap_request.get_rooms(room_list))
+            rooms = tuple(_parse_mailbox(node) for node in response.xpath(u'//m:Rooms/t:Room/t:Id', namespaces=soap_request.NAMESPACES))
+            cached = (self.clock(), rooms)
+
+            with self._lock:
+                self._rooms[key] = cached
+
+        return cached[1]
+
+    def _availability_for(self, emails, start, end, interval):
+        """ Returns an ``(email, busy periods, exception)`` triple for each room, from one GetUserAvailability request. """
+        body = soap_request.get_user_availability(emails, start, end, interval=interval)
+        response = self.service.send(body, check_errors=False)
+        answers = response.xpath(u'//m:FreeBusyResponseArray/m:FreeBusyResponse', namespaces=soap_request.NAMESPACES)
+
+        if len(answers) != len(emails):
+            raise FailedExchangeException(u"Asked Exchange about %d rooms, but got %d answers" % (len(emails), len(answers)))
+
+        result = []
+        for email, answer in zip(emails, answers):
+            code = answer.findtext(u'm:ResponseMessage/m:ResponseCode', namespaces=soap_request.NAMESPACES)
+            if code is None:
+                error = FailedExchangeException(u"Exchange server did not return a status response", None)
+            else:
+                error = _exception_for_response_code(code)
+
+            if error is not None:
+                result.append((email, (), error))
+                continue
+
+            periods = []
+            for event in answer.iterfind(u'm:FreeBusyView/t:CalendarEventArray/t:CalendarEvent', namespaces=soap_request.NAMESPACES):
+                busy_type = event.findtext(u't:BusyType', namespaces=soap_request.NAMESPACES)
+                if busy_type == u'Free':
+                    continue
+
+                periods.append(ExchangeBusyPeriod(
+                    start=_parse_availability_time(event.findtext(u't:StartTime', namespaces=soap_request.NAMESPACES)),
+                    end=_parse_availability_time(event.findtext(u't:EndTime', namespaces=soap_request.NAMESPACES)),
+                    busy_type=busy_type,
+                ))
+
+            result.append((email, periods, None))
+
+        return result
+
+
+def _mailbox_email(mailbox):
+    return mailbox.email if isinstance(mailbox, ExchangeMailbox) else mailbox
+
+
+def _parse_availability_time(text):
+    # We asked for UTC, so that's what these are, though they don't say so
+    return datetime.strptime(text[:19], soap_request.EXCHANGE_AVAILABILITY_DATETIME_FORMAT).replace(tzinfo=utc)
+
+
+# How Exchange2010Service parses each kind of item it keeps in its cache, from a single item element.
+CACHED_ITEM_PARSERS = {
+    u'event': _parse_calendar_item,
+    u'contact': lambda service, item: service._xpath_to_dict(element=item, property_map=CONTACT_PROPERTY_MAP, namespace_map=soap_request.NAMESPACES),
+    u'task': lambda service, item: service._xpath_to_dict(element=item, property_map=TASK_PROPERTY_MAP, namespace_map=soap_request.NAMESPACES),
+}
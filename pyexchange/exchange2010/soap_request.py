@@ -5,6 +5,8 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
 from lxml.builder import ElementMaker
+from ..base.soap_template import SOAPTemplate
+from ..base.soap_stream import SOAPRequestStream, write_item
 from ..utils import convert_datetime_to_utc
 from ..compat import _unicode
 
@@ -12,13 +14,23 @@ MSG_NS = u'http://schemas.microsoft.com/exchange/services/2006/messages'
 TYPE_NS = u'http://schemas.microsoft.com/exchange/services/2006/types'
 SOAP_NS = u'http://schemas.xmlsoap.org/soap/envelope/'
 
+ERROR_NS = u'http://schemas.microsoft.com/exchange/services/2006/errors'
+
 NAMESPACES = {u'm': MSG_NS, u't': TYPE_NS, u's': SOAP_NS}
 
+# For reading the details Exchange puts in a SOAP fault
+FAULT_NAMESPACES = {u's': SOAP_NS, u'e': ERROR_NS, u't': TYPE_NS}
+
+# What an operation element declares when a request is streamed - the envelope declares s
+OPERATION_NAMESPACES = {u'm': MSG_NS, u't': TYPE_NS}
+
 M = ElementMaker(namespace=MSG_NS, nsmap=NAMESPACES)
 T = ElementMaker(namespace=TYPE_NS, nsmap=NAMESPACES)
 
 EXCHANGE_DATETIME_FORMAT = u"%Y-%m-%dT%H:%M:%SZ"
 EXCHANGE_DATE_FORMAT = u"%Y-%m-%d"
+# GetUserAvailability times are in the request's time zone, so they don't carry one
+EXCHANGE_AVAILABILITY_DATETIME_FORMAT = u"%Y-%m-%dT%H:%M:%S"
 
 DISTINGUISHED_IDS = (
     'calendar', 'contacts', 'deleteditems', 'drafts', 'inbox', 'journal', 'notes', 'outbox', 'sentitems',
@@ -34,6 +46,24 @@ def exchange_header():
     return T.RequestServerVersion({u'Version': u'Exchange2010'})
 
 
+def exchange_impersonation(address, id_type=u'PrimarySmtpAddress'):
+    """
+      Makes a request act as another mailbox. The account we log in with needs the
+      ApplicationImpersonation role. *id_type* is PrimarySmtpAddress, SmtpAddress, PrincipalName or SID.
+
+      <t:ExchangeImpersonation>
+        <t:ConnectingSID>
+          <t:PrimarySmtpAddress>{{ address }}</t:PrimarySmtpAddress>
+        </t:ConnectingSID>
+      </t:ExchangeImpersonation>
+    """
+    return T.ExchangeImpersonation(
+        T.ConnectingSID(
+            getattr(T, id_type)(address)
+        )
+    )
+
+
 def resource_node(element, resources):
     """
     Helper function to generate a person/conference room node from an email address
@@ -130,7 +160,31 @@ def get_item(exchange_id, format=u"Default"):
     )
     return root
 
-def get_calendar_items(format=u"Default", calendar_id=u'calendar', start=None, end=None, max_entries=999999, delegate_for=None):
+
+GET_ITEM_TEMPLATE = SOAPTemplate(lambda hole: M.GetItem(
+    M.ItemShape(
+        T.BaseShape(hole(u'format'))
+    ),
+    M.ItemIds(
+        *hole.each(u'ids', lambda id: T.ItemId(Id=id))
+    )
+))
+
+
+def render_get_item(exchange_id, format=u"Default"):
+    """
+      The same request as get_item, but filled in from a precompiled template instead of being built
+      element by element. Returns a SOAPRequestBody, which the service sends as it is.
+    """
+    ids = exchange_id if isinstance(exchange_id, (list, tuple)) else [exchange_id]
+    return GET_ITEM_TEMPLATE.render(format=format, ids=ids)
+
+
+def get_calendar_items(format=u"Default", calendar_id=u'calendar', start=None, end=None, max_entries=999999, delegate_for=None, field_uris=None):
+    """
+      Lists the calendar items between two dates. If *field_uris* is given, asks for just those
+      properties (plus the item id) instead of a whole *format*.
+    """
     start = start.strftime(EXCHANGE_DATETIME_FORMAT)
     end = end.strftime(EXCHANGE_DATETIME_FORMAT)
 
@@ -147,11 +201,19 @@ def get_calendar_items(format=u"Default", calendar_id=u'calendar', start=None, e
     else:
         target = M.ParentFolderIds(T.FolderId(Id=calendar_id))
 
+    if field_uris is None:
+        shape = M.ItemShape(
+            T.BaseShape(format)
+        )
+    else:
+        shape = M.ItemShape(
+            T.BaseShape(u'IdOnly'),
+            T.AdditionalProperties(*[T.FieldURI(FieldURI=field_uri) for field_uri in field_uris])
+        )
+
     root = M.FindItem(
         {u'Traversal': u'Shallow'},
-        M.ItemShape(
-            T.BaseShape(format)
-        ),
+        shape,
         M.CalendarView({
             u'MaxEntriesReturned': _unicode(max_entries),
             u'StartDate': start,
@@ -423,24 +485,30 @@ def new_event(event):
   </m:CreateItem>
     """
 
-    id = T.DistinguishedFolderId(Id=event.calendar_id) if event.calendar_id in DISTINGUISHED_IDS else T.FolderId(Id=event.calendar_id)
+    root = M.CreateItem(
+        M.SavedItemFolderId(folder_id_node(event.calendar_id)),
+        M.Items(calendar_item(event)),
+        SendMeetingInvitations="SendToAllAndSaveCopy"
+    )
+
+    return root
+
+
+def folder_id_node(folder_id):
+    return T.DistinguishedFolderId(Id=folder_id) if folder_id in DISTINGUISHED_IDS else T.FolderId(Id=folder_id)
+
+
+def calendar_item(event):
+    """ The ``<t:CalendarItem>`` for a new event - what :func:`new_event` puts in its ``<m:Items>``. """
 
     start = convert_datetime_to_utc(event.start)
     end = convert_datetime_to_utc(event.end)
 
-    root = M.CreateItem(
-        M.SavedItemFolderId(id),
-        M.Items(
-            T.CalendarItem(
-                T.Subject(event.subject),
-                T.Body(event.body or u'', BodyType="HTML"),
-                )
-        ),
-        SendMeetingInvitations="SendToAllAndSaveCopy"
+    calendar_node = T.CalendarItem(
+        T.Subject(event.subject),
+        T.Body(event.body or u'', BodyType="HTML"),
     )
 
-    calendar_node = root.xpath(u'/m:CreateItem/m:Items/t:CalendarItem', namespaces=NAMESPACES)[0]
-
     if event.reminder_minutes_before_start:
         calendar_node.append(T.ReminderIsSet('true'))
         calendar_node.append(T.ReminderMinutesBeforeStart(str(event.reminder_minutes_before_start)))
@@ -496,7 +564,24 @@ def new_event(event):
             )
         )
 
-    return root
+    return calendar_node
+
+
+def stream_new_events(events, calendar_id=u'calendar'):
+    """
+      Creates many events in one CreateItem request, saved to *calendar_id*. Each event's
+      CalendarItem is built, written out and dropped in turn, so the request never exists as a
+      whole tree. Returns a SOAPRequestStream.
+    """
+    def write(xf):
+        with xf.element(u'{%s}CreateItem' % MSG_NS, SendMeetingInvitations=u"SendToAllAndSaveCopy", nsmap=OPERATION_NAMESPACES):
+            write_item(xf, M.SavedItemFolderId(folder_id_node(calendar_id)))
+            with xf.element(u'{%s}Items' % MSG_NS):
+                for event in events:
+                    write_item(xf, calendar_item(event))
+                    yield
+
+    return SOAPRequestStream(u'CreateItem', write)
 
 
 def delete_event(event):
@@ -564,22 +649,36 @@ def update_property_node(node_to_insert, field_uri):
     return root
 
 
+def append_property_node(node_to_insert, field_uri):
+    """ Helper function - generates an AppendToItemField which tells Exchange you want to add to a collection, not replace it."""
+    root = T.AppendToItemField(
+        T.FieldURI(FieldURI=field_uri),
+        T.CalendarItem(node_to_insert)
+    )
+    return root
+
+
 def update_item(event, updated_attributes, calendar_item_update_operation_type):
     """ Saves updates to an event in the store. Only request changes for attributes that have actually changed."""
 
     root = M.UpdateItem(
-        M.ItemChanges(
-            T.ItemChange(
-                T.ItemId(Id=event.id, ChangeKey=event.change_key),
-                T.Updates()
-            )
-        ),
+        M.ItemChanges(item_change(event, updated_attributes)),
         ConflictResolution=u"AlwaysOverwrite",
         MessageDisposition=u"SendAndSaveCopy",
         SendMeetingInvitationsOrCancellations=calendar_item_update_operation_type
     )
 
-    update_node = root.xpath(u'/m:UpdateItem/m:ItemChanges/t:ItemChange/t:Updates', namespaces=NAMESPACES)[0]
+    return root
+
+
+def item_change(event, updated_attributes):
+    """ The ``<t:ItemChange>`` for an event's changed attributes - what :func:`update_item` puts in its ``<m:ItemChanges>``. """
+
+    update_node = T.Updates()
+    change_node = T.ItemChange(
+        T.ItemId(Id=event.id, ChangeKey=event.change_key),
+        update_node,
+    )
 
     # if not send_only_to_changed_attendees:
     #   # We want to resend invites, which you do by setting an attribute to the same value it has. Right now, events
@@ -622,7 +721,25 @@ def update_item(event, updated_attributes, calendar_item_update_operation_type):
             update_property_node(field_uri="calendar:Location", node_to_insert=T.Location(event.location))
         )
 
-    if u'attendees' in updated_attributes:
+    # If people were only added, just send them - re-sending the whole list of a big meeting is slow
+    added_attendees = event._pending_additions(u'attendees') if u'attendees' in updated_attributes else None
+    added_resources = event._pending_additions(u'resources') if u'resources' in updated_attributes else None
+
+    if added_attendees is not None:
+        required = [attendee for attendee in added_attendees if attendee.required]
+        optional = [attendee for attendee in added_attendees if not attendee.required]
+
+        if required:
+            update_node.append(
+                append_property_node(field_uri="calendar:RequiredAttendees", node_to_insert=resource_node(element=T.RequiredAttendees(), resources=required))
+            )
+
+        if optional:
+            update_node.append(
+                append_property_node(field_uri="calendar:OptionalAttendees", node_to_insert=resource_node(element=T.OptionalAttendees(), resources=optional))
+            )
+
+    elif u'attendees' in updated_attributes:
 
         if event.required_attendees:
             required = resource_node(element=T.RequiredAttendees(), resources=event.required_attendees)
@@ -642,7 +759,13 @@ def update_item(event, updated_attributes, calendar_item_update_operation_type):
         else:
             update_node.append(delete_field(field_uri="calendar:OptionalAttendees"))
 
-    if u'resources' in updated_attributes:
+    if added_resources is not None:
+        if added_resources:
+            update_node.append(
+                append_property_node(field_uri="calendar:Resources", node_to_insert=resource_node(element=T.Resources(), resources=added_resources))
+            )
+
+    elif u'resources' in updated_attributes:
         if event.resources:
             resources = resource_node(element=T.Resources(), resources=event.resources)
 
@@ -717,4 +840,144 @@ def update_item(event, updated_attributes, calendar_item_update_operation_type):
                 update_property_node(field_uri="calendar:Recurrence", node_to_insert=recurrence_node)
             )
 
-    return root
+    return change_node
+
+
+def stream_update_items(changes, calendar_item_update_operation_type):
+    """
+      Saves changes to many events in one UpdateItem request. *changes* is a list of
+      ``(event, updated_attributes)`` pairs; each ItemChange is written out as soon as it's built.
+      Returns a SOAPRequestStream.
+    """
+    def write(xf):
+        attributes = {
+            u'ConflictResolution': u"AlwaysOverwrite",
+            u'MessageDisposition': u"SendAndSaveCopy",
+            u'SendMeetingInvitationsOrCancellations': calendar_item_update_operation_type,
+        }
+        with xf.element(u'{%s}UpdateItem' % MSG_NS, attributes, nsmap=OPERATION_NAMESPACES):
+            with xf.element(u'{%s}ItemChanges' % MSG_NS):
+                for event, updated_attributes in changes:
+                    write_item(xf, item_change(event, updated_attributes))
+                    yield
+
+    return SOAPRequestStream(u'UpdateItem', write)
+
+
+def resolve_names(query, return_full_contact_data=False):
+    """
+      Asks the directory for mailboxes matching a name, alias or partial address. Exchange only takes
+      one entry per request.
+
+      <m:ResolveNames ReturnFullContactData="false">
+        <m:UnresolvedEntry>{{ query }}</m:UnresolvedEntry>
+      </m:ResolveNames>
+    """
+    return M.ResolveNames(
+        M.UnresolvedEntry(query),
+        ReturnFullContactData=u'true' if return_full_contact_data else u'false',
+    )
+
+
+def expand_dl(email):
+    """
+      Asks for the direct members of a distribution list.
+
+      <m:ExpandDL>
+        <m:Mailbox>
+          <t:EmailAddress>{{ email }}</t:EmailAddress>
+        </m:Mailbox>
+      </m:ExpandDL>
+    """
+    return M.ExpandDL(
+        M.Mailbox(
+            T.EmailAddress(email)
+        )
+    )
+
+
+def get_room_lists():
+    """
+      Asks for every room list in the organization.
+
+      <m:GetRoomLists/>
+    """
+    return M.GetRoomLists()
+
+
+def get_rooms(room_list):
+    """
+      Asks for the rooms in a room list.
+
+      <m:GetRooms>
+        <m:RoomList>
+          <t:EmailAddress>{{ room_list }}</t:EmailAddress>
+        </m:RoomList>
+      </m:GetRooms>
+    """
+    return M.GetRooms(
+        M.RoomList(
+            T.EmailAddress(room_list)
+        )
+    )
+
+
+def _utc_transition():
+    return [T.Bias(u'0'), T.Time(u'00:00:00'), T.DayOrder(u'1'), T.Month(u'1'), T.DayOfWeek(u'Sunday')]
+
+
+def get_user_availability(emails, start, end, attendee_type=u'Room', interval=30):
+    """
+      Asks for the free/busy times of up to 100 mailboxes over a window of at most 42 days. Times
+      are sent, and come back, in UTC.
+
+      <m:GetUserAvailabilityRequest>
+        <t:TimeZone>
+          <t:Bias>0</t:Bias>
+          <t:StandardTime>...</t:StandardTime>
+          <t:DaylightTime>...</t:DaylightTime>
+        </t:TimeZone>
+        <m:MailboxDataArray>
+          <t:MailboxData>
+            <t:Email><t:Address>{{ email }}</t:Address></t:Email>
+            <t:AttendeeType>Room</t:AttendeeType>
+          </t:MailboxData>
+        </m:MailboxDataArray>
+        <t:FreeBusyViewOptions>
+          <t:TimeWindow>
+            <t:StartTime>{{ start }}</t:StartTime>
+            <t:EndTime>{{ end }}</t:EndTime>
+          </t:TimeWindow>
+          <t:MergedFreeBusyIntervalInMinutes>30</t:MergedFreeBusyIntervalInMinutes>
+          <t:RequestedView>FreeBusy</t:RequestedView>
+        </t:FreeBusyViewOptions>
+      </m:GetUserAvailabilityRequest>
+    """
+    start = convert_datetime_to_utc(start).strftime(EXCHANGE_AVAILABILITY_DATETIME_FORMAT)
+    end = convert_datetime_to_utc(end).strftime(EXCHANGE_AVAILABILITY_DATETIME_FORMAT)
+
+    mailboxes = M.MailboxDataArray()
+    for email in emails:
+        mailboxes.append(
+            T.MailboxData(
+                T.Email(T.Address(email)),
+                T.AttendeeType(attendee_type),
+            )
+        )
+
+    return M.GetUserAvailabilityRequest(
+        T.TimeZone(
+            T.Bias(u'0'),
+            T.StandardTime(*_utc_transition()),
+            T.DaylightTime(*_utc_transition()),
+        ),
+        mailboxes,
+        T.FreeBusyViewOptions(
+            T.TimeWindow(
+                T.StartTime(start),
+                T.EndTime(end),
+            ),
+            T.MergedFreeBusyIntervalInMinutes(_unicode(interval)),
+            T.RequestedView(u'FreeBusy'),
+        ),
+    )
@@ -0,0 +1,247 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+try:
+    import queue
+except ImportError:  # python 2
+    import Queue as queue
+
+log = logging.getLogger('pyexchange')
+
+# What a hedge returns if it decides not to send its copy after all
+NOT_SENT = object()
+
+
+class ExchangeHedgingPolicy(object):
+    """
+    Sends a second copy of a read that's taking unusually long, and uses whichever answer comes back
+    first. Pass one to the service to turn hedging on::
+
+        service = Exchange2010Service(connection=connection, hedging=ExchangeHedgingPolicy())
+
+    Only the *operations* named are hedged - by default GetItem, FindItem and GetFolder. The second
+    copy goes out once the first has been waiting for *delay* seconds or, if that isn't given, for the
+    *percentile* latency of the last *window* requests (but no less than *minimum_delay*). Until
+    *minimum_samples* requests have been timed, nothing is hedged. The slower copy is left to finish
+    on its own and its answer is thrown away, and a second copy that hasn't gone out by the time the
+    first answers isn't sent at all.
+
+    Both copies run on threads the policy keeps for reuse, while the caller waits for whichever
+    answers first. When nothing could be hedged - we don't know the delay yet, or the budget's empty -
+    the call is made on the caller's own thread.
+
+    With ``prefer_fastest`` on the connection, the second copy goes to a different URL, since URLs with
+    requests in flight score worse.
+
+    Hedges come out of a budget, the same way retries do, so a slow server doesn't get twice our
+    usual traffic: we start with *budget_minimum* hedges in hand, and every request adds
+    *budget_ratio* of one, up to *budget_minimum* + *budget_ratio* times a hundred.
+    """
+
+    OPERATIONS = frozenset([u'GetItem', u'FindItem', u'GetFolder'])
+
+    def __init__(self, delay=None, percentile=95, minimum_delay=0.01, window=200, minimum_samples=20,
+                 budget_ratio=0.05, budget_minimum=5, operations=OPERATIONS, clock=time.time):
+        self.fixed_delay = delay
+        self.percentile = percentile
+        self.minimum_delay = minimum_delay
+        self.minimum_samples = minimum_samples
+        self.budget_ratio = budget_ratio
+        self.budget_minimum = budget_minimum
+        self.operations = frozenset(operations)
+        self.clock = clock
+
+        self.budget = float(budget_minimum)
+        self.requests = 0
+        self.hedges = 0
+        self.hedges_won = 0
+        self.over_budget = 0
+        self.not_sent = 0
+
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._workers = _Workers()
+
+    def call(self, function, hedge=None):
+        """
+        Calls *function*, and if that's slow, *hedge* (or *function* again) alongside. *hedge* can
+        return :data:`NOT_SENT` instead of an answer if it decides not to send anything after all.
+        """
+        with self._lock:
+            self.requests += 1
+            self.budget = min(self.budget + self.budget_ratio, self.budget_minimum + self.budget_ratio * 100)
+            can_hedge = self.budget >= 1
+
+        delay = self.delay()
+        started = self.clock()
+
+        if delay is None or not can_hedge:
+            result = function()
+            elapsed = self.clock() - started
+            self._record(elapsed)
+
+            if delay is not None and elapsed >= delay:
+                with self._lock:
+                    self.over_budget += 1
+            return result
+
+        outcomes = queue.Queue()
+        decided = threading.Event()
+
+        def run(hedged, call):
+            if hedged and decided.is_set():
+                # The first copy got in while this one was being started
+                result = NOT_SENT
+            else:
+                try:
+                    result = call()
+                except Exception as err:
+                    outcomes.put((hedged, None, err))
+                    return
+
+            if result is NOT_SENT:
+                self._not_sent()
+            else:
+                decided.set()
+            outcomes.put((hedged, result, None))
+
+        self._workers.run(lambda: run(False, function))
+        pending = 1
+
+        try:
+            outcome = outcomes.get(timeout=delay)
+        except queue.Empty:
+            if self._may_hedge():
+                log.debug(u'No answer after %.3fs, sending a second copy', delay)
+                self._workers.run(lambda: run(True, hedge or function))
+                pending += 1
+            outcome = outcomes.get()
+        pending -= 1
+
+        # If one copy failed, or wasn't sent, the other may still come through
+        first_error = None
+        while True:
+            hedged, result, error = outcome
+            if error is None and result is not NOT_SENT:
+                break
+            if first_error is None:
+                first_error = error
+
+            if not pending:
+                break
+            outcome = outcomes.get()
+            pending -= 1
+
+        decided.set()
+        if error is not None or result is NOT_SENT:
+            raise first_error
+
+        self._record(self.clock() - started)
+        if hedged:
+            with self._lock:
+                self.hedges_won += 1
+
+        return result
+
+    def delay(self):
+        """ How long to wait before hedging, or None if we don't know enough yet to hedge. """
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+
+        with self._lock:
+            if len(self._latencies) < self.minimum_samples:
+                return None
+            latencies = sorted(self._latencies)
+
+        index = int(math.ceil(self.percentile / 100.0 * len(latencies))) - 1
+        return max(self.minimum_delay, latencies[max(index, 0)])
+
+    def stats(self):
+        """
+        Requests seen, second copies sent, second copies that won, hedges skipped for lack of budget,
+        and hedges that weren't sent after all - see :meth:`call`.
+        """
+        with self._lock:
+            return {
+                u'requests': self.requests,
+                u'hedges': self.hedges,
+                u'hedges_won': self.hedges_won,
+                u'over_budget': self.over_budget,
+                u'not_sent': self.not_sent,
+                u'budget': self.budget,
+            }
+
+    def _may_hedge(self):
+        with self._lock:
+            if self.budget < 1:
+                self.over_budget += 1
+                return False
+
+            self.budget -= 1
+            self.hedges += 1
+            return True
+
+    def _not_sent(self):
+        with self._lock:
+            self.budget += 1
+            self.hedges -= 1
+            self.not_sent += 1
+
+    def _record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+
+class _Workers(object):
+    """
+    Threads that run whatever they're handed, kept once they're done and reused for the next thing
+    rather than started for every call. One that's been idle for *idle_timeout* seconds goes away.
+    """
+
+    def __init__(self, idle_timeout=60):
+        self.idle_timeout = idle_timeout
+        self._jobs = queue.Queue()
+        # Threads waiting for a job, less the jobs already waiting for them
+        self._idle = 0
+        self._lock = threading.Lock()
+
+    def run(self, job):
+        with self._lock:
+            start = self._idle == 0
+            if not start:
+                self._idle -= 1
+            self._jobs.put(job)
+
+        if start:
+            thread = threading.Thread(target=self._work)
+            # A copy we've stopped waiting for mustn't keep the process alive
+            thread.daemon = True
+            thread.start()
+
+    def _work(self):
+        job = self._jobs.get()
+
+        while True:
+            job()
+
+            with self._lock:
+                self._idle += 1
+
+            while True:
+                try:
+                    job = self._jobs.get(timeout=self.idle_timeout)
+                    break
+                except queue.Empty:
+                    with self._lock:
+                        if self._idle > 0:
+                            self._idle -= 1
+                            return
@@ -0,0 +1,120 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import logging
+import random
+import threading
+import time
+
+from .exceptions import ExchangeEndpointUnavailableException, ExchangeInternalServerTransientErrorException, ExchangeServerBusyException
+
+log = logging.getLogger('pyexchange')
+
+
+class ExchangeRetryPolicy(object):
+    """
+    Sends a request again when Exchange answers with a transient error - an internal transient error,
+    throttling, or a server failing outright - as long as the request is safe to repeat. This sits above the connection, so it
+    doesn't replace any retrying the transport does.
+
+    A request is tried at most *attempts* times. Between tries we wait for as long as Exchange asked,
+    or failing that an exponentially growing, jittered delay starting at *base_delay* seconds. If
+    Exchange asks for more than *max_delay* seconds, we give up straight away rather than hold the
+    caller up. When a server failed and the connection has a healthier one to send the retry to, we
+    retry straight away.
+
+    Retries come out of a budget, so a flapping server doesn't get hit with a multiple of our usual
+    traffic: we start with *budget_minimum* retries in hand, and every first try adds *budget_ratio*
+    of a retry, up to *budget_minimum* + *budget_ratio* times a hundred. ``stats()`` says how it's
+    going.
+    """
+
+    RETRYABLE_EXCEPTIONS = (ExchangeInternalServerTransientErrorException, ExchangeServerBusyException, ExchangeEndpointUnavailableException)
+
+    def __init__(self, attempts=3, base_delay=0.5, max_delay=30, budget_ratio=0.1, budget_minimum=10, sleep=time.sleep, random=random.random):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_minimum = budget_minimum
+        self.sleep = sleep
+        self.random = random
+
+        self.budget = float(budget_minimum)
+        self.requests = 0
+        self.retries = 0
+        self.recovered = 0
+        self.gave_up = 0
+        self.over_budget = 0
+
+        self._lock = threading.Lock()
+
+    def call(self, function, idempotent=True):
+        """ Calls *function*, calling it again if it raises a transient error and *idempotent* is set. """
+        with self._lock:
+            self.requests += 1
+            self.budget = min(self.budget + self.budget_ratio, self.budget_minimum + self.budget_ratio * 100)
+
+        attempt = 1
+        while True:
+            try:
+                result = function()
+            except self.RETRYABLE_EXCEPTIONS as err:
+                if not idempotent:
+                    raise
+
+                delay = self.delay(attempt, err)
+                if not self._may_retry(attempt, delay):
+                    raise
+
+                log.info(u'Exchange gave a transient error (%s), trying again in %.1fs', err, delay)
+                self.sleep(delay)
+                attempt += 1
+            else:
+                if attempt > 1:
+                    with self._lock:
+                        self.recovered += 1
+                return result
+
+    def delay(self, attempt, error):
+        """ How long to wait after try number *attempt* failed with *error*. """
+        if getattr(error, 'failover_available', False):
+            return 0
+
+        back_off_milliseconds = getattr(error, 'back_off_milliseconds', None)
+        if back_off_milliseconds:
+            return back_off_milliseconds / 1000.0
+
+        # "Equal jitter": somewhere between half and all of the exponential delay
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay / 2 + delay / 2 * self.random()
+
+    def stats(self):
+        """ Requests seen, retries made, requests that succeeded after a retry, gave up, or ran out of budget. """
+        with self._lock:
+            return {
+                u'requests': self.requests,
+                u'retries': self.retries,
+                u'recovered': self.recovered,
+                u'gave_up': self.gave_up,
+                u'over_budget': self.over_budget,
+                u'budget': self.budget,
+            }
+
+    def _may_retry(self, attempt, delay):
+        with self._lock:
+            if attempt >= self.attempts or delay > self.max_delay:
+                self.gave_up += 1
+                return False
+
+            if self.budget < 1:
+                self.over_budget += 1
+                self.gave_up += 1
+                return False
+
+            self.budget -= 1
+            self.retries += 1
+            return True
@@ -0,0 +1,156 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from .exceptions import ExchangeServerBusyException
+
+log = logging.getLogger('pyexchange')
+
+
+class AdaptiveConcurrencyLimiter(object):
+    """
+    Limits how many requests are in flight at once, and finds the limit as it goes, AIMD-style: every
+    request that succeeds raises the limit by *increase* / limit (so by about *increase* for each
+    limit's worth of successes), and every request Exchange throttles multiplies it by *decrease*.
+    The limit stays between *minimum* and *maximum*.
+
+    If Exchange says how long to back off, no new requests start until that's passed. ::
+
+        with limiter.request():
+            service.send(...)
+    """
+
+    def __init__(self, initial=10, minimum=1, maximum=64, increase=1.0, decrease=0.5, clock=time.time):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.clock = clock
+
+        self.in_flight = 0
+        self.resume_at = 0
+        self.successes = 0
+        self.throttles = 0
+
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """ Waits for a free slot, for up to *timeout* seconds if given. Returns True if it got one. """
+        deadline = None if timeout is None else self.clock() + timeout
+
+        with self._condition:
+            while True:
+                now = self.clock()
+                wait = None
+
+                if now < self.resume_at:
+                    wait = self.resume_at - now
+                elif self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return True
+
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wait = min(wait, deadline - now) if wait is not None else deadline - now
+
+                self._condition.wait(wait)
+
+    def release(self, throttled=False, back_off_milliseconds=None):
+        """
+        Gives a slot back. Pass *throttled* if Exchange throttled the request, and ``None`` for
+        *throttled* if it failed some other way, which doesn't move the limit.
+        """
+        with self._condition:
+            self.in_flight -= 1
+
+            if throttled:
+                self.throttles += 1
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                if back_off_milliseconds:
+                    self.resume_at = max(self.resume_at, self.clock() + back_off_milliseconds / 1000.0)
+                log.info(u'Exchange is throttling us, cutting concurrency to %d', int(self.limit))
+            elif throttled is not None:
+                self.successes += 1
+                self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+            self._condition.notify_all()
+
+    @contextmanager
+    def request(self, timeout=None):
+        """
+        Holds a slot for the duration of a ``with`` block, and learns from how it went. With a
+        *timeout*, the block gets False if no slot came free in time, and shouldn't send anything. ::
+
+            with limiter.request(timeout=0) as acquired:
+                if acquired:
+                    service.send(...)
+        """
+        if not self.acquire(timeout):
+            yield False
+            return
+
+        try:
+            yield True
+        except ExchangeServerBusyException as err:
+            self.release(throttled=True, back_off_milliseconds=err.back_off_milliseconds)
+            raise
+        except BaseException:
+            self.release(throttled=None)
+            raise
+        else:
+            self.release()
+
+    def stats(self):
+        return {
+            u'limit': int(self.limit),
+            u'in_flight': self.in_flight,
+            u'successes': self.successes,
+            u'throttles': self.throttles,
+        }
+
+
+class _Unlimited(object):
+    """ Stands in for a limiter when a service isn't throttled: every request gets a slot at once. """
+
+    @contextmanager
+    def request(self, timeout=None):
+        yield True
+
+
+UNLIMITED = _Unlimited()
+
+
+class ExchangeThrottling(object):
+    """
+    An :class:`AdaptiveConcurrencyLimiter` per throttling budget - the account we log in as, or the
+    mailbox we're impersonating - each made the first time it's needed, with *limiter_settings*.
+    Pass one to the service to turn throttling on, as ``Exchange2010Service(..., throttling=ExchangeThrottling())``;
+    it's then ``service.throttling``, which the service's copies share.
+    """
+
+    def __init__(self, **limiter_settings):
+        self.limiter_settings = limiter_settings
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def limiter_for(self, key):
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = self._limiters[key] = AdaptiveConcurrencyLimiter(**self.limiter_settings)
+            return limiter
+
+    def stats(self):
+        """ Each limiter's current limit, requests in flight, and success and throttle counts, by key. """
+        with self._lock:
+            limiters = list(self._limiters.items())
+        return dict((key, limiter.stats()) for key, limiter in limiters)
@@ -4,6 +4,13 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
+import threading
+
+try:
+    import queue
+except ImportError:  # python 2
+    import Queue as queue
+
 from pytz import utc
 
 
@@ -15,3 +22,125 @@ def convert_datetime_to_utc(datetime_to_convert):
         return datetime_to_convert.astimezone(utc)
     else:
         return utc.localize(datetime_to_convert)
+
+
+def concurrent_map(function, arguments, max_workers=8):
+    """
+    Calls ``function(argument)`` for each of *arguments* on up to *max_workers* threads, and yields
+    ``(argument, result, exception)`` for each call as it finishes - not necessarily in order. If the
+    call raised, *exception* is what it raised and *result* is None; otherwise *exception* is None.
+
+    Stop iterating early and calls that haven't started yet won't be made.
+    """
+    arguments = list(arguments)
+
+    if max_workers <= 1 or len(arguments) <= 1:
+        for argument in arguments:
+            try:
+                result = function(argument)
+            except Exception as err:
+                yield argument, None, err
+            else:
+                yield argument, result, None
+        return
+
+    pending = queue.Queue()
+    finished = queue.Queue()
+    stopped = threading.Event()
+
+    for argument in arguments:
+        pending.put(argument)
+
+    def work():
+        while not stopped.is_set():
+            try:
+                argument = pending.get_nowait()
+            except queue.Empty:
+                return
+
+            try:
+                finished.put((argument, function(argument), None))
+            except Exception as err:
+                finished.put((argument, None, err))
+
+    for _ in range(min(max_workers, len(arguments))):
+        worker = threading.Thread(target=work)
+        worker.daemon = True
+        worker.start()
+
+    try:
+        for _ in range(len(arguments)):
+            yield finished.get()
+    finally:
+        stopped.set()
+
+
+class SingleFlight(object):
+    """
+    Collapses concurrent calls for the same key into one: while a call for a key is running, anyone
+    else asking for that key waits for it and gets its result (or its exception) instead of making a
+    call of their own. Nothing is remembered once the call finishes.
+
+    If *share* is given, each waiting caller gets ``share(result)`` rather than the result itself,
+    made on its own thread, so a copy that fails only fails the caller it was for. If anyone waited,
+    the caller that made the call gets a copy too, and the result itself is only ever copied.
+    """
+
+    def __init__(self, share=None):
+        self.share = share
+        self.calls = 0
+        self.shared = 0
+
+        self._running = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """ Returns ``function()``, or what a call for *key* that's already running returns. """
+        with self._lock:
+            flight = self._running.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = self._running[key] = _Flight()
+                self.calls += 1
+            else:
+                flight.waiting += 1
+                self.shared += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return self.share(flight.result) if self.share is not None else flight.result
+
+        try:
+            result = function()
+        except BaseException as err:
+            flight.error = err
+            raise
+        else:
+            flight.result = result
+        finally:
+            with self._lock:
+                self._running.pop(key, None)
+            flight.done.set()
+
+        # Nobody can join now. The waiters are copying the result, so we mustn't hand it out to change.
+        if flight.waiting and self.share is not None:
+            return self.share(result)
+        return result
+
+    def stats(self):
+        """ Calls made, and calls that were saved by waiting for one of those instead. """
+        with self._lock:
+            return {u'calls': self.calls, u'shared': self.shared}
+
+
+class _Flight(object):
+    __slots__ = ('done', 'waiting', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiting = 0
+        self.result = None
+        self.error = None
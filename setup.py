@@ -27,6 +27,7 @@ setup(
   include_package_data=True,
   packages=find_packages('.', exclude=['test*']),
   install_requires=['lxml', 'pytz', 'requests', 'requests-ntlm'],
+  extras_require={'msgpack': ['msgpack']},
   classifiers=[
     'Development Status :: 4 - Beta',
     'Intended Audience :: Developers',
@@ -1715,3 +1715,162 @@ LIST_EVENTS_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/
     </m:FindItemResponse>
   </s:Body>
 </s:Envelope>"""
+
+
+DIRECTORY_MAILBOX = u"""<t:Mailbox>
+  <t:Name>{name}</t:Name>
+  <t:EmailAddress>{email}</t:EmailAddress>
+  <t:RoutingType>SMTP</t:RoutingType>
+  <t:MailboxType>{mailbox_type}</t:MailboxType>
+</t:Mailbox>"""
+
+RESOLVE_NAMES_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:ResolveNamesResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:ResolveNamesResponseMessage ResponseClass="{response_class}">
+          <m:ResponseCode>{code}</m:ResponseCode>
+          <m:ResolutionSet TotalItemsInView="{count}" IncludesLastItemInRange="true">
+            {resolutions}
+          </m:ResolutionSet>
+        </m:ResolveNamesResponseMessage>
+      </m:ResponseMessages>
+    </m:ResolveNamesResponse>
+  </s:Body>
+</s:Envelope>"""
+
+RESOLVE_NAMES_NO_RESULTS = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:ResolveNamesResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:ResolveNamesResponseMessage ResponseClass="Error">
+          <m:MessageText>No results were found.</m:MessageText>
+          <m:ResponseCode>ErrorNameResolutionNoResults</m:ResponseCode>
+          <m:DescriptiveLinkKey>0</m:DescriptiveLinkKey>
+        </m:ResolveNamesResponseMessage>
+      </m:ResponseMessages>
+    </m:ResolveNamesResponse>
+  </s:Body>
+</s:Envelope>"""
+
+EXPAND_DL_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:ExpandDLResponse xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseMessages>
+        <m:ExpandDLResponseMessage ResponseClass="Success">
+          <m:ResponseCode>NoError</m:ResponseCode>
+          <m:DLExpansion TotalItemsInView="{count}" IncludesLastItemInRange="true">
+            {members}
+          </m:DLExpansion>
+        </m:ExpandDLResponseMessage>
+      </m:ResponseMessages>
+    </m:ExpandDLResponse>
+  </s:Body>
+</s:Envelope>"""
+
+EXPAND_DL_NO_RESULTS = RESOLVE_NAMES_NO_RESULTS.replace(u'ResolveNames', u'ExpandDL')
+
+
+def directory_mailboxes(*people):
+  return u''.join(DIRECTORY_MAILBOX.format(name=name, email=email, mailbox_type=mailbox_type) for name, email, mailbox_type in people)
+
+
+GET_ROOM_LISTS_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:GetRoomListsResponse ResponseClass="Success" xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseCode>NoError</m:ResponseCode>
+      <m:RoomLists>
+        <t:Address>
+          <t:Name>Building One</t:Name>
+          <t:EmailAddress>building-one@test.linkedin.com</t:EmailAddress>
+          <t:RoutingType>SMTP</t:RoutingType>
+          <t:MailboxType>PublicDL</t:MailboxType>
+        </t:Address>
+        <t:Address>
+          <t:Name>Building Two</t:Name>
+          <t:EmailAddress>building-two@test.linkedin.com</t:EmailAddress>
+          <t:RoutingType>SMTP</t:RoutingType>
+          <t:MailboxType>PublicDL</t:MailboxType>
+        </t:Address>
+      </m:RoomLists>
+    </m:GetRoomListsResponse>
+  </s:Body>
+</s:Envelope>"""
+
+GET_ROOMS_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <m:GetRoomsResponse ResponseClass="Success" xmlns:m="http://schemas.microsoft.com/exchange/services/2006/messages" xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+      <m:ResponseCode>NoError</m:ResponseCode>
+      <m:Rooms>
+        {rooms}
+      </m:Rooms>
+    </m:GetRoomsResponse>
+  </s:Body>
+</s:Envelope>"""
+
+ROOM = u"""<t:Room>
+  <t:Id>
+    <t:Name>{name}</t:Name>
+    <t:EmailAddress>{email}</t:EmailAddress>
+    <t:RoutingType>SMTP</t:RoutingType>
+    <t:MailboxType>Mailbox</t:MailboxType>
+  </t:Id>
+</t:Room>"""
+
+GET_USER_AVAILABILITY_RESPONSE = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xmlns:xsd="http://www.w3.org/2001/XMLSchema">
+    <GetUserAvailabilityResponse xmlns="http://schemas.microsoft.com/exchange/services/2006/messages">
+      <FreeBusyResponseArray>
+        {answers}
+      </FreeBusyResponseArray>
+    </GetUserAvailabilityResponse>
+  </s:Body>
+</s:Envelope>"""
+
+FREE_BUSY_RESPONSE = u"""<FreeBusyResponse>
+  <ResponseMessage ResponseClass="Success">
+    <ResponseCode>NoError</ResponseCode>
+  </ResponseMessage>
+  <FreeBusyView>
+    <FreeBusyViewType xmlns="http://schemas.microsoft.com/exchange/services/2006/types">FreeBusy</FreeBusyViewType>
+    <CalendarEventArray xmlns="http://schemas.microsoft.com/exchange/services/2006/types">
+      {events}
+    </CalendarEventArray>
+  </FreeBusyView>
+</FreeBusyResponse>"""
+
+FREE_BUSY_EVENT = u"""<CalendarEvent>
+  <StartTime>{start}</StartTime>
+  <EndTime>{end}</EndTime>
+  <BusyType>{busy_type}</BusyType>
+</CalendarEvent>"""
+
+FREE_BUSY_ERROR = u"""<FreeBusyResponse>
+  <ResponseMessage ResponseClass="Error">
+    <MessageText>Mailbox not found.</MessageText>
+    <ResponseCode>ErrorMailRecipientNotFound</ResponseCode>
+  </ResponseMessage>
+</FreeBusyResponse>"""
+
+
+IMPERSONATION_DENIED = SOAP_FAULT.replace(u'ErrorSchemaValidation', u'ErrorImpersonateUserDenied')
+
+
+SERVER_BUSY = u"""<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/">
+  <s:Body>
+    <s:Fault>
+      <faultcode xmlns:a="http://schemas.microsoft.com/exchange/services/2006/types">a:ErrorServerBusy</faultcode>
+      <faultstring xml:lang="en-US">The server cannot service this request right now. Try again later.</faultstring>
+      <detail>
+        <e:ResponseCode xmlns:e="http://schemas.microsoft.com/exchange/services/2006/errors">ErrorServerBusy</e:ResponseCode>
+        <e:Message xmlns:e="http://schemas.microsoft.com/exchange/services/2006/errors">The server cannot service this request right now. Try again later.</e:Message>
+        <t:MessageXml xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+          <t:Value Name="BackOffMilliseconds">297749</t:Value>
+        </t:MessageXml>
+      </detail>
+    </s:Fault>
+  </s:Body>
+</s:Envelope>"""
+
+
+TRANSIENT_ERROR = ITEM_DOES_NOT_EXIST.replace(u'ErrorItemNotFound', u'ErrorInternalServerTransientError')
@@ -0,0 +1,123 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import re
+import unittest
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.base.directory import ExchangeMailbox
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+PEOPLE = {
+  u'ada': [(u'Ada Lovelace', u'lovelace@test.linkedin.com', u'Mailbox')],
+  u'grace': [
+    (u'Grace Hopper', u'hopper@test.linkedin.com', u'Mailbox'),
+    (u'Grace Kelly', u'kelly@test.linkedin.com', u'Mailbox'),
+  ],
+}
+
+LISTS = {
+  u'all-hands@test.linkedin.com': [
+    (u'Engineering', u'engineering@test.linkedin.com', u'PublicDL'),
+    (u'Research', u'research@test.linkedin.com', u'PublicDL'),
+    (u'Ada Lovelace', u'lovelace@test.linkedin.com', u'Mailbox'),
+  ],
+  u'engineering@test.linkedin.com': [
+    (u'Grace Hopper', u'hopper@test.linkedin.com', u'Mailbox'),
+    (u'All Hands', u'all-hands@test.linkedin.com', u'PublicDL'),
+  ],
+  u'research@test.linkedin.com': [
+    (u'Marie Curie', u'curie@test.linkedin.com', u'Mailbox'),
+    (u'Grace Hopper', u'hopper@test.linkedin.com', u'Mailbox'),
+  ],
+}
+
+
+def answer_from_directory(body):
+  """ Answers ResolveNames and ExpandDL requests from PEOPLE and LISTS. """
+  query = re.search(u'<m:UnresolvedEntry>(.*)</m:UnresolvedEntry>', body)
+  if query is not None:
+    people = PEOPLE.get(query.group(1).lower())
+    if not people:
+      response = RESOLVE_NAMES_NO_RESULTS
+    else:
+      response = RESOLVE_NAMES_RESPONSE.format(
+        response_class=u'Success' if len(people) == 1 else u'Warning',
+        code=u'NoError' if len(people) == 1 else u'ErrorNameResolutionMultipleResults',
+        count=len(people),
+        resolutions=u''.join(u'<t:Resolution>%s</t:Resolution>' % directory_mailboxes(person) for person in people),
+      )
+  else:
+    address = re.search(u'<t:EmailAddress>(.*)</t:EmailAddress>', body).group(1)
+    members = LISTS.get(address)
+    if members is None:
+      response = EXPAND_DL_NO_RESULTS
+    else:
+      response = EXPAND_DL_RESPONSE.format(count=len(members), members=directory_mailboxes(*members))
+
+  return response
+
+
+class Test_DirectoryLookups(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = FakeConnection(answer_from_directory)
+    self.service = Exchange2010Service(connection=self.connection)
+
+  def test_resolving_names(self):
+    result = self.service.resolve_names([u'ada', u'grace', u'nobody'])
+
+    assert result[u'ada'] == [ExchangeMailbox(u'Ada Lovelace', u'lovelace@test.linkedin.com', u'SMTP', u'Mailbox')]
+    assert [mailbox.email for mailbox in result[u'grace']] == [u'hopper@test.linkedin.com', u'kelly@test.linkedin.com']
+    assert result[u'nobody'] == []
+
+  def test_repeated_queries_are_resolved_once(self):
+    result = self.service.resolve_names([u'ada', u' Ada', u'ADA'])
+    assert len(self.connection.requests) == 1
+    assert result[u'ADA'] == result[u'ada']
+
+    self.service.resolve_names(u'ada')
+    assert len(self.connection.requests) == 1
+
+  def test_names_that_do_not_resolve_are_cached_too(self):
+    self.service.resolve_names([u'nobody'])
+    self.service.resolve_names([u'nobody'])
+
+    assert len(self.connection.requests) == 1
+
+  def test_expanding_a_list_returns_direct_members(self):
+    members = self.service.expand_dl(u'engineering@test.linkedin.com', recursive=False)
+
+    assert [mailbox.email for mailbox in members] == [u'hopper@test.linkedin.com', u'all-hands@test.linkedin.com']
+    assert members[1].mailbox_type == u'PublicDL'
+
+  def test_nested_lists_are_expanded_once_each(self):
+    members = self.service.expand_dl(u'all-hands@test.linkedin.com')
+
+    assert [mailbox.email for mailbox in members] == [
+      u'lovelace@test.linkedin.com', u'hopper@test.linkedin.com', u'curie@test.linkedin.com',
+    ]
+    assert len(self.connection.requests) == 3
+
+  def test_overlapping_lists_share_the_cache(self):
+    self.service.expand_dl(u'all-hands@test.linkedin.com')
+    members = self.service.expand_dl(u'research@test.linkedin.com')
+
+    assert [mailbox.email for mailbox in members] == [u'curie@test.linkedin.com', u'hopper@test.linkedin.com']
+    assert len(self.connection.requests) == 3
+
+  def test_expanding_something_that_is_not_a_list(self):
+    assert self.service.expand_dl(u'lovelace@test.linkedin.com') == []
+
+  def test_other_errors_are_raised(self):
+    self.connection.respond = lambda body: EXPAND_DL_NO_RESULTS.replace(u'ErrorNameResolutionNoResults', u'ErrorAccessDenied')
+
+    with raises(FailedExchangeException):
+      self.service.expand_dl(u'all-hands@test.linkedin.com')
+
+    assert self.service.directory_cache.get((u'expand', u'all-hands@test.linkedin.com')) is None
@@ -0,0 +1,181 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import json
+import pytest
+from httpretty import HTTPretty, activate
+import unittest
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.base.codec import event_from_json, event_from_msgpack, events_to_json, events_from_json, events_to_msgpack, events_from_msgpack, event_to_msgpack
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+def _get_event(response):
+
+  @activate
+  def fake_event_request():
+    service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL, username=FAKE_EXCHANGE_USERNAME, password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+    HTTPretty.register_uri(
+      HTTPretty.POST, FAKE_EXCHANGE_URL,
+      body=response.encode('utf-8'),
+      content_type='text/xml; charset=utf-8',
+    )
+
+    return service.calendar().get_event(id=TEST_EVENT.id)
+
+  return fake_event_request()
+
+
+def _assert_same_event(record, event):
+  for field in (u'id', u'change_key', u'subject', u'start', u'end', u'location', u'html_body', u'text_body', u'type',
+                u'reminder_minutes_before_start', u'is_all_day', u'recurrence', u'recurrence_end_date',
+                u'recurrence_interval', u'recurrence_days', u'organizer', u'conflicting_event_ids'):
+    assert getattr(record, field) == getattr(event, field), field
+
+  assert sorted(record.attendees) == sorted(event.attendees)
+  assert sorted(record.resources) == sorted(event.resources)
+
+
+class Test_EventCodecRoundTrip(unittest.TestCase):
+  event = None
+
+  @classmethod
+  def setUpClass(cls):
+    cls.event = _get_event(GET_ITEM_RESPONSE)
+
+  def test_json_round_trip(self):
+    _assert_same_event(event_from_json(self.event.as_json()), self.event)
+
+  def test_msgpack_round_trip(self):
+    _assert_same_event(event_from_msgpack(self.event.as_msgpack()), self.event)
+
+  def test_msgpack_is_smaller_than_json(self):
+    assert len(self.event.as_msgpack()) < len(self.event.as_json().encode('utf-8'))
+
+  def test_json_is_versioned(self):
+    assert json.loads(self.event.as_json())[u'v'] == 1
+
+  def test_records_encode_like_events(self):
+    record = event_from_msgpack(self.event.as_msgpack())
+    assert event_to_msgpack(record) == self.event.as_msgpack()
+
+  def test_streaming_a_list(self):
+    events = [self.event, self.event]
+
+    for record in events_from_json(u''.join(events_to_json(events))):
+      _assert_same_event(record, self.event)
+
+    records = events_from_msgpack(b''.join(events_to_msgpack(events)))
+    assert len(records) == 2
+    _assert_same_event(records[1], self.event)
+
+  def test_unknown_schema_version_is_rejected(self):
+    document = json.loads(self.event.as_json())
+    document[u'v'] = 99
+
+    with raises(InvalidEventData):
+      event_from_json(json.dumps(document))
+
+  def test_truncated_data_is_rejected(self):
+    with raises(InvalidEventData):
+      event_from_msgpack(self.event.as_msgpack()[:-3])
+
+  def test_other_msgpack_libraries_can_read_it(self):
+    msgpack = pytest.importorskip('msgpack')
+    document = msgpack.unpackb(self.event.as_msgpack(), raw=False)
+
+    assert document[0] == 1
+    assert document[3] == self.event.subject
+
+
+class Test_RecurringEventCodecRoundTrip(unittest.TestCase):
+
+  def test_recurrence_survives_a_round_trip(self):
+    for response in (GET_RECURRING_MASTER_DAILY_EVENT, GET_RECURRING_MASTER_WEEKLY_EVENT,
+                     GET_RECURRING_MASTER_MONTHLY_EVENT, GET_RECURRING_MASTER_YEARLY_EVENT):
+      event = _get_event(response)
+
+      _assert_same_event(event_from_json(event.as_json()), event)
+      _assert_same_event(event_from_msgpack(event.as_msgpack()), event)
+
+
+@pytest.fixture(params=[u'msgpack', u'pure python'])
+def packer(request, monkeypatch):
+  """ Runs a test with the msgpack package, if it's installed, and with the built in MessagePack code. """
+  from pyexchange.base import codec
+
+  if request.param == u'msgpack':
+    pytest.importorskip('msgpack')
+  else:
+    monkeypatch.setattr(codec, 'msgpack', None)
+  return request.param
+
+
+def test_both_packers_write_the_same_bytes(monkeypatch):
+  pytest.importorskip('msgpack')
+  from pyexchange.base import codec
+  event = _get_event(GET_ITEM_RESPONSE)
+
+  packed = event.as_msgpack()
+  monkeypatch.setattr(codec, 'msgpack', None)
+
+  assert event.as_msgpack() == packed
+
+
+@pytest.mark.parametrize('data', [
+  b'',
+  b'\xc1',
+  b'\x92\x01',
+  b'\x91\xa5abc',
+  b'\x91\xa2\xff\xfe',
+  b'\x90',
+  b'\x95\x01\x02\x03\x04\x05',
+  b'\x91' * 100000 + b'\x01',
+])
+def test_corrupt_msgpack_is_rejected(packer, data):
+  with raises(InvalidEventData):
+    event_from_msgpack(data)
+
+  with raises(InvalidEventData):
+    events_from_msgpack(data + b'\x01')
+
+
+def test_msgpack_with_the_wrong_field_types_is_rejected(packer):
+  from pyexchange.base import codec
+  document = [1] + [None] * 20
+  document[4] = u'not a time'
+
+  out = []
+  codec._pack(document, out)
+
+  with raises(InvalidEventData):
+    event_from_msgpack(b''.join(out))
+
+
+@pytest.mark.parametrize('data', [
+  u'',
+  u'{"v": 1',
+  u'[1, 2',
+  u'{"v": 1, "start": 12}',
+  u'{"v": 1, "organizer": [1]}',
+  u'{"v": 1, "attendees": [[1, 2]]}',
+  u'[' * 100000,
+])
+def test_corrupt_json_is_rejected(data):
+  with raises(InvalidEventData):
+    event_from_json(data)
+
+  with raises(InvalidEventData):
+    events_from_json(u'[%s]' % (data or u'1'))
@@ -0,0 +1,88 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import threading
+import time
+import unittest
+from pyexchange import Exchange2010Service
+from pyexchange.exchange2010 import soap_request
+from pyexchange.hedging import ExchangeHedgingPolicy
+from pyexchange.throttling import ExchangeThrottling
+
+from .fixtures import *  # noqa
+
+
+class Test_HedgingSlowReads(unittest.TestCase):
+
+  def setUp(self):
+    self.release = threading.Event()
+    self.calls = 0
+    self.connection = FakeConnection(self.respond)
+    self.hedging = ExchangeHedgingPolicy(delay=0.01)
+    self.service = Exchange2010Service(connection=self.connection, hedging=self.hedging)
+
+  def tearDown(self):
+    self.release.set()
+
+  def respond(self, body):
+    with self.connection.lock:
+      self.calls += 1
+      first = self.calls == 1
+
+    if first:
+      self.release.wait(5)  # the first copy of any request hangs
+    return GET_ITEM_RESPONSE if u'GetItem' in body else CREATE_ITEM_RESPONSE
+
+  def test_a_slow_read_gets_a_second_copy(self):
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert event.subject == TEST_EVENT.subject
+    assert len(self.connection.requests) == 2
+    assert self.hedging.stats()[u'hedges_won'] == 1
+
+  def test_both_copies_of_an_element_request_are_the_same(self):
+    self.release.set()
+    wrap = self.service._wrap_soap_xml_request
+
+    def slow_wrap(xml):
+      """ Holds each envelope until the other copy has been wrapped too. """
+      envelope = wrap(xml)
+      time.sleep(0.05)
+      return envelope
+
+    self.service._wrap_soap_xml_request = slow_wrap
+    self.service.send(soap_request.get_folder(u'calendar'))
+
+    for _ in range(100):
+      if len(self.connection.requests) == 2:
+        break
+      time.sleep(0.01)
+
+    first, second = self.connection.requests
+    assert u'<m:GetFolder' in first
+    assert first == second
+
+  def test_no_hedge_is_sent_without_a_free_slot(self):
+    service = Exchange2010Service(connection=self.connection, hedging=self.hedging, throttling=ExchangeThrottling(initial=1))
+    threading.Timer(0.05, self.release.set).start()
+
+    event = service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert event.subject == TEST_EVENT.subject
+    assert len(self.connection.requests) == 1
+    assert self.hedging.stats()[u'not_sent'] == 1
+
+  def test_writes_are_never_hedged(self):
+    threading.Timer(0.05, self.release.set).start()
+
+    event = self.service.calendar().new_event(
+      subject=TEST_EVENT.subject, start=TEST_EVENT.start, end=TEST_EVENT.end,
+      attendees=[PERSON_REQUIRED_ACCEPTED.email],
+    )
+    event.create()
+
+    assert len(self.connection.requests) == 1
+    assert self.hedging.stats()[u'requests'] == 0
@@ -0,0 +1,106 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from httpretty import HTTPretty, httprettified
+from lxml import etree
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exchange2010.soap_request import NAMESPACES
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+
+def impersonated_address(request):
+  header = etree.fromstring(request.body).find(u's:Header', namespaces=NAMESPACES)
+  return header.findtext(u't:ExchangeImpersonation/t:ConnectingSID/t:PrimarySmtpAddress', namespaces=NAMESPACES)
+
+
+class Test_Impersonation(unittest.TestCase):
+
+  def setUp(self):
+    self.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL, username=FAKE_EXCHANGE_USERNAME, password=FAKE_EXCHANGE_PASSWORD
+      )
+    )
+
+  def _respond_with(self, body):
+    HTTPretty.register_uri(HTTPretty.POST, FAKE_EXCHANGE_URL, body=body.encode('utf-8'), content_type='text/xml; charset=utf-8')
+
+  def test_impersonating_makes_a_copy_that_shares_the_connection(self):
+    impersonating = self.service.impersonate(u'somebody@test.linkedin.com')
+
+    assert impersonating is not self.service
+    assert impersonating.connection is self.service.connection
+    assert impersonating.directory_cache is self.service.directory_cache
+    assert self.service.impersonation is None
+
+  @httprettified
+  def test_requests_carry_the_impersonation_header(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    self.service.impersonate(u'somebody@test.linkedin.com').calendar().get_event(id=TEST_EVENT.id)
+
+    assert impersonated_address(HTTPretty.last_request) == u'somebody@test.linkedin.com'
+
+  @httprettified
+  def test_requests_without_impersonation_do_not(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert impersonated_address(HTTPretty.last_request) is None
+
+  @httprettified
+  def test_events_keep_using_the_impersonating_service(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+    event = self.service.impersonate(u'somebody@test.linkedin.com').calendar().get_event(id=TEST_EVENT.id)
+
+    HTTPretty.register_uri(
+      HTTPretty.POST, FAKE_EXCHANGE_URL,
+      responses=[HTTPretty.Response(body=body.encode('utf-8'), content_type='text/xml; charset=utf-8') for body in (GET_ITEM_RESPONSE_ID_ONLY, DELETE_ITEM_RESPONSE)],
+    )
+    event.cancel()
+
+    assert impersonated_address(HTTPretty.last_request) == u'somebody@test.linkedin.com'
+
+  @httprettified
+  def test_being_denied_raises_a_specific_exception(self):
+    self._respond_with(IMPERSONATION_DENIED)
+
+    with raises(ExchangeImpersonationDeniedException):
+      self.service.impersonate(u'somebody@test.linkedin.com').calendar().get_event(id=TEST_EVENT.id)
+
+  @httprettified
+  def test_listing_many_mailboxes_by_impersonation(self):
+    self._respond_with(LIST_EVENTS_RESPONSE)
+
+    summary = self.service.list_events_for(
+      [u'somebody@test.linkedin.com'], TEST_EVENT_LIST_START, TEST_EVENT_LIST_END, impersonate=True
+    ).summary()
+    assert summary.succeeded == 1
+    assert impersonated_address(HTTPretty.last_request) == u'somebody@test.linkedin.com'
+    assert u'<t:Mailbox>' not in HTTPretty.last_request.body.decode('utf-8')
+
+  @httprettified
+  def test_impersonated_requests_are_anchored_to_the_mailbox(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    self.service.impersonate(u'somebody@test.linkedin.com').calendar().get_event(id=TEST_EVENT.id)
+
+    assert HTTPretty.last_request.headers['X-AnchorMailbox'] == u'somebody@test.linkedin.com'
+    assert HTTPretty.last_request.headers['X-PreferServerAffinity'] == u'true'
+
+  @httprettified
+  def test_plain_requests_are_not_anchored(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert 'X-AnchorMailbox' not in HTTPretty.last_request.headers
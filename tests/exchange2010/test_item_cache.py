@@ -0,0 +1,112 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from httpretty import HTTPretty, httprettified
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.cache import ExchangeItemCache
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+MOVED_CHANGE_KEY = GET_ITEM_RESPONSE_ID_ONLY.replace(TEST_EVENT.change_key, u'SOMETHINGNEW')
+
+
+class FakeClock(object):
+  def __init__(self):
+    self.now = 1000.0
+
+  def __call__(self):
+    return self.now
+
+
+class Test_CachedGetEvent(unittest.TestCase):
+
+  def setUp(self):
+    self.clock = FakeClock()
+    self.cache = ExchangeItemCache(ttl=60, clock=self.clock)
+    self.service = Exchange2010Service(
+      connection=ExchangeNTLMAuthConnection(
+        url=FAKE_EXCHANGE_URL, username=FAKE_EXCHANGE_USERNAME, password=FAKE_EXCHANGE_PASSWORD
+      ),
+      cache=self.cache,
+    )
+
+  def _respond_with(self, *bodies):
+    HTTPretty.register_uri(
+      HTTPretty.POST, FAKE_EXCHANGE_URL,
+      responses=[HTTPretty.Response(body=body.encode('utf-8'), content_type='text/xml; charset=utf-8') for body in bodies],
+    )
+
+  @httprettified
+  def test_second_read_comes_from_the_cache(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    first = self.service.calendar().get_event(id=TEST_EVENT.id)
+    HTTPretty.reset()
+    second = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert second.subject == first.subject == TEST_EVENT.subject
+    assert second.change_key == TEST_EVENT.change_key
+    assert sorted(second.attendees) == sorted(first.attendees)
+    assert self.cache.stats()[u'hits'] == 1
+    assert self.cache.stats()[u'misses'] == 1
+
+  @httprettified
+  def test_changing_a_cached_event_does_not_change_the_cache(self):
+    self._respond_with(GET_ITEM_RESPONSE)
+
+    first = self.service.calendar().get_event(id=TEST_EVENT.id)
+    first.add_attendees(u'somebody.new@test.linkedin.com')
+    second = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert len(second.attendees) == len(first.attendees) - 1
+
+  @httprettified
+  def test_stale_entries_with_the_same_change_key_are_not_refetched(self):
+    self._respond_with(GET_ITEM_RESPONSE, GET_ITEM_RESPONSE_ID_ONLY)
+
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+    self.clock.now += 61
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert u'IdOnly' in HTTPretty.last_request.body.decode('utf-8')
+    assert event.subject == TEST_EVENT.subject
+    assert self.cache.stats()[u'revalidations'] == 1
+    assert self.cache.stats()[u'refetches'] == 0
+    assert self.cache.is_fresh(self.cache.get(TEST_EVENT.id))
+
+  @httprettified
+  def test_stale_entries_with_a_new_change_key_are_refetched(self):
+    self._respond_with(GET_ITEM_RESPONSE, MOVED_CHANGE_KEY, GET_ITEM_RESPONSE)
+
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+    self.clock.now += 61
+
+    assert self.service.revalidate_cache() == [TEST_EVENT.id]
+    assert u'AllProperties' in HTTPretty.last_request.body.decode('utf-8')
+    assert self.cache.stats()[u'refetches'] == 1
+
+  @httprettified
+  def test_deleted_items_are_dropped(self):
+    self._respond_with(GET_ITEM_RESPONSE, ITEM_DOES_NOT_EXIST)
+
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+    self.clock.now += 61
+
+    with raises(ExchangeItemNotFoundException):
+      self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert self.cache.get(TEST_EVENT.id) is None
+
+  @httprettified
+  def test_missing_items_still_raise(self):
+    self._respond_with(ITEM_DOES_NOT_EXIST)
+
+    with raises(ExchangeItemNotFoundException):
+      self.service.calendar().get_event(id=TEST_EVENT.id)
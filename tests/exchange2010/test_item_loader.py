@@ -0,0 +1,119 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import re
+import threading
+import unittest
+from lxml import etree
+from pytest import importorskip, raises
+from pyexchange import Exchange2010Service
+from pyexchange.exceptions import *  # noqa
+from pyexchange.exchange2010.soap_request import NAMESPACES
+
+from .fixtures import *  # noqa
+
+MISSING_ID = u'NOTHERE'
+
+_FOUND = re.search(u'<m:GetItemResponseMessage.*</m:GetItemResponseMessage>', GET_ITEM_RESPONSE, re.S).group(0)
+_NOT_FOUND = re.search(u'<m:GetItemResponseMessage.*</m:GetItemResponseMessage>', ITEM_DOES_NOT_EXIST, re.S).group(0)
+
+
+def requested_ids(body):
+  return [item_id.get(u'Id') for item_id in etree.fromstring(body.encode('utf-8')).xpath(u'//t:ItemId', namespaces=NAMESPACES)]
+
+
+def get_items_response(body):
+  """ A GetItem response with a copy of TEST_EVENT for each id asked for, under that id - except MISSING_ID. """
+  messages = [_NOT_FOUND if id == MISSING_ID else _FOUND.replace(TEST_EVENT.id, id) for id in requested_ids(body)]
+  return GET_ITEM_RESPONSE.replace(_FOUND, u''.join(messages))
+
+
+class Test_LoadingManyItems(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = FakeConnection(get_items_response)
+    self.service = Exchange2010Service(connection=self.connection)
+
+  def test_get_events_makes_one_request(self):
+    events = self.service.calendar().get_events([u'one', u'two', u'one'])
+
+    assert [event.id for event in events] == [u'one', u'two', u'one']
+    assert events[1].subject == TEST_EVENT.subject
+    assert len(self.connection.requests) == 1
+    assert requested_ids(self.connection.requests[0]) == [u'one', u'two']
+
+  def test_missing_items_raise(self):
+    with raises(ExchangeItemNotFoundException):
+      self.service.calendar().get_events([u'one', MISSING_ID])
+
+
+class Test_BatchingConcurrentLookups(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = FakeConnection(get_items_response)
+    self.service = Exchange2010Service(connection=self.connection, batch_window=0.2)
+
+  def get_events(self, ids):
+    results = {}
+
+    def get(id):
+      try:
+        results[id] = self.service.calendar().get_event(id=id)
+      except BaseException as err:
+        results[id] = err
+
+    threads = [threading.Thread(target=get, args=(id,)) for id in ids]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+    return results
+
+  def test_lookups_from_several_threads_share_a_request(self):
+    results = self.get_events([u'one', u'two', u'three'])
+
+    assert sorted(event.id for event in results.values()) == [u'one', u'three', u'two']
+    assert len(self.connection.requests) == 1
+    assert self.service.item_loader.stats() == {u'loads': 3, u'requests': 1}
+
+  def test_each_lookup_gets_its_own_error(self):
+    results = self.get_events([u'one', MISSING_ID])
+
+    assert results[u'one'].subject == TEST_EVENT.subject
+    assert isinstance(results[MISSING_ID], ExchangeItemNotFoundException)
+
+  def test_full_batches_go_out_straight_away(self):
+    self.service.item_loader.max_batch = 2
+    self.service.item_loader.window = 5
+
+    results = self.get_events([u'one', u'two'])
+
+    assert len(results) == 2
+    assert len(self.connection.requests) == 1
+
+  def test_everyone_gets_the_error_when_the_request_is_interrupted(self):
+    def interrupted(body):
+      raise KeyboardInterrupt()
+    self.connection.respond = interrupted
+
+    results = self.get_events([u'one', u'two'])
+
+    assert [type(result) for result in results.values()] == [KeyboardInterrupt, KeyboardInterrupt]
+
+  def test_lookups_from_asyncio_share_a_request(self):
+    asyncio = importorskip('asyncio')
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    calendar = self.service.calendar()
+
+    try:
+      events = loop.run_until_complete(asyncio.gather(*[calendar.get_event_async(id) for id in (u'one', u'two', u'three')]))
+    finally:
+      asyncio.set_event_loop(None)
+      loop.close()
+
+    assert [event.id for event in events] == [u'one', u'two', u'three']
+    assert len(self.connection.requests) == 1
@@ -1,8 +1,12 @@
 
+import pickle
 import unittest
+from lxml import etree
 from pytest import raises
 from httpretty import HTTPretty, httprettified
 from pyexchange import Exchange2010Service
+from pyexchange.exchange2010 import Exchange2010CalendarEvent, soap_request
+from pyexchange.base.calendar import ExchangeEventRecord
 from pyexchange.connection import ExchangeNTLMAuthConnection
 from pyexchange.exceptions import *
 
@@ -51,6 +55,146 @@ class Test_ParseEventListResponseData(unittest.TestCase):
     def test_second_event_subject(self):
         assert self.event_list.events[1].subject == 'Event Subject 2'
 
+    def test_index_finds_overlapping_events(self):
+        index = self.event_list.index()
+        first = self.event_list.events[0]
+
+        assert len(index) == 3
+        assert [event.id for event in index.conflicts_for(first)] == ['id2']
+
+
+class Test_ListEventsAsRecords(unittest.TestCase):
+    service = None
+    event_list = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = Exchange2010Service(
+            connection=ExchangeNTLMAuthConnection(
+                url=FAKE_EXCHANGE_URL,
+                username=FAKE_EXCHANGE_USERNAME,
+                password=FAKE_EXCHANGE_PASSWORD
+            )
+        )
+
+    @httprettified
+    def setUp(self):
+        HTTPretty.register_uri(
+            HTTPretty.POST, FAKE_EXCHANGE_URL,
+            body=LIST_EVENTS_RESPONSE.encode('utf-8'),
+            content_type='text/xml; charset=utf-8'
+        )
+        self.event_list = self.service.calendar().list_events(
+            start=TEST_EVENT_LIST_START,
+            end=TEST_EVENT_LIST_END,
+            as_records=True
+        )
+
+    def test_events_are_records(self):
+        assert self.event_list.count == 3
+        assert all(isinstance(event, ExchangeEventRecord) for event in self.event_list.events)
+
+    def test_record_properties(self):
+        assert [event.subject for event in self.event_list.events] == ['Event Subject 1', 'Event Subject 2', 'Subject 3']
+        assert self.event_list.event_ids == ['id1', 'id2', 'id3']
+
+    def test_records_can_be_indexed(self):
+        index = self.event_list.index()
+
+        assert [event.id for event in index.conflicts_for(self.event_list.events[0])] == ['id2']
+
+    def test_records_to_columns(self):
+        columns = self.event_list.to_columns()
+
+        assert columns['id'] == ['id1', 'id2', 'id3']
+        assert all(duration >= 0 for duration in columns['duration'])
+
+
+class Test_ListEventsLazily(unittest.TestCase):
+    service = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.service = Exchange2010Service(
+            connection=ExchangeNTLMAuthConnection(
+                url=FAKE_EXCHANGE_URL,
+                username=FAKE_EXCHANGE_USERNAME,
+                password=FAKE_EXCHANGE_PASSWORD
+            )
+        )
+
+    @httprettified
+    def _list_events(self, lazy):
+        HTTPretty.register_uri(
+            HTTPretty.POST, FAKE_EXCHANGE_URL,
+            body=LIST_EVENTS_RESPONSE.encode('utf-8'),
+            content_type='text/xml; charset=utf-8'
+        )
+        return self.service.calendar().list_events(
+            start=TEST_EVENT_LIST_START,
+            end=TEST_EVENT_LIST_END,
+            lazy=lazy
+        )
+
+    def test_lazy_events_match_eager_events(self):
+        eager = self._list_events(lazy=False).events
+        lazy = self._list_events(lazy=True).events
+
+        for expected, event in zip(eager, lazy):
+            assert event.id == expected.id
+            assert event.subject == expected.subject
+            assert event.start == expected.start
+            assert event.end == expected.end
+            assert event.location == expected.location
+            assert event.type == expected.type
+            assert event.organizer == expected.organizer
+            assert event.attendees == expected.attendees
+            assert event.is_all_day == expected.is_all_day
+
+    def test_fields_are_parsed_on_first_access(self):
+        event = self._list_events(lazy=True).events[0]
+
+        with raises(AttributeError):
+            type(event).subject.storage.__get__(event, type(event))
+
+        assert event.subject == 'Event Subject 1'
+        assert type(event).subject.storage.__get__(event, type(event)) == 'Event Subject 1'
+        assert event._dirty_attributes == set()
+
+    def test_assigned_fields_are_not_overwritten_by_the_xml(self):
+        event = self._list_events(lazy=True).events[0]
+        event.subject = u'changed'
+
+        assert event.subject == u'changed'
+        assert event._dirty_attributes == set([u'subject'])
+
+    def test_materialize_releases_the_xml(self):
+        event = self._list_events(lazy=True).events[0]
+        event.materialize()
+
+        assert event._source is None
+        assert event.subject == 'Event Subject 1'
+        assert event.start is not None
+
+    def test_fields_missing_from_the_xml_get_their_defaults(self):
+        item = etree.fromstring(
+            u'<t:CalendarItem xmlns:t="%s"><t:ItemId Id="AAA" ChangeKey="BBB"/></t:CalendarItem>' % soap_request.TYPE_NS
+        )
+        event = Exchange2010CalendarEvent(service=self.service, xml=item, lazy=True)
+
+        assert event.subject == u''
+        assert event.location is None
+        assert event.attendees == []
+
+    def test_pickling_materializes_and_releases_the_xml(self):
+        event = self._list_events(lazy=True).events[0]
+
+        copy = pickle.loads(pickle.dumps(event))
+
+        assert event._source is None
+        assert copy.subject == 'Event Subject 1'
+        assert copy.start == event.start
+
 
 class Test_FailingToListEvents(unittest.TestCase):
     service = None
@@ -81,3 +225,49 @@ class Test_FailingToListEvents(unittest.TestCase):
         #        start=TEST_EVENT_LIST_START,
         #        end=TEST_EVENT_LIST_END
         #    )
+
+
+class Test_ListEventsForManyMailboxes(unittest.TestCase):
+
+    def setUp(self):
+        self.connection = FakeConnection(self._respond)
+        self.service = Exchange2010Service(connection=self.connection)
+
+    def _respond(self, body):
+        if u'broken@' in body:
+            return ITEM_DOES_NOT_EXIST
+        return LIST_EVENTS_RESPONSE
+
+    def test_each_mailbox_gets_its_events(self):
+        mailboxes = [u'person-%d@test.linkedin.com' % number for number in range(20)]
+
+        results = list(self.service.list_events_for(mailboxes, TEST_EVENT_LIST_START, TEST_EVENT_LIST_END, max_workers=4))
+
+        assert sorted(result.mailbox for result in results) == sorted(mailboxes)
+        assert all(len(result.events) == 3 and result.error is None for result in results)
+        assert isinstance(results[0].events[0], ExchangeEventRecord)
+
+    def test_one_failing_mailbox_does_not_stop_the_rest(self):
+        mailboxes = [u'one@test.linkedin.com', u'broken@test.linkedin.com', u'two@test.linkedin.com']
+
+        fan_out = self.service.list_events_for(mailboxes, TEST_EVENT_LIST_START, TEST_EVENT_LIST_END)
+        summary = fan_out.summary()
+
+        assert summary.mailboxes == 3
+        assert summary.succeeded == 2
+        assert list(summary.failures) == [u'broken@test.linkedin.com']
+        assert isinstance(summary.failures[u'broken@test.linkedin.com'], ExchangeItemNotFoundException)
+        assert sorted(summary.timings) == sorted(mailboxes)
+        assert len(list(fan_out)) == 3
+
+    def test_asking_for_some_fields(self):
+
+        self.service.list_events_for([u'one@test.linkedin.com'], TEST_EVENT_LIST_START, TEST_EVENT_LIST_END, fields=[u'start', u'end']).summary()
+
+        assert u'<t:BaseShape>IdOnly</t:BaseShape>' in self.connection.requests[0]
+        assert u'<t:FieldURI FieldURI="calendar:Start"/>' in self.connection.requests[0]
+        assert u'<t:Mailbox><t:EmailAddress>one@test.linkedin.com</t:EmailAddress></t:Mailbox>' in self.connection.requests[0]
+
+    def test_asking_for_fields_that_cannot_be_listed(self):
+        with raises(ValueError):
+            self.service.list_events_for([u'one@test.linkedin.com'], TEST_EVENT_LIST_START, TEST_EVENT_LIST_END, fields=[u'attendees'])
@@ -0,0 +1,62 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+from datetime import datetime
+from lxml import etree
+from pytz import utc
+
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exchange2010 import Exchange2010CalendarEvent
+
+from .fixtures import *  # noqa
+
+ATTENDEE = u"""<t:Attendee>
+  <t:Mailbox><t:Name>Person {0}</t:Name><t:EmailAddress>person{0}@test.linkedin.com</t:EmailAddress></t:Mailbox>
+  <t:ResponseType>Accept</t:ResponseType>
+  <t:LastResponseTime>2050-05-20T20:42:{1:02d}Z</t:LastResponseTime>
+</t:Attendee>"""
+
+CALENDAR_ITEM = u"""<t:CalendarItem xmlns:t="http://schemas.microsoft.com/exchange/services/2006/types">
+  <t:RequiredAttendees>{required}</t:RequiredAttendees>
+  <t:OptionalAttendees>
+    <t:Attendee><t:Mailbox><t:Name>No Email</t:Name></t:Mailbox></t:Attendee>
+    <t:Attendee><t:Mailbox><t:EmailAddress>optional@test.linkedin.com</t:EmailAddress></t:Mailbox></t:Attendee>
+  </t:OptionalAttendees>
+</t:CalendarItem>"""
+
+
+def _event(attendee_count):
+  service = Exchange2010Service(
+    connection=ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL, username=FAKE_EXCHANGE_USERNAME, password=FAKE_EXCHANGE_PASSWORD)
+  )
+  required = u''.join(ATTENDEE.format(i, i % 60) for i in range(attendee_count))
+  item = etree.XML(CALENDAR_ITEM.format(required=required).encode('utf-8'))
+
+  return Exchange2010CalendarEvent(service=service, xml=item)
+
+
+def test_large_attendee_lists_are_parsed_completely():
+  event = _event(2000)
+
+  assert len(event.required_attendees) == 2000
+  assert [attendee.email for attendee in event.optional_attendees] == [u'optional@test.linkedin.com']
+
+
+def test_attendee_fields():
+  event = _event(3)
+  attendee = [attendee for attendee in event.attendees if attendee.email == u'person2@test.linkedin.com'][0]
+
+  assert attendee.name == u'Person 2'
+  assert attendee.response == u'Accept'
+  assert attendee.last_response == datetime(year=2050, month=5, day=20, hour=20, minute=42, second=2, tzinfo=utc)
+  assert attendee.required is True
+
+  optional = event.optional_attendees[0]
+  assert optional.name is None
+  assert optional.response is None
+  assert optional.last_response is None
+  assert optional.required is False
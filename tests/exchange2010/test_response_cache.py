@@ -0,0 +1,76 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from pyexchange import Exchange2010Service
+from pyexchange.cache import ExchangeResponseCache
+
+from .fixtures import *  # noqa
+
+
+class Test_CachingFolderResponses(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = FakeConnection(self.respond)
+    self.cache = ExchangeResponseCache()
+    self.service = Exchange2010Service(connection=self.connection, response_cache=self.cache)
+
+  def respond(self, body):
+    if u'MoveFolder' in body:
+      return MOVE_FOLDER_RESPONSE
+    if u'GetItem' in body:
+      return GET_ITEM_RESPONSE
+    return GET_FOLDER_RESPONSE
+
+  def test_folders_are_fetched_once(self):
+    first = self.service.folder().get_folder(id=TEST_FOLDER.id)
+    second = self.service.folder().get_folder(id=TEST_FOLDER.id)
+
+    assert first.display_name == second.display_name
+    assert len(self.connection.requests) == 1
+    assert self.cache.stats()[u'hits'] == 1
+
+  def test_other_reads_are_not_cached(self):
+    for _ in range(2):
+      self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert len(self.connection.requests) == 2
+
+  def test_moving_a_folder_drops_cached_folders(self):
+    folder = self.service.folder().get_folder(id=TEST_FOLDER.id)
+    folder.move_to(u'AABBCCDDEEFFGG==')
+    self.service.folder().get_folder(id=TEST_FOLDER.id)
+
+    assert len(self.connection.requests) == 3
+
+  def test_impersonated_requests_are_cached_separately(self):
+    self.service.folder().get_folder(id=TEST_FOLDER.id)
+    self.service.impersonate(u'somebody@test.linkedin.com').folder().get_folder(id=TEST_FOLDER.id)
+
+    assert len(self.connection.requests) == 2
+
+  def test_services_logged_in_as_someone_else_are_cached_separately(self):
+    other_connection = FakeConnection(self.respond)
+    self.connection.username, self.connection.url = FAKE_EXCHANGE_USERNAME, FAKE_EXCHANGE_URL
+    other_connection.username, other_connection.url = u'somebody.else', FAKE_EXCHANGE_URL
+    other_service = Exchange2010Service(connection=other_connection, response_cache=self.cache)
+
+    self.service.folder().get_folder(id=TEST_FOLDER.id)
+    other_service.folder().get_folder(id=TEST_FOLDER.id)
+
+    assert len(self.connection.requests) == 1
+    assert len(other_connection.requests) == 1
+
+  def test_services_on_other_servers_are_cached_separately(self):
+    other_connection = FakeConnection(self.respond)
+    self.connection.username, self.connection.url = FAKE_EXCHANGE_USERNAME, FAKE_EXCHANGE_URL
+    other_connection.username, other_connection.url = FAKE_EXCHANGE_USERNAME, u'http://10.0.0.1/EWS/Exchange.asmx'
+    other_service = Exchange2010Service(connection=other_connection, response_cache=self.cache)
+
+    self.service.folder().get_folder(id=TEST_FOLDER.id)
+    other_service.folder().get_folder(id=TEST_FOLDER.id)
+
+    assert len(other_connection.requests) == 1
@@ -0,0 +1,76 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import httpretty
+import unittest
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.connection import ExchangeNTLMAuthConnection
+from pyexchange.exceptions import *  # noqa
+from pyexchange.retry import ExchangeRetryPolicy
+
+from .fixtures import *  # noqa
+
+
+class Test_RetryingTransientErrors(unittest.TestCase):
+
+  def setUp(self):
+    self.responses = []
+    self.connection = FakeConnection(lambda body: self.responses.pop(0))
+    self.retry_policy = ExchangeRetryPolicy(sleep=lambda seconds: None)
+    self.service = Exchange2010Service(connection=self.connection, retry_policy=self.retry_policy)
+
+  def test_reads_are_retried(self):
+    self.responses = [TRANSIENT_ERROR, GET_ITEM_RESPONSE]
+
+    event = self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert event.subject == TEST_EVENT.subject
+    assert len(self.connection.requests) == 2
+    assert self.retry_policy.stats()[u'recovered'] == 1
+
+  def test_writes_are_not(self):
+    self.responses = [TRANSIENT_ERROR, CREATE_ITEM_RESPONSE]
+    event = self.service.calendar().new_event(
+      subject=TEST_EVENT.subject, start=TEST_EVENT.start, end=TEST_EVENT.end,
+      attendees=[PERSON_REQUIRED_ACCEPTED.email],
+    )
+
+    with raises(ExchangeInternalServerTransientErrorException):
+      event.create()
+
+    assert len(self.connection.requests) == 1
+
+  def test_nothing_is_retried_without_a_policy(self):
+    self.responses = [TRANSIENT_ERROR, GET_ITEM_RESPONSE]
+    service = Exchange2010Service(connection=self.connection)
+
+    with raises(ExchangeInternalServerTransientErrorException):
+      service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert len(self.connection.requests) == 1
+
+
+class Test_FailingOverReads(unittest.TestCase):
+
+  @httpretty.activate
+  def test_reads_move_to_a_healthy_server(self):
+    fallback_url = u'http://10.0.0.1/nothing'
+    httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL, status=503, body=u'')
+    httpretty.register_uri(httpretty.POST, fallback_url, status=200, body=GET_ITEM_RESPONSE.encode('utf-8'),
+                           content_type='text/xml; charset=utf-8')
+
+    connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                            username=FAKE_EXCHANGE_USERNAME,
+                                            password=FAKE_EXCHANGE_PASSWORD,
+                                            fallback_urls=[fallback_url],
+                                            prefer_fastest=True)
+    service = Exchange2010Service(connection=connection, retry_policy=ExchangeRetryPolicy(sleep=lambda seconds: None))
+
+    event = service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert event.subject == TEST_EVENT.subject
+    assert httpretty.last_request().headers['Host'] == '10.0.0.1'
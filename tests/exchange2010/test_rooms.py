@@ -0,0 +1,111 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import re
+import unittest
+from datetime import datetime, timedelta
+from pytz import utc
+from pyexchange import Exchange2010Service
+from pyexchange.base.directory import ExchangeBusyPeriod
+from pyexchange.exceptions import *  # noqa
+
+from .fixtures import *  # noqa
+
+ROOMS = {
+  u'building-one@test.linkedin.com': [(u'Lovelace', u'lovelace-room@test.linkedin.com'), (u'Hopper', u'hopper-room@test.linkedin.com')],
+  u'building-two@test.linkedin.com': [(u'Curie', u'curie-room@test.linkedin.com'), (u'Hopper', u'hopper-room@test.linkedin.com')],
+}
+
+START = datetime(year=2050, month=5, day=20, hour=0, minute=0, second=0, tzinfo=utc)
+END = datetime(year=2050, month=5, day=21, hour=0, minute=0, second=0, tzinfo=utc)
+
+
+def answer_from_room_directory(body):
+  """ Answers room and availability requests from ROOMS. Rooms whose address starts with "missing" don't exist. """
+  if u'GetRoomLists' in body:
+    return GET_ROOM_LISTS_RESPONSE
+
+  if u'GetRooms' in body:
+    room_list = re.search(u'<t:EmailAddress>(.*)</t:EmailAddress>', body).group(1)
+    return GET_ROOMS_RESPONSE.format(rooms=u''.join(ROOM.format(name=name, email=email) for name, email in ROOMS[room_list]))
+
+  answers = []
+  for email in re.findall(u'<t:Address>(.*?)</t:Address>', body):
+    if email.startswith(u'missing'):
+      answers.append(FREE_BUSY_ERROR)
+    else:
+      answers.append(FREE_BUSY_RESPONSE.format(events=u''.join([
+        FREE_BUSY_EVENT.format(start=u'2050-05-20T09:00:00', end=u'2050-05-20T10:00:00', busy_type=u'Busy'),
+        FREE_BUSY_EVENT.format(start=u'2050-05-20T11:00:00', end=u'2050-05-20T12:00:00', busy_type=u'Free'),
+        FREE_BUSY_EVENT.format(start=u'2050-05-20T13:00:00', end=u'2050-05-20T13:30:00', busy_type=u'Tentative'),
+      ])))
+
+  return GET_USER_AVAILABILITY_RESPONSE.format(answers=u''.join(answers))
+
+
+class Test_RoomDirectory(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = FakeConnection(answer_from_room_directory)
+    self.service = Exchange2010Service(connection=self.connection)
+
+  def test_room_lists(self):
+    room_lists = self.service.rooms().room_lists()
+
+    assert [room_list.name for room_list in room_lists] == [u'Building One', u'Building Two']
+
+  def test_rooms_in_a_list(self):
+    rooms = self.service.rooms().rooms(u'building-two@test.linkedin.com')
+
+    assert [room.email for room in rooms] == [u'curie-room@test.linkedin.com', u'hopper-room@test.linkedin.com']
+
+  def test_all_rooms_are_listed_once(self):
+    rooms = self.service.rooms().rooms()
+
+    assert [room.name for room in rooms] == [u'Lovelace', u'Hopper', u'Curie']
+
+  def test_rooms_are_loaded_once_per_refresh_interval(self):
+    directory = self.service.rooms()
+
+    directory.rooms()
+    directory.rooms()
+    assert len(self.connection.requests) == 3
+
+    directory.refresh()
+    directory.room_lists()
+    assert len(self.connection.requests) == 4
+
+  def test_room_availability(self):
+    availability = self.service.rooms().availability(self.service.rooms().rooms(), START, END)
+
+    assert sorted(availability) == [u'curie-room@test.linkedin.com', u'hopper-room@test.linkedin.com', u'lovelace-room@test.linkedin.com']
+    assert availability[u'hopper-room@test.linkedin.com'].busy_periods == [
+      ExchangeBusyPeriod(START.replace(hour=9), START.replace(hour=10), u'Busy'),
+      ExchangeBusyPeriod(START.replace(hour=13), START.replace(hour=13, minute=30), u'Tentative'),
+    ]
+    assert availability[u'hopper-room@test.linkedin.com'].error is None
+
+  def test_rooms_are_asked_about_in_batches(self):
+    rooms = [u'room-%d@test.linkedin.com' % number for number in range(250)]
+
+    availability = self.service.rooms().availability(rooms, START, END)
+
+    assert len(self.connection.requests) == 3
+    assert len(availability) == 250
+    assert u'<t:StartTime>2050-05-20T00:00:00</t:StartTime>' in self.connection.requests[0]
+
+  def test_one_missing_room_does_not_spoil_the_rest(self):
+    availability = self.service.rooms().availability([u'missing@test.linkedin.com', u'curie-room@test.linkedin.com'], START, END)
+
+    assert isinstance(availability[u'missing@test.linkedin.com'].error, FailedExchangeException)
+    assert availability[u'missing@test.linkedin.com'].busy_periods == []
+    assert len(availability[u'curie-room@test.linkedin.com'].busy_periods) == 2
+
+  def test_long_windows_are_split(self):
+    availability = self.service.rooms().availability([u'curie-room@test.linkedin.com'], START, START + timedelta(days=100))
+
+    assert len(self.connection.requests) == 3
+    assert len(availability[u'curie-room@test.linkedin.com'].busy_periods) == 2
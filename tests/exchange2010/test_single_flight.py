@@ -0,0 +1,58 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import threading
+import time
+import unittest
+from pyexchange import Exchange2010Service
+
+from .fixtures import *  # noqa
+
+
+class Test_SharingIdenticalReads(unittest.TestCase):
+
+  def setUp(self):
+    self.release = threading.Event()
+    self.connection = FakeConnection(self.respond)
+    self.service = Exchange2010Service(connection=self.connection)
+
+  def tearDown(self):
+    self.release.set()
+
+  def respond(self, body):
+    self.release.wait(5)
+    return GET_ITEM_RESPONSE
+
+  def get_events(self, services):
+    events = []
+
+    def get(service):
+      events.append(service.calendar().get_event(id=TEST_EVENT.id))
+
+    threads = [threading.Thread(target=get, args=(service,)) for service in services]
+    for thread in threads:
+      thread.start()
+
+    # Give every thread the chance to ask before the first answer comes back
+    deadline = time.time() + 5
+    while len(self.connection.requests) + self.service.single_flight.stats()[u'shared'] < len(services) and time.time() < deadline:
+      time.sleep(0.001)
+    self.release.set()
+
+    for thread in threads:
+      thread.join()
+    return events
+
+  def test_concurrent_identical_reads_share_one_request(self):
+    events = self.get_events([self.service] * 3)
+
+    assert len(self.connection.requests) == 1
+    assert [event.subject for event in events] == [TEST_EVENT.subject] * 3
+
+  def test_reads_for_different_mailboxes_are_not_shared(self):
+    self.get_events([self.service.anchor(u'one@test.linkedin.com'), self.service.anchor(u'two@test.linkedin.com')])
+
+    assert len(self.connection.requests) == 2
@@ -0,0 +1,252 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import types
+
+from lxml import etree
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.exceptions import ExchangeItemNotFoundException, ExchangeIrresolvableConflictException
+from pyexchange.exchange2010 import soap_request
+
+from .fixtures import *  # noqa
+
+CREATED_MESSAGE = u"""<m:CreateItemResponseMessage ResponseClass="Success">
+  <m:ResponseCode>NoError</m:ResponseCode>
+  <m:Items><t:CalendarItem><t:ItemId Id="{id}" ChangeKey="{change_key}" /></t:CalendarItem></m:Items>
+</m:CreateItemResponseMessage>"""
+
+NOT_CREATED_MESSAGE = u"""<m:CreateItemResponseMessage ResponseClass="Error">
+  <m:MessageText>The specified object was not found in the store.</m:MessageText>
+  <m:ResponseCode>ErrorItemNotFound</m:ResponseCode>
+  <m:Items />
+</m:CreateItemResponseMessage>"""
+
+
+FOUND_ID_MESSAGE = u"""<m:GetItemResponseMessage ResponseClass="Success">
+  <m:ResponseCode>NoError</m:ResponseCode>
+  <m:Items><t:CalendarItem><t:ItemId Id="{id}" ChangeKey="FRESH-{id}" /></t:CalendarItem></m:Items>
+</m:GetItemResponseMessage>"""
+
+UPDATED_MESSAGE = u"""<m:UpdateItemResponseMessage ResponseClass="Success">
+  <m:ResponseCode>NoError</m:ResponseCode>
+  <m:Items><t:CalendarItem><t:ItemId Id="{id}" ChangeKey="SAVED-{id}" /></t:CalendarItem></m:Items>
+</m:UpdateItemResponseMessage>"""
+
+STALE_MESSAGE = u"""<m:UpdateItemResponseMessage ResponseClass="Error">
+  <m:MessageText>The change key passed in the request does not match the current change key for the item.</m:MessageText>
+  <m:ResponseCode>ErrorIrresolvableConflict</m:ResponseCode>
+</m:UpdateItemResponseMessage>"""
+
+
+def response_with(fixture, message_tag, messages):
+  """ *fixture* with its response messages swapped for *messages*. """
+  start = fixture.index(u'<m:%s' % message_tag)
+  end = fixture.index(u'</m:ResponseMessages>')
+  return fixture[:start] + u''.join(messages) + fixture[end:]
+
+
+def create_item_response(messages):
+  return response_with(CREATE_ITEM_RESPONSE, u'CreateItemResponseMessage', messages)
+
+
+def requested_ids(body):
+  return [item_id.get(u'Id') for item_id in etree.fromstring(body.encode(u'utf-8')).xpath(u'//m:ItemIds/t:ItemId', namespaces=soap_request.NAMESPACES)]
+
+
+def canonical(service, xml):
+  """ The request as it'd be sent, canonicalized so redundant namespace declarations don't count. """
+  request = service._wrap_soap_xml_request(xml)
+  if etree.iselement(request):
+    request = etree.tostring(request, encoding=u'utf-8')
+  return etree.tostring(etree.fromstring(request), method=u'c14n')
+
+
+def new_events(service, count):
+  return [
+    service.calendar().new_event(
+      subject=u'%s %d' % (TEST_EVENT.subject, number),
+      start=TEST_EVENT.start,
+      end=TEST_EVENT.end,
+      location=TEST_EVENT.location,
+      html_body=TEST_EVENT.body,
+      attendees=[PERSON_REQUIRED_ACCEPTED.email],
+    )
+    for number in range(count)
+  ]
+
+
+class StreamingConnection(FakeConnection):
+  streams_request_bodies = True
+
+  def __init__(self, respond):
+    super(StreamingConnection, self).__init__(respond)
+    self.bodies = []
+
+  def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    self.bodies.append(body)
+    return super(StreamingConnection, self).send(b''.join(body), headers, retries, timeout, encoding)
+
+
+def test_streamed_create_item_is_the_same_request_for_one_event():
+  service = Exchange2010Service(connection=None)
+  event = new_events(service, 1)[0]
+
+  assert canonical(service, soap_request.stream_new_events([event])) == canonical(service, soap_request.new_event(event))
+
+
+def test_streamed_update_item_is_the_same_request_for_one_event():
+  service = Exchange2010Service(connection=None)
+  event = new_events(service, 1)[0]
+  event._id, event._change_key = TEST_EVENT.id, TEST_EVENT.change_key
+  updated = [u'subject', u'location', u'start']
+
+  streamed = soap_request.stream_update_items([(event, updated)], u'SendToNone')
+
+  assert canonical(service, streamed) == canonical(service, soap_request.update_item(event, updated, u'SendToNone'))
+
+
+def test_items_are_written_one_at_a_time():
+  taken = []
+  events = new_events(Exchange2010Service(connection=None), 100)
+
+  def each_event():
+    for event in events:
+      taken.append(event)
+      yield event
+
+  stream = soap_request.stream_new_events(each_event())
+  stream.chunk_size = 1
+
+  chunks = stream.chunks()
+  next(chunks)
+
+  assert len(taken) == 1
+
+
+def test_chunks_add_up_to_the_whole_body():
+  stream = soap_request.stream_new_events(new_events(Exchange2010Service(connection=None), 200))
+  whole = b''.join(stream.chunks())
+
+  stream.chunk_size = 1024
+  chunks = list(stream.chunks())
+
+  assert len(chunks) > 1
+  assert b''.join(chunks) == whole
+  assert len(stream.element().xpath(u'//t:CalendarItem', namespaces=soap_request.NAMESPACES)) == 200
+
+
+def test_namespaces_are_declared_once_as_when_built_as_a_tree():
+  service = Exchange2010Service(connection=None)
+  events = new_events(service, 50)
+  tree = soap_request.M.CreateItem(
+    soap_request.M.SavedItemFolderId(soap_request.folder_id_node(u'calendar')),
+    soap_request.M.Items(*[soap_request.calendar_item(event) for event in events]),
+    SendMeetingInvitations=u'SendToAllAndSaveCopy'
+  )
+
+  streamed = service._wrap_soap_xml_request(soap_request.stream_new_events(events))
+
+  assert streamed.count(b'xmlns:t=') == etree.tostring(service._wrap_soap_xml_request(tree)).count(b'xmlns:t=')
+  assert len(streamed) == len(etree.tostring(service._wrap_soap_xml_request(tree), encoding=u'utf-8'))
+  assert canonical(service, soap_request.stream_new_events(events)) == canonical(service, tree)
+
+
+def test_many_events_are_created_with_one_request():
+  connection = FakeConnection(lambda body: create_item_response(
+    CREATED_MESSAGE.format(id=u'ID%d' % number, change_key=u'CK%d' % number) for number in range(500)
+  ))
+  service = Exchange2010Service(connection=connection)
+
+  events = service.calendar().create_events(new_events(service, 500))
+
+  assert len(connection.requests) == 1
+  assert connection.requests[0].count(u'<t:CalendarItem') == 500
+  assert [event.id for event in events] == [u'ID%d' % number for number in range(500)]
+  assert events[-1].change_key == u'CK499'
+
+
+def test_the_first_failure_is_raised_once_the_rest_have_ids():
+  messages = [CREATED_MESSAGE.format(id=u'ID0', change_key=u'CK0'), NOT_CREATED_MESSAGE, CREATED_MESSAGE.format(id=u'ID2', change_key=u'CK2')]
+  service = Exchange2010Service(connection=FakeConnection(lambda body: create_item_response(messages)))
+  events = new_events(service, 3)
+
+  with raises(ExchangeItemNotFoundException):
+    service.calendar().create_events(events)
+
+  assert [event.id for event in events] == [u'ID0', None, u'ID2']
+
+
+def test_connections_that_can_stream_get_the_body_in_pieces():
+  connection = StreamingConnection(lambda body: create_item_response(
+    CREATED_MESSAGE.format(id=u'ID%d' % number, change_key=u'CK') for number in range(3)
+  ))
+  service = Exchange2010Service(connection=connection)
+  events = new_events(service, 3)
+
+  service.calendar().create_events(events)
+
+  assert isinstance(connection.bodies[0], types.GeneratorType)
+  assert connection.requests[0].encode(u'utf-8') == Exchange2010Service(connection=None)._wrap_soap_xml_request(soap_request.stream_new_events(events))
+
+
+class Test_UpdatingManyEvents(object):
+
+  def setup_method(self, method):
+    self.stale = set()
+    self.connection = FakeConnection(self.respond)
+    self.service = Exchange2010Service(connection=self.connection)
+    self.events = new_events(self.service, 150)
+    for number, event in enumerate(self.events):
+      event._id, event._change_key = u'ID%d' % number, u'OLD'
+      event._reset_dirty_attributes()
+
+  def respond(self, body):
+    if u'<m:GetItem' in body:
+      return response_with(GET_ITEM_RESPONSE, u'GetItemResponseMessage', [FOUND_ID_MESSAGE.format(id=id) for id in requested_ids(body)])
+
+    ids = [item_id.get(u'Id') for item_id in etree.fromstring(body.encode(u'utf-8')).xpath(u'//t:ItemChange/t:ItemId', namespaces=soap_request.NAMESPACES)]
+    return response_with(UPDATE_ITEM_RESPONSE, u'UpdateItemResponseMessage', [
+      STALE_MESSAGE if id in self.stale else UPDATED_MESSAGE.format(id=id) for id in ids
+    ])
+
+  def test_changes_are_saved_with_one_update_request(self):
+    for event in self.events:
+      event.location = u'Somewhere else'
+
+    updated = self.service.calendar().update_events(self.events)
+
+    updates = [body for body in self.connection.requests if u'<m:UpdateItem' in body]
+    assert len(updates) == 1
+    assert updates[0].count(u'<t:ItemChange') == 150
+    assert u'ChangeKey="FRESH-ID149"' in updates[0]
+    assert updated == self.events
+    assert self.events[0].change_key == u'SAVED-ID0'
+    assert not self.events[0]._dirty_attributes
+
+  def test_change_keys_are_refreshed_in_batches(self):
+    for event in self.events:
+      event.subject = u'New subject'
+
+    self.service.calendar().update_events(self.events)
+
+    assert len([body for body in self.connection.requests if u'<m:GetItem' in body]) == 2
+
+  def test_unchanged_events_are_left_alone(self):
+    self.events[3].location = u'Somewhere else'
+
+    assert self.service.calendar().update_events(self.events) == [self.events[3]]
+    assert self.connection.requests[-1].count(u'<t:ItemChange') == 1
+
+  def test_the_first_failure_is_raised_once_the_rest_are_saved(self):
+    self.stale.add(u'ID1')
+    for event in self.events[:3]:
+      event.location = u'Somewhere else'
+
+    with raises(ExchangeIrresolvableConflictException):
+      self.service.calendar().update_events(self.events[:3])
+
+    assert [bool(event._dirty_attributes) for event in self.events[:3]] == [False, True, False]
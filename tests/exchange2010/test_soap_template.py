@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+from lxml import etree
+from pytest import mark, raises
+from pyexchange import Exchange2010Service
+from pyexchange.base.soap_template import SOAPTemplate
+from pyexchange.exchange2010 import soap_request
+from pyexchange.exchange2010.soap_request import M, T
+
+from .fixtures import *  # noqa
+
+AWKWARD_IDS = [
+  u'AAMkADdhZjY2YzU5LTM4NWYtNDNiMy1hZGI3LWMwNDkyYTM1YmE0OABGAAAAAAAmAAA=',
+  u'a&b<c>d"e\'f\tg\nh\ri',
+  u'ünïcödé ☃',
+  u'',
+]
+
+
+def serialized(service, xml):
+  request = service._wrap_soap_xml_request(xml)
+  return request if isinstance(request, bytes) else etree.tostring(request, encoding=u'utf-8')
+
+
+@mark.parametrize('id', AWKWARD_IDS)
+@mark.parametrize('format', [u'IdOnly', u'AllProperties'])
+def test_templated_get_item_matches_the_element_built_one(id, format):
+  service = Exchange2010Service(connection=None)
+
+  assert serialized(service, soap_request.render_get_item(id, format=format)) == serialized(service, soap_request.get_item(id, format=format))
+
+
+def test_templated_get_item_matches_for_many_ids_and_impersonation():
+  service = Exchange2010Service(connection=None).impersonate(u'some&body@test.linkedin.com')
+
+  assert serialized(service, soap_request.render_get_item(AWKWARD_IDS)) == serialized(service, soap_request.get_item(AWKWARD_IDS))
+
+
+def test_templated_get_item_takes_a_tuple_of_ids():
+  service = Exchange2010Service(connection=None)
+
+  assert serialized(service, soap_request.render_get_item(tuple(AWKWARD_IDS))) == serialized(service, soap_request.get_item(AWKWARD_IDS))
+
+
+def test_values_lxml_would_refuse_are_refused():
+  with raises(ValueError):
+    soap_request.render_get_item(u'bad\x01id')
+
+
+def test_templates_know_their_operation():
+  template = SOAPTemplate(lambda hole: M.GetFolder(
+    M.FolderShape(T.BaseShape(hole(u'format'))),
+    M.FolderIds(T.FolderId(Id=hole(u'id'))),
+  ))
+
+  request = template.render(format=u'Default', id=u'<folder>')
+
+  assert request.operation == u'GetFolder'
+  assert request.element().xpath(u'//t:FolderId/@Id', namespaces=soap_request.NAMESPACES) == [u'<folder>']
+
+
+def test_templated_requests_are_sent_as_they_are():
+  connection = FakeConnection(lambda body: GET_ITEM_RESPONSE)
+  service = Exchange2010Service(connection=connection)
+
+  event = service.calendar().get_event(id=TEST_EVENT.id)
+
+  assert event.subject == TEST_EVENT.subject
+  assert connection.requests[0].encode(u'utf-8') == serialized(service, soap_request.get_item(TEST_EVENT.id, format=u'AllProperties'))
@@ -0,0 +1,55 @@
+"""
+(c) 2013 LinkedIn Corp. All rights reserved.
+Licensed under the Apache License, Version 2.0 (the "License");?you may not use this file except in compliance with the License. You may obtain a copy of the License at  http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+"""
+import unittest
+from pytest import raises
+from pyexchange import Exchange2010Service
+from pyexchange.exceptions import *  # noqa
+from pyexchange.throttling import ExchangeThrottling
+
+from .fixtures import *  # noqa
+
+
+class Test_Throttling(unittest.TestCase):
+
+  def setUp(self):
+    self.connection = FakeConnection(lambda body: GET_ITEM_RESPONSE)
+    self.connection.username = FAKE_EXCHANGE_USERNAME
+    self.service = Exchange2010Service(connection=self.connection, throttling=ExchangeThrottling(initial=8))
+
+  def test_server_busy_carries_the_back_off_hint(self):
+    self.connection.respond = lambda body: SERVER_BUSY
+
+    with raises(ExchangeServerBusyException) as info:
+      self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert info.value.back_off_milliseconds == 297749
+
+  def test_throttling_shrinks_the_service_accounts_limit(self):
+    self.connection.respond = lambda body: SERVER_BUSY
+
+    with raises(ExchangeServerBusyException):
+      self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    stats = self.service.throttling.stats()[FAKE_EXCHANGE_USERNAME]
+    assert stats[u'limit'] == 4
+    assert stats[u'throttles'] == 1
+
+  def test_successes_are_counted(self):
+    self.service.calendar().get_event(id=TEST_EVENT.id)
+
+    assert self.service.throttling.stats()[FAKE_EXCHANGE_USERNAME][u'successes'] == 1
+
+  def test_impersonated_mailboxes_have_their_own_budget(self):
+    self.service.impersonate(u'somebody@test.linkedin.com').calendar().get_event(id=TEST_EVENT.id)
+
+    assert list(self.service.throttling.stats()) == [u'somebody@test.linkedin.com']
+
+  def test_services_are_only_throttled_when_asked(self):
+    service = Exchange2010Service(connection=self.connection)
+
+    assert service.throttling is None
+    assert service.calendar().get_event(id=TEST_EVENT.id).subject == TEST_EVENT.subject
@@ -283,6 +283,74 @@ class Test_UpdatingAnEvent(unittest.TestCase):
 
     assert RESOURCE.email not in HTTPretty.last_request.body.decode('utf-8')
 
+  @httprettified
+  def test_adding_attendees_only_sends_the_new_ones(self):
+    HTTPretty.register_uri(
+      HTTPretty.POST,
+      FAKE_EXCHANGE_URL,
+      responses=[
+        self.get_change_key_response,
+        self.update_event_response,
+      ]
+    )
+
+    self.event.add_attendees(SIR_ROBIN.email)
+    self.event.add_attendees(SIR_NOT_APPEARING_IN_THIS_FILM.email, required=False)
+    self.event.update()
+
+    body = HTTPretty.last_request.body.decode('utf-8')
+    assert u'AppendToItemField' in body
+    assert u'SetItemField' not in body
+    assert SIR_ROBIN.email in body
+    assert SIR_NOT_APPEARING_IN_THIS_FILM.email in body
+    assert PERSON_REQUIRED_ACCEPTED.email not in body
+
+  @httprettified
+  def test_removing_an_attendee_sends_the_whole_list(self):
+    HTTPretty.register_uri(
+      HTTPretty.POST,
+      FAKE_EXCHANGE_URL,
+      responses=[
+        self.get_change_key_response,
+        self.update_event_response,
+      ]
+    )
+
+    self.event.add_attendees(SIR_ROBIN.email)
+    self.event.remove_attendees(PERSON_REQUIRED_DECLINED.email)
+    self.event.update()
+
+    body = HTTPretty.last_request.body.decode('utf-8')
+    assert u'AppendToItemField' not in body
+    assert PERSON_REQUIRED_ACCEPTED.email in body
+    assert SIR_ROBIN.email in body
+    assert PERSON_REQUIRED_DECLINED.email not in body
+
+  def test_changing_an_existing_attendee_needs_the_whole_list(self):
+    self.event.add_attendees(PERSON_REQUIRED_ACCEPTED.email, required=False)
+
+    assert self.event._pending_additions(u'attendees') is None
+
+  @httprettified
+  def test_adding_a_resource_only_sends_the_new_one(self):
+    HTTPretty.register_uri(
+      HTTPretty.POST,
+      FAKE_EXCHANGE_URL,
+      responses=[
+        self.get_change_key_response,
+        self.update_event_response,
+      ]
+    )
+
+    self.event.add_resources(UPDATED_RESOURCE.email)
+    self.event.update()
+
+    body = HTTPretty.last_request.body.decode('utf-8')
+    assert u'AppendToItemField' in body
+    assert UPDATED_RESOURCE.email in body
+    assert RESOURCE.email not in body
+    assert self.event._pending_additions(u'resources') == []
+
   def test_can_add_resources_by_email_address(self):
     resource_count = len(self.event.resources)
 
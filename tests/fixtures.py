@@ -4,6 +4,30 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
+import threading
+
+from pyexchange.connection import ExchangeBaseConnection
+
 FAKE_EXCHANGE_URL = u'http://10.0.0.0/nothing'
 FAKE_EXCHANGE_USERNAME = u'FAKEDOMAIN\\nobody'
 FAKE_EXCHANGE_PASSWORD = u'totallyfake'
+
+
+class FakeConnection(ExchangeBaseConnection):
+  """
+  Answers each request with respond(request body), and keeps the request bodies. Unlike HTTPretty,
+  it's safe to use from several threads at once.
+  """
+
+  def __init__(self, respond):
+    self.respond = respond
+    self.requests = []
+    self.lock = threading.Lock()
+
+  def send(self, body, headers=None, retries=2, timeout=30, encoding=u"utf-8"):
+    body = body.decode(encoding)
+
+    with self.lock:
+      self.requests.append(body)
+
+    return self.respond(body)
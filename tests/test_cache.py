@@ -0,0 +1,194 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from pytz import utc
+
+from pyexchange.cache import ExchangeItemCache, ExchangeDirectoryCache, ExchangeResponseCache
+
+
+class FakeClock(object):
+  def __init__(self):
+    self.now = 1000.0
+
+  def __call__(self):
+    return self.now
+
+
+def test_entries_are_fresh_until_the_ttl_passes():
+  clock = FakeClock()
+  cache = ExchangeItemCache(ttl=60, clock=clock)
+  cache.put(u'id1', u'event', u'key1', {u'subject': u'hello'})
+
+  assert cache.is_fresh(cache.get(u'id1'))
+  assert cache.stale_ids() == []
+
+  clock.now += 61
+  assert not cache.is_fresh(cache.get(u'id1'))
+  assert cache.stale_ids() == [u'id1']
+
+  cache.touch(u'id1')
+  assert cache.is_fresh(cache.get(u'id1'))
+
+
+def test_least_recently_used_entries_are_evicted():
+  cache = ExchangeItemCache(max_items=2)
+  cache.put(u'id1', u'event', u'key', {})
+  cache.put(u'id2', u'event', u'key', {})
+  cache.get(u'id1')
+  cache.put(u'id3', u'event', u'key', {})
+
+  assert cache.get(u'id2') is None
+  assert cache.get(u'id1') is not None
+  assert cache.stats()[u'evictions'] == 1
+  assert len(cache) == 2
+
+
+def test_invalidate_and_clear():
+  cache = ExchangeItemCache()
+  cache.put(u'id1', u'event', u'key', {})
+  cache.put(u'id2', u'event', u'key', {})
+
+  cache.invalidate(u'id1')
+  assert cache.get(u'id1') is None
+
+  cache.clear()
+  assert cache.get(u'id2') is None
+
+
+class Test_SqliteCache(object):
+
+  def setup_method(self, method):
+    self.directory = tempfile.mkdtemp()
+    self.path = os.path.join(self.directory, u'cache.db')
+
+  def teardown_method(self, method):
+    shutil.rmtree(self.directory)
+
+  def test_entries_survive_a_restart(self):
+    start = datetime(year=2050, month=5, day=20, hour=20, tzinfo=utc)
+    ExchangeItemCache(path=self.path).put(u'id1', u'event', u'key1', {u'subject': u'hello', u'start': start})
+
+    entry = ExchangeItemCache(path=self.path).get(u'id1')
+
+    assert entry.change_key == u'key1'
+    assert entry.properties == {u'subject': u'hello', u'start': start}
+
+  def test_database_is_size_bounded(self):
+    clock = FakeClock()
+    cache = ExchangeItemCache(path=self.path, max_stored_items=2, clock=clock)
+    for id in (u'id1', u'id2', u'id3'):
+      clock.now += 1
+      cache.put(id, u'event', u'key', {})
+
+    reopened = ExchangeItemCache(path=self.path)
+    assert reopened.get(u'id1') is None
+    assert reopened.get(u'id3') is not None
+
+  def test_replacing_or_reopening_keeps_the_stored_count(self):
+    clock = FakeClock()
+    cache = ExchangeItemCache(path=self.path, max_stored_items=2, clock=clock)
+    for id in (u'id1', u'id2', u'id1', u'id1'):
+      clock.now += 1
+      cache.put(id, u'event', u'key', {})
+    assert cache.stats()[u'evictions'] == 0
+
+    reopened = ExchangeItemCache(path=self.path, max_stored_items=2, clock=clock)
+    clock.now += 1
+    reopened.put(u'id3', u'event', u'key', {})
+
+    assert reopened.stats()[u'evictions'] == 1
+    assert self.stored_ids() == [u'id1', u'id3']
+
+  def test_unreadable_entries_are_dropped_for_good(self):
+    cache = ExchangeItemCache(path=self.path)
+    cache.put(u'id1', u'event', u'key', {})
+    cache._database.execute(u'UPDATE items SET properties = ?', (sqlite3.Binary(b'not a pickle'),))
+    cache._database.commit()
+    cache._memory.clear()
+
+    assert cache.get(u'id1') is None
+    assert self.stored_ids() == []
+
+  def stored_ids(self):
+    database = sqlite3.connect(self.path)
+    try:
+      return sorted(row[0] for row in database.execute(u'SELECT id FROM items'))
+    finally:
+      database.close()
+
+  def test_invalidate_removes_the_stored_copy(self):
+    cache = ExchangeItemCache(path=self.path)
+    cache.put(u'id1', u'event', u'key', {})
+    cache.invalidate(u'id1')
+
+    assert ExchangeItemCache(path=self.path).get(u'id1') is None
+
+
+def test_directory_answers_expire():
+  clock = FakeClock()
+  cache = ExchangeDirectoryCache(ttl=60, negative_ttl=10, clock=clock)
+  cache.put(u'somebody', (u'an answer',))
+  cache.put(u'nobody', ())
+
+  clock.now += 11
+  assert cache.get(u'somebody') == (u'an answer',)
+  assert cache.get(u'nobody') is None
+
+  clock.now += 50
+  assert cache.get(u'somebody') is None
+  assert cache.stats()[u'hits'] == 1
+  assert cache.stats()[u'misses'] == 2
+
+
+def test_least_recently_used_directory_answers_are_evicted():
+  cache = ExchangeDirectoryCache(max_items=2)
+  cache.put(u'one', (1,))
+  cache.put(u'two', (2,))
+  cache.get(u'one')
+  cache.put(u'three', (3,))
+
+  assert cache.get(u'two') is None
+  assert cache.get(u'one') == (1,)
+  assert cache.stats()[u'evictions'] == 1
+
+
+def test_responses_are_keyed_by_operation_identity_and_body():
+  cache = ExchangeResponseCache()
+  key = cache.key(u'GetFolder', None, b'<GetFolder/>')
+
+  assert key == cache.key(u'GetFolder', None, b'<GetFolder/>')
+  assert key != cache.key(u'GetFolder', (u'somebody@test.linkedin.com', u'PrimarySmtpAddress'), b'<GetFolder/>')
+  assert key != cache.key(u'GetFolder', None, b'<GetFolder></GetFolder>')
+
+
+def test_responses_expire_and_are_evicted():
+  clock = FakeClock()
+  cache = ExchangeResponseCache(ttl=60, max_items=2, clock=clock)
+  for name in (u'one', u'two', u'three'):
+    cache.put(cache.key(u'GetFolder', None, name.encode('utf-8')), name)
+
+  assert cache.get(cache.key(u'GetFolder', None, b'one')) is None
+  assert cache.get(cache.key(u'GetFolder', None, b'two')) == u'two'
+
+  clock.now += 60
+  assert cache.get(cache.key(u'GetFolder', None, b'two')) is None
+  assert cache.stats()[u'evictions'] == 1
+
+
+def test_folder_changes_invalidate_folder_responses_only():
+  cache = ExchangeResponseCache()
+  cache.put(cache.key(u'GetFolder', None, b'folder'), u'folder')
+  cache.put(cache.key(u'ConvertId', None, b'id'), u'id')
+
+  cache.invalidate_for(u'CreateItem')
+  assert len(cache) == 2
+
+  cache.invalidate_for(u'DeleteFolder')
+  assert cache.get(cache.key(u'GetFolder', None, b'folder')) is None
+  assert cache.get(cache.key(u'ConvertId', None, b'id')) == u'id'
+  assert cache.stats()[u'invalidations'] == 1
+
+  cache.invalidate()
+  assert len(cache) == 0
@@ -0,0 +1,57 @@
+import pytest
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pytz import utc, timezone
+
+from pyexchange.base.calendar import ExchangeEventOrganizer, ExchangeEventResponse
+from pyexchange.base.calendar_columns import event_columns, event_arrays
+
+FakeEvent = namedtuple('FakeEvent', ['id', 'start', 'end', 'is_all_day', 'availability', 'organizer', 'attendees', 'location', 'type'])
+
+START = datetime(year=2050, month=5, day=1, hour=9, tzinfo=utc)
+ORGANIZER = ExchangeEventOrganizer(name=u'organizer', email=u'organizer@test.linkedin.com')
+ATTENDEE = ExchangeEventResponse(name=u'attendee', email=u'attendee@test.linkedin.com', response=u'Accept', last_response=None, required=True)
+
+
+def _events():
+  return [
+    FakeEvent(u'a', START, START + timedelta(minutes=30), False, u'Busy', ORGANIZER, (ATTENDEE, ATTENDEE), u'Room 1', u'Single'),
+    FakeEvent(u'b', START.astimezone(timezone('US/Pacific')), START + timedelta(hours=1), None, None, None, None, None, u'Occurrence'),
+    FakeEvent(u'c', None, None, False, None, None, (), None, None),
+  ]
+
+
+def test_columns_are_parallel_lists():
+  columns = event_columns(_events())
+
+  assert columns[u'id'] == [u'a', u'b']
+  assert columns[u'start'] == [2535008400, 2535008400]
+  assert columns[u'duration'] == [1800, 3600]
+  assert columns[u'is_all_day'] == [False, False]
+  assert columns[u'organizer_email'] == [u'organizer@test.linkedin.com', None]
+  assert columns[u'attendee_count'] == [2, 0]
+  assert columns[u'type'] == [u'Single', u'Occurrence']
+
+
+def test_naive_datetimes_are_treated_as_utc():
+  naive = FakeEvent(u'a', START.replace(tzinfo=None), START.replace(tzinfo=None) + timedelta(minutes=5), False, None, None, (), None, None)
+
+  assert event_columns([naive])[u'start'] == [2535008400]
+
+
+def test_arrays():
+  numpy = pytest.importorskip('numpy')
+  arrays = event_arrays(_events())
+
+  assert len(arrays[u'start']) == 2
+  assert arrays[u'start'].dtype == numpy.int64
+  assert list(arrays[u'end'] - arrays[u'start']) == [1800, 3600]
+  assert list(arrays[u'id']) == [u'a', u'b']
+
+
+def test_each_array_is_contiguous():
+  pytest.importorskip('numpy')
+
+  for array in event_arrays(_events()).values():
+    assert array.flags['C_CONTIGUOUS']
+    assert array.base is None
@@ -0,0 +1,101 @@
+import random
+from collections import namedtuple
+from datetime import datetime, timedelta
+from pytz import utc
+
+from pyexchange.base.calendar_index import ExchangeEventIndex
+
+FakeEvent = namedtuple('FakeEvent', ['id', 'start', 'end'])
+
+MIDNIGHT = datetime(year=2050, month=5, day=1, tzinfo=utc)
+
+
+def _event(id, start_hour, end_hour):
+  return FakeEvent(id=id, start=MIDNIGHT + timedelta(hours=start_hour), end=MIDNIGHT + timedelta(hours=end_hour))
+
+
+def _ids(events):
+  return [event.id for event in events]
+
+
+def test_empty_index_has_no_overlaps():
+  index = ExchangeEventIndex()
+
+  assert len(index) == 0
+  assert index.overlapping(MIDNIGHT, MIDNIGHT + timedelta(days=1)) == []
+  assert index.at(MIDNIGHT) == []
+
+
+def test_overlapping_returns_events_ordered_by_start():
+  index = ExchangeEventIndex([_event(u'c', 13, 14), _event(u'a', 9, 10), _event(u'b', 9.5, 12)])
+
+  assert _ids(index.overlapping(MIDNIGHT + timedelta(hours=9), MIDNIGHT + timedelta(hours=13.5))) == [u'a', u'b', u'c']
+  assert _ids(index.overlapping(MIDNIGHT + timedelta(hours=10), MIDNIGHT + timedelta(hours=11))) == [u'b']
+
+
+def test_back_to_back_events_do_not_overlap():
+  index = ExchangeEventIndex([_event(u'a', 9, 10), _event(u'b', 10, 11)])
+
+  assert _ids(index.conflicts_for(_event(u'a', 9, 10))) == []
+  assert _ids(index.at(MIDNIGHT + timedelta(hours=10))) == [u'b']
+
+
+def test_conflicts_for_excludes_the_event_itself():
+  a = _event(u'a', 9, 11)
+  index = ExchangeEventIndex([a, _event(u'b', 10, 12)])
+
+  assert _ids(index.conflicts_for(a)) == [u'b']
+
+
+def test_naive_datetimes_are_treated_as_utc():
+  index = ExchangeEventIndex([_event(u'a', 9, 10)])
+
+  assert _ids(index.at(datetime(year=2050, month=5, day=1, hour=9, minute=30))) == [u'a']
+
+
+def test_moving_an_event_reindexes_it():
+  index = ExchangeEventIndex([_event(u'a', 9, 10)])
+  index.update(_event(u'a', 15, 16))
+
+  assert len(index) == 1
+  assert index.at(MIDNIGHT + timedelta(hours=9.5)) == []
+  assert _ids(index.at(MIDNIGHT + timedelta(hours=15.5))) == [u'a']
+
+
+def test_cancelled_events_can_be_removed():
+  a = _event(u'a', 9, 10)
+  index = ExchangeEventIndex([a, _event(u'b', 9, 10)])
+  index.remove(a)
+
+  assert a not in index
+  assert _ids(index.at(MIDNIGHT + timedelta(hours=9.5))) == [u'b']
+
+
+def test_events_without_dates_are_not_indexed():
+  index = ExchangeEventIndex([FakeEvent(id=u'a', start=None, end=None)])
+
+  assert len(index) == 0
+
+
+def test_matches_a_linear_scan():
+  rng = random.Random(42)
+  events = []
+  for i in range(500):
+    start = rng.randint(0, 24 * 60)
+    events.append(FakeEvent(id=i, start=MIDNIGHT + timedelta(minutes=start), end=MIDNIGHT + timedelta(minutes=start + rng.randint(0, 120))))
+
+  index = ExchangeEventIndex(events)
+
+  for event in events[::3]:
+    index.remove(event)
+  live = [event for i, event in enumerate(events) if i % 3]
+
+  for _ in range(200):
+    window_start = MIDNIGHT + timedelta(minutes=rng.randint(0, 24 * 60))
+    window_end = window_start + timedelta(minutes=rng.randint(1, 180))
+
+    expected = set(event.id for event in live if event.start < window_end and event.end > window_start)
+    assert set(_ids(index.overlapping(window_start, window_end))) == expected
+
+    expected = set(event.id for event in live if event.start <= window_start < event.end)
+    assert set(_ids(index.at(window_start))) == expected
@@ -0,0 +1,129 @@
+from pyexchange.circuit_breaker import ExchangeCircuitBreaker, CLOSED, OPEN, HALF_OPEN
+
+
+class FakeClock(object):
+  def __init__(self):
+    self.now = 1000.0
+
+  def __call__(self):
+    return self.now
+
+
+def _breaker(clock, **settings):
+  settings.setdefault(u'window', 4)
+  settings.setdefault(u'minimum_calls', 4)
+  settings.setdefault(u'open_seconds', 30)
+  return ExchangeCircuitBreaker(clock=clock, **settings)
+
+
+def test_the_breaker_stays_closed_while_requests_succeed():
+  breaker = _breaker(FakeClock())
+
+  for _ in range(10):
+    assert breaker.allow()
+    breaker.record(True, 0.1)
+
+  assert breaker.state == CLOSED
+
+
+def test_it_waits_for_enough_requests_before_judging():
+  breaker = _breaker(FakeClock())
+
+  for _ in range(3):
+    breaker.record(False, 0.1)
+
+  assert breaker.state == CLOSED
+
+
+def test_too_many_failures_open_the_breaker():
+  clock = FakeClock()
+  breaker = _breaker(clock)
+
+  for succeeded in (True, False, True, False):
+    breaker.record(succeeded, 0.1)
+
+  assert breaker.state == OPEN
+  assert not breaker.allow()
+  assert breaker.times_opened == 1
+
+
+def test_too_many_slow_requests_open_the_breaker():
+  breaker = _breaker(FakeClock(), slow_call_seconds=5, slow_call_rate=0.75)
+
+  for seconds in (6, 6, 1, 6):
+    breaker.record(True, seconds)
+
+  assert breaker.state == OPEN
+
+
+def test_after_a_while_one_probe_is_let_through():
+  clock = FakeClock()
+  breaker = _breaker(clock)
+  for _ in range(4):
+    breaker.record(False, 0.1)
+
+  clock.now += 30
+
+  assert breaker.allow()
+  assert breaker.state == HALF_OPEN
+  assert not breaker.allow()
+
+
+def test_a_good_probe_closes_the_breaker():
+  clock = FakeClock()
+  breaker = _breaker(clock)
+  for _ in range(4):
+    breaker.record(False, 0.1)
+
+  clock.now += 30
+  breaker.allow()
+  breaker.record(True, 0.1)
+
+  assert breaker.state == CLOSED
+  breaker.record(False, 0.1)  # and it starts again with a clean slate
+  assert breaker.state == CLOSED
+
+
+def test_a_bad_probe_opens_the_breaker_again():
+  clock = FakeClock()
+  breaker = _breaker(clock)
+  for _ in range(4):
+    breaker.record(False, 0.1)
+
+  clock.now += 30
+  breaker.allow()
+  breaker.record(False, 0.1)
+
+  assert breaker.state == OPEN
+  assert breaker.times_opened == 2
+
+  clock.now += 29
+  assert not breaker.allow()
+
+
+def test_the_score_follows_latency_and_errors():
+  breaker = _breaker(FakeClock(), smoothing=0.5)
+  assert breaker.score() == 0
+
+  breaker.record(True, 1.0)
+  assert breaker.score() == 1.0
+
+  breaker.record(True, 3.0)
+  assert breaker.latency == 2.0
+
+  breaker.record(False, 2.0)
+  assert breaker.error_rate == 0.5
+  assert breaker.score() == 2.0 * 6
+
+
+def test_requests_in_flight_count_against_the_score():
+  breaker = _breaker(FakeClock())
+  breaker.allow()
+  breaker.record(True, 1.0)
+
+  assert breaker.allow()
+  assert breaker.in_flight == 1
+  assert breaker.score() == 2.0
+
+  breaker.record(True, 1.0)
+  assert breaker.score() == 1.0
@@ -5,8 +5,10 @@ Licensed under the Apache License, Version 2.0 (the "License");?you may not use
 Unless required by applicable law or agreed to in writing, software?distributed under the License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 """
 import httpretty
+import requests
 import unittest
 from mock import patch, MagicMock, call
+from requests.packages.urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
 from pytest import raises
 from pyexchange.connection import ExchangeNTLMAuthConnection
 from pyexchange.exceptions import *
@@ -82,3 +84,213 @@ def test_session_is_cached():
 
     # assert we only get called once, after that it's cached
     manager.MockSession.assert_called_once_with()
+
+
+def _affinity_cookie(request):
+  cookies = request.headers.get('Cookie') or ''
+  for cookie in cookies.split(';'):
+    name, _, value = cookie.strip().partition('=')
+    if name == 'X-BackEndOverrideCookie':
+      return value
+  return None
+
+
+@httpretty.activate
+def test_anchored_requests_stick_to_their_back_end():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL,
+                         status=200,
+                         body="",
+                         adding_headers={'Set-Cookie': 'X-BackEndOverrideCookie=BACKEND1~1234; path=/'})
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD)
+
+  connection.send(b'first', headers={u'X-AnchorMailbox': u'somebody@test.linkedin.com'})
+  assert _affinity_cookie(httpretty.last_request()) is None
+
+  connection.send(b'second', headers={u'X-AnchorMailbox': u'Somebody@test.linkedin.com'})
+  assert _affinity_cookie(httpretty.last_request()) == 'BACKEND1~1234'
+
+  connection.send(b'third', headers={u'X-AnchorMailbox': u'somebody.else@test.linkedin.com'})
+  assert _affinity_cookie(httpretty.last_request()) is None  # the shared session seeing it sends nobody else there
+
+  connection.send(b'fourth')
+  assert _affinity_cookie(httpretty.last_request()) is None
+
+
+@httpretty.activate
+def test_mailboxes_on_the_same_back_end_share_a_session():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL,
+                         status=200,
+                         body="",
+                         adding_headers={'Set-Cookie': 'X-BackEndOverrideCookie=BACKEND1~1234; path=/'})
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          max_affinity_mailboxes=2)
+
+  for mailbox in (u'one@test.linkedin.com', u'two@test.linkedin.com', u'three@test.linkedin.com'):
+    connection.send(b'learn', headers={u'X-AnchorMailbox': mailbox})
+    connection.send(b'use', headers={u'X-AnchorMailbox': mailbox})
+
+  assert list(connection.affinity_sessions) == ['BACKEND1~1234']
+  assert list(connection.affinity) == [u'two@test.linkedin.com', u'three@test.linkedin.com']
+
+
+def test_evicted_sessions_are_left_open_for_requests_still_using_them():
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          max_affinity_sessions=1)
+  connection.affinity[u'one@test.linkedin.com'] = 'BACKEND1~1234'
+  connection.affinity[u'two@test.linkedin.com'] = 'BACKEND2~1234'
+
+  with patch.object(connection, 'build_affinity_session', side_effect=lambda back_end: MagicMock()):
+    in_use = connection._session_for(u'one@test.linkedin.com')
+    connection._session_for(u'two@test.linkedin.com')
+
+  assert list(connection.affinity_sessions) == ['BACKEND2~1234']
+  assert not in_use.close.called
+
+
+FAKE_FALLBACK_URL = u'http://10.0.0.1/nothing'
+
+
+@httpretty.activate
+def test_requests_move_to_the_fallback_url_once_the_breaker_opens():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL, status=503, body="")
+  httpretty.register_uri(httpretty.POST, FAKE_FALLBACK_URL, status=200, body="fallback")
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          fallback_urls=[FAKE_FALLBACK_URL],
+                                          circuit_breaker={u'window': 2, u'minimum_calls': 2})
+
+  for _ in range(2):
+    with raises(FailedExchangeException):
+      connection.send(b'yo')
+
+  assert connection.send(b'yo') == u'fallback'
+  assert httpretty.last_request().headers['Host'] == '10.0.0.1'
+
+
+@httpretty.activate
+def test_client_errors_do_not_open_the_breaker():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL, status=401, body="")
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          circuit_breaker={u'window': 2, u'minimum_calls': 2})
+
+  for _ in range(3):
+    with raises(FailedExchangeException) as error:
+      connection.send(b'yo')
+    assert not isinstance(error.value, ExchangeCircuitOpenException)
+
+
+@httpretty.activate
+def test_requests_fail_fast_when_every_breaker_is_open():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL, status=500, body="")
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          circuit_breaker={u'window': 2, u'minimum_calls': 2})
+
+  for _ in range(2):
+    with raises(FailedExchangeException):
+      connection.send(b'yo')
+
+  sent = len(httpretty.HTTPretty.latest_requests)
+
+  with raises(ExchangeCircuitOpenException):
+    connection.send(b'yo')
+
+  assert len(httpretty.HTTPretty.latest_requests) == sent
+
+
+def test_unreachable_servers_fall_back_straight_away():
+
+  def post(url, **kwargs):
+    if url == FAKE_EXCHANGE_URL:
+      raise requests.exceptions.ConnectionError(MaxRetryError(None, url, NewConnectionError(None, u'connection refused')))
+    return MagicMock(status_code=200, text=u'fallback')
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          fallback_urls=[FAKE_FALLBACK_URL])
+
+  with patch('requests.Session.post', side_effect=post):
+    assert connection.send(b'yo') == u'fallback'
+
+
+def test_requests_that_may_have_been_sent_are_not_sent_elsewhere():
+  posted = []
+
+  def post(url, **kwargs):
+    posted.append(url)
+    if url == FAKE_EXCHANGE_URL:
+      raise requests.exceptions.ConnectionError(ProtocolError(u'Connection aborted.', u'Remote end closed connection without response'))
+    return MagicMock(status_code=200, text=u'fallback')
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          fallback_urls=[FAKE_FALLBACK_URL])
+
+  with patch('requests.Session.post', side_effect=post):
+    with raises(ExchangeEndpointUnavailableException) as error:
+      connection.send(b'yo')
+
+  assert posted == [FAKE_EXCHANGE_URL]
+  assert not error.value.failover_available
+
+
+@httpretty.activate
+def test_the_fastest_url_is_preferred():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL, status=200, body="primary")
+  httpretty.register_uri(httpretty.POST, FAKE_FALLBACK_URL, status=200, body="fallback")
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          fallback_urls=[FAKE_FALLBACK_URL],
+                                          prefer_fastest=True)
+
+  connection.circuit_breakers[FAKE_EXCHANGE_URL].latency = 2.0
+  connection.circuit_breakers[FAKE_FALLBACK_URL].latency = 0.5
+
+  assert connection.send(b'yo') == u'fallback'
+
+
+@httpretty.activate
+def test_failing_servers_say_whether_there_is_somewhere_else_to_go():
+
+  httpretty.register_uri(httpretty.POST, FAKE_EXCHANGE_URL, status=502, body="")
+  httpretty.register_uri(httpretty.POST, FAKE_FALLBACK_URL, status=200, body="fallback")
+
+  connection = ExchangeNTLMAuthConnection(url=FAKE_EXCHANGE_URL,
+                                          username=FAKE_EXCHANGE_USERNAME,
+                                          password=FAKE_EXCHANGE_PASSWORD,
+                                          fallback_urls=[FAKE_FALLBACK_URL],
+                                          prefer_fastest=True)
+
+  with raises(ExchangeEndpointUnavailableException) as error:
+    connection.send(b'yo')
+
+  assert error.value.url == FAKE_EXCHANGE_URL
+  assert error.value.failover_available
+
+  assert connection.send(b'yo') == u'fallback'  # the failure counted against the primary
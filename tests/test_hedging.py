@@ -0,0 +1,178 @@
+import threading
+import time
+
+from pytest import raises
+
+from pyexchange.exceptions import FailedExchangeException
+from pyexchange.hedging import ExchangeHedgingPolicy, NOT_SENT
+
+
+class Slow(object):
+  """ The first call waits until released; later calls return at once, or fail with *second_error*. """
+
+  def __init__(self, second_error=None):
+    self.second_error = second_error
+    self.release = threading.Event()
+    self.calls = 0
+    self.lock = threading.Lock()
+
+  def __call__(self):
+    with self.lock:
+      self.calls += 1
+      call = self.calls
+
+    if call == 1:
+      self.release.wait(5)
+      return u'first'
+    if self.second_error is not None:
+      raise self.second_error
+    return u'second'
+
+
+def test_fast_calls_are_not_hedged():
+  hedging = ExchangeHedgingPolicy(delay=5)
+
+  assert hedging.call(lambda: u'ok') == u'ok'
+  assert hedging.stats()[u'hedges'] == 0
+
+
+def test_slow_calls_are_hedged_and_the_first_answer_wins():
+  hedging = ExchangeHedgingPolicy(delay=0.01)
+  slow = Slow()
+
+  try:
+    assert hedging.call(slow) == u'second'
+  finally:
+    slow.release.set()
+
+  stats = hedging.stats()
+  assert stats[u'hedges'] == 1
+  assert stats[u'hedges_won'] == 1
+
+
+def test_the_other_copy_covers_for_one_that_fails():
+  hedging = ExchangeHedgingPolicy(delay=0.01)
+  slow = Slow(second_error=FailedExchangeException(u'oops'))
+  threading.Timer(0.05, slow.release.set).start()
+
+  try:
+    assert hedging.call(slow) == u'first'
+  finally:
+    slow.release.set()
+
+  assert slow.calls == 2
+  assert hedging.stats()[u'hedges_won'] == 0
+
+
+def test_errors_come_through_when_every_copy_fails():
+  hedging = ExchangeHedgingPolicy(delay=0.01)
+
+  def fail():
+    raise FailedExchangeException(u'oops')
+
+  with raises(FailedExchangeException):
+    hedging.call(fail)
+
+
+def test_nothing_is_hedged_until_we_know_how_long_requests_take():
+  hedging = ExchangeHedgingPolicy(minimum_samples=3)
+
+  for _ in range(2):
+    hedging.call(lambda: u'ok')
+  assert hedging.delay() is None
+
+  hedging.call(lambda: u'ok')
+  assert hedging.delay() == hedging.minimum_delay
+
+
+def test_the_delay_follows_the_percentile():
+  seconds = iter([0, 1, 0, 2, 0, 3, 0, 4])
+  hedging = ExchangeHedgingPolicy(minimum_samples=4, percentile=75, clock=lambda: next(seconds))
+
+  for _ in range(4):
+    hedging.call(lambda: u'ok')
+
+  assert hedging.delay() == 3
+
+
+def test_hedges_come_out_of_a_budget():
+  hedging = ExchangeHedgingPolicy(delay=0.01, budget_minimum=1, budget_ratio=0)
+  slows = [Slow(), Slow()]
+
+  try:
+    assert hedging.call(slows[0]) == u'second'
+    threading.Timer(0.05, slows[1].release.set).start()
+    assert hedging.call(slows[1]) == u'first'
+  finally:
+    for slow in slows:
+      slow.release.set()
+
+  stats = hedging.stats()
+  assert stats[u'hedges'] == 1
+  assert stats[u'over_budget'] == 1
+
+
+def test_calls_that_cannot_be_hedged_run_on_the_calling_thread():
+  hedging = ExchangeHedgingPolicy(delay=5, budget_minimum=0, budget_ratio=0)
+
+  assert hedging.call(threading.current_thread) is threading.current_thread()
+
+
+def test_threads_are_reused():
+  hedging = ExchangeHedgingPolicy(delay=5)
+  threads = []
+
+  for _ in range(3):
+    threads.append(hedging.call(threading.current_thread))
+    for _ in range(100):
+      if hedging._workers._idle:
+        break
+      time.sleep(0.01)
+
+  assert len(set(threads)) == 1
+  assert threads[0] is not threading.current_thread()
+
+
+def test_hedges_that_are_not_sent_give_their_budget_back():
+  hedging = ExchangeHedgingPolicy(delay=0.01)
+  release = threading.Event()
+  threading.Timer(0.05, release.set).start()
+
+  def first():
+    release.wait(5)
+    return u'first'
+
+  assert hedging.call(first, lambda: NOT_SENT) == u'first'
+
+  stats = hedging.stats()
+  assert stats[u'hedges'] == 0
+  assert stats[u'not_sent'] == 1
+  assert stats[u'budget'] == hedging.budget_minimum + hedging.budget_ratio
+
+
+class HeldBack(object):
+  """ Stands in for the policy's threads: runs the first job on a thread, and keeps the rest until asked. """
+
+  def __init__(self):
+    self.held = []
+
+  def run(self, job):
+    if self.held or getattr(self, 'started', False):
+      self.held.append(job)
+      return
+    self.started = True
+    threading.Thread(target=job).start()
+
+
+def test_no_hedge_is_sent_once_the_first_answer_is_in():
+  hedging = ExchangeHedgingPolicy(delay=0.01)
+  hedging._workers = HeldBack()
+  slow = Slow()
+  threading.Timer(0.05, slow.release.set).start()
+
+  assert hedging.call(slow) == u'first'
+
+  hedging._workers.held[0]()  # the second copy's thread only starts now
+
+  assert slow.calls == 1
+  assert hedging.stats()[u'not_sent'] == 1
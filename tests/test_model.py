@@ -0,0 +1,56 @@
+import pickle
+from datetime import datetime
+from pytz import utc
+
+from pyexchange.exchange2010 import Exchange2010CalendarEvent, Exchange2010ContactItem, Exchange2010MailItem, Exchange2010TaskItem
+
+START = datetime(year=2050, month=5, day=20, hour=20, minute=42, second=50, tzinfo=utc)
+END = datetime(year=2050, month=5, day=20, hour=21, minute=43, second=51, tzinfo=utc)
+
+
+def test_items_do_not_carry_an_instance_dict():
+  for item_class in (Exchange2010CalendarEvent, Exchange2010ContactItem, Exchange2010MailItem, Exchange2010TaskItem):
+    item = item_class(service=None)
+    assert not hasattr(item, '__dict__')
+
+
+def test_loading_properties_does_not_mark_them_dirty():
+  event = Exchange2010CalendarEvent(service=None, subject=u'hello', start=START, end=END)
+
+  assert event.subject == u'hello'
+  assert event._dirty_attributes == set()
+
+
+def test_changing_public_attributes_marks_them_dirty():
+  event = Exchange2010CalendarEvent(service=None, subject=u'hello', start=START, end=END)
+  event.subject = u'goodbye'
+  event._id = u'not tracked'
+
+  assert event._dirty_attributes == set([u'subject'])
+
+
+def test_unset_attributes_fall_back_to_defaults():
+  event = Exchange2010CalendarEvent(service=None)
+
+  assert event.subject == u''
+  assert event.location is None
+  assert event.attendees == []
+
+
+def test_mutable_defaults_are_not_shared_between_items():
+  first = Exchange2010CalendarEvent(service=None)
+  second = Exchange2010CalendarEvent(service=None)
+  first.add_attendees(u'somebody@test.linkedin.com')
+
+  assert len(first.attendees) == 1
+  assert second.attendees == []
+
+
+def test_events_can_be_pickled():
+  event = Exchange2010CalendarEvent(service=None, subject=u'hello', start=START, end=END, attendees=[u'somebody@test.linkedin.com'])
+  restored = pickle.loads(pickle.dumps(event))
+
+  assert restored.subject == u'hello'
+  assert restored.start == START
+  assert [attendee.email for attendee in restored.attendees] == [u'somebody@test.linkedin.com']
+  assert restored._dirty_attributes == set()
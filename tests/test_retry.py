@@ -0,0 +1,97 @@
+from pytest import raises
+
+from pyexchange.exceptions import ExchangeEndpointUnavailableException, ExchangeInternalServerTransientErrorException, ExchangeServerBusyException, FailedExchangeException
+from pyexchange.retry import ExchangeRetryPolicy
+
+
+class Flaky(object):
+  """ Raises each of *errors* in turn, then returns u'ok'. """
+
+  def __init__(self, *errors):
+    self.errors = list(errors)
+    self.calls = 0
+
+  def __call__(self):
+    self.calls += 1
+    if self.errors:
+      raise self.errors.pop(0)
+    return u'ok'
+
+
+def policy(**settings):
+  sleeps = []
+  return ExchangeRetryPolicy(sleep=sleeps.append, random=lambda: 1.0, **settings), sleeps
+
+
+def test_transient_errors_are_retried_with_backoff():
+  retry_policy, sleeps = policy(base_delay=1)
+  flaky = Flaky(ExchangeInternalServerTransientErrorException(u'oops'), ExchangeInternalServerTransientErrorException(u'oops'))
+
+  assert retry_policy.call(flaky) == u'ok'
+  assert flaky.calls == 3
+  assert sleeps == [1.0, 2.0]
+  assert retry_policy.stats()[u'recovered'] == 1
+
+
+def test_back_off_hints_are_honored():
+  retry_policy, sleeps = policy()
+
+  retry_policy.call(Flaky(ExchangeServerBusyException(u'busy', back_off_milliseconds=1500)))
+  assert sleeps == [1.5]
+
+
+def test_long_back_off_hints_are_not_waited_out():
+  retry_policy, sleeps = policy(max_delay=30)
+
+  with raises(ExchangeServerBusyException):
+    retry_policy.call(Flaky(ExchangeServerBusyException(u'busy', back_off_milliseconds=300000)))
+  assert sleeps == []
+
+
+def test_operations_that_are_not_idempotent_are_not_retried():
+  retry_policy, sleeps = policy()
+  flaky = Flaky(ExchangeInternalServerTransientErrorException(u'oops'))
+
+  with raises(ExchangeInternalServerTransientErrorException):
+    retry_policy.call(flaky, idempotent=False)
+  assert flaky.calls == 1
+
+
+def test_other_errors_are_not_retried():
+  retry_policy, sleeps = policy()
+  flaky = Flaky(FailedExchangeException(u'nope'))
+
+  with raises(FailedExchangeException):
+    retry_policy.call(flaky)
+  assert flaky.calls == 1
+
+
+def test_attempts_are_limited():
+  retry_policy, sleeps = policy(attempts=2)
+  flaky = Flaky(*[ExchangeInternalServerTransientErrorException(u'oops')] * 5)
+
+  with raises(ExchangeInternalServerTransientErrorException):
+    retry_policy.call(flaky)
+  assert flaky.calls == 2
+  assert retry_policy.stats()[u'gave_up'] == 1
+
+
+def test_retries_come_out_of_a_budget():
+  retry_policy, sleeps = policy(budget_minimum=2, budget_ratio=0)
+
+  for _ in range(3):
+    with raises(ExchangeInternalServerTransientErrorException):
+      retry_policy.call(Flaky(*[ExchangeInternalServerTransientErrorException(u'oops')] * 5))
+
+  stats = retry_policy.stats()
+  assert stats[u'retries'] == 2
+  assert stats[u'over_budget'] == 2
+
+
+def test_failed_servers_are_retried_at_once_when_there_is_another():
+  retry_policy, sleeps = policy()
+  flaky = Flaky(ExchangeEndpointUnavailableException(u'down', url=u'a', failover_available=True),
+                ExchangeEndpointUnavailableException(u'down', url=u'b'))
+
+  assert retry_policy.call(flaky) == u'ok'
+  assert sleeps == [0, 1.0]
@@ -0,0 +1,79 @@
+import threading
+
+from lxml import etree
+from mock import patch
+from pytest import raises
+from pyexchange.base.soap import ExchangeServiceSOAP, response_parser
+from pyexchange.exceptions import FailedExchangeException
+
+LAUGHS = u"""<?xml version="1.0"?>
+<!DOCTYPE lolz [
+  <!ENTITY lol "lol">
+  <!ENTITY lol1 "&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;">
+  <!ENTITY lol2 "&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;&lol1;">
+  <!ENTITY lol3 "&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;">
+]>
+<lolz>&lol3;</lolz>"""
+
+EXTERNAL = u"""<?xml version="1.0"?>
+<!DOCTYPE secret [
+  <!ENTITY secret SYSTEM "file://{path}">
+]>
+<secret>&secret;</secret>"""
+
+
+def parse(xml, service=None):
+  service = service or ExchangeServiceSOAP(connection=None)
+  return service._parse(xml, check_errors=False)
+
+
+def test_each_thread_keeps_its_own_parser():
+  parsers = []
+  thread = threading.Thread(target=lambda: parsers.append(response_parser()))
+  thread.start()
+  thread.join()
+
+  assert response_parser() is response_parser()
+  assert parsers[0] is not response_parser()
+
+
+def test_huge_trees_get_a_parser_of_their_own():
+  assert response_parser(huge_tree=True) is not response_parser()
+  assert response_parser(huge_tree=True) is response_parser(huge_tree=True)
+
+
+def test_entities_are_not_expanded():
+  tree = parse(LAUGHS)
+
+  assert u'lollol' not in u''.join(tree.itertext())
+  assert len(etree.tostring(tree)) < len(LAUGHS)
+
+
+def test_external_entities_are_not_read(tmpdir):
+  secret = tmpdir.join(u'secret.txt')
+  secret.write(u'hunter2')
+
+  tree = parse(EXTERNAL.format(path=str(secret)))
+
+  assert u'hunter2' not in etree.tostring(tree).decode(u'utf-8')
+
+
+def test_whitespace_between_elements_is_dropped():
+  tree = parse(u'<a>\n  <b> </b>\n  <c>text</c>\n</a>')
+
+  assert etree.tostring(tree) == b'<a><b> </b><c>text</c></a>'
+
+
+def test_services_can_opt_in_to_huge_trees():
+  deep = u'<a>' * 300 + u'</a>' * 300
+
+  with raises(FailedExchangeException):
+    parse(deep)
+  assert len(parse(deep, ExchangeServiceSOAP(connection=None, huge_tree=True)).xpath(u'//a')) == 300
+
+
+def test_responses_are_only_serialized_for_the_log_when_it_is_on():
+  with patch('pyexchange.base.soap.etree.tostring') as tostring:
+    parse(u'<a><b/></a>')
+
+  assert not tostring.called
@@ -0,0 +1,108 @@
+from pytest import raises
+
+from pyexchange.exceptions import ExchangeServerBusyException, FailedExchangeException
+from pyexchange.throttling import AdaptiveConcurrencyLimiter, ExchangeThrottling
+
+
+class FakeClock(object):
+  def __init__(self):
+    self.now = 1000.0
+
+  def __call__(self):
+    return self.now
+
+
+def test_requests_wait_for_a_free_slot():
+  limiter = AdaptiveConcurrencyLimiter(initial=2)
+
+  assert limiter.acquire(timeout=0)
+  assert limiter.acquire(timeout=0)
+  assert not limiter.acquire(timeout=0)
+
+  limiter.release()
+  assert limiter.acquire(timeout=0)
+
+
+def test_requests_can_give_up_when_there_is_no_free_slot():
+  limiter = AdaptiveConcurrencyLimiter(initial=1, maximum=1)
+
+  with limiter.request() as held:
+    with limiter.request(timeout=0) as acquired:
+      assert held
+      assert not acquired
+    assert limiter.stats()[u'in_flight'] == 1
+
+  assert limiter.stats() == {u'limit': 1, u'in_flight': 0, u'successes': 1, u'throttles': 0}
+
+
+def test_successes_raise_the_limit_additively():
+  limiter = AdaptiveConcurrencyLimiter(initial=4, maximum=5)
+
+  for _ in range(4):  # about one more slot for every limit's worth of successes
+    with limiter.request():
+      pass
+  assert limiter.stats()[u'limit'] == 4
+
+  with limiter.request():
+    pass
+  assert limiter.stats()[u'limit'] == 5
+
+  for _ in range(20):
+    with limiter.request():
+      pass
+  assert limiter.stats()[u'limit'] == 5
+
+
+def test_throttling_cuts_the_limit_and_backs_off():
+  clock = FakeClock()
+  limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=2, clock=clock)
+
+  with raises(ExchangeServerBusyException):
+    with limiter.request():
+      raise ExchangeServerBusyException(u'slow down', back_off_milliseconds=5000)
+
+  assert limiter.stats() == {u'limit': 4, u'in_flight': 0, u'successes': 0, u'throttles': 1}
+  assert not limiter.acquire(timeout=0)
+
+  clock.now += 5
+  assert limiter.acquire(timeout=0)
+  limiter.release(throttled=True)
+  limiter.release(throttled=True)
+  assert limiter.stats()[u'limit'] == 2
+
+
+def test_other_failures_do_not_move_the_limit():
+  limiter = AdaptiveConcurrencyLimiter(initial=3)
+
+  with raises(FailedExchangeException):
+    with limiter.request():
+      raise FailedExchangeException(u'nope')
+
+  assert limiter.stats() == {u'limit': 3, u'in_flight': 0, u'successes': 0, u'throttles': 0}
+
+
+def test_interrupted_requests_give_their_slot_back():
+  limiter = AdaptiveConcurrencyLimiter(initial=1)
+
+  with raises(KeyboardInterrupt):
+    with limiter.request():
+      raise KeyboardInterrupt()
+  assert limiter.stats()[u'in_flight'] == 0
+
+  def abandoned():
+    with limiter.request():
+      yield
+
+  generator = abandoned()
+  next(generator)
+  generator.close()
+
+  assert limiter.stats() == {u'limit': 1, u'in_flight': 0, u'successes': 0, u'throttles': 0}
+
+
+def test_each_budget_has_its_own_limiter():
+  throttling = ExchangeThrottling(initial=3)
+
+  assert throttling.limiter_for(u'one') is throttling.limiter_for(u'one')
+  assert throttling.limiter_for(u'one') is not throttling.limiter_for(u'two')
+  assert throttling.stats()[u'two'][u'limit'] == 3
@@ -1,8 +1,10 @@
+import threading
+import time
 from datetime import datetime
 from pytz import timezone, utc
-from pytest import mark
+from pytest import mark, raises
 
-from pyexchange.utils import convert_datetime_to_utc
+from pyexchange.utils import SingleFlight, convert_datetime_to_utc, concurrent_map
 
 
 def test_converting_none_returns_none():
@@ -22,3 +24,114 @@ def test_converting_tz_aware_date_returns_tz_aware_date():
   utc_time = utc.localize(datetime(year=2014, month=4, day=1, hour=8, minute=0, second=0))
 
   assert convert_datetime_to_utc(pacific_time) == utc_time
+
+
+def test_concurrent_map_returns_results_and_errors():
+  def invert(number):
+    return 1.0 / number
+
+  results = dict((argument, (result, error)) for argument, result, error in concurrent_map(invert, [1, 2, 0, 4], max_workers=3))
+
+  assert results[2] == (0.5, None)
+  assert results[4] == (0.25, None)
+  assert results[0][0] is None
+  assert isinstance(results[0][1], ZeroDivisionError)
+
+
+def _join_while_running(single_flight, function, callers):
+  """ Runs single_flight.do(u'key', function) from *callers* threads, with all but the first joining the first. """
+  release = threading.Event()
+  results = []
+
+  def slow():
+    release.wait(5)
+    return function()
+
+  def call():
+    try:
+      results.append(single_flight.do(u'key', slow))
+    except BaseException as err:
+      results.append(err)
+
+  threads = [threading.Thread(target=call) for _ in range(callers)]
+  for thread in threads:
+    thread.start()
+
+  deadline = time.time() + 5
+  while single_flight.stats()[u'shared'] < callers - 1 and time.time() < deadline:
+    time.sleep(0.001)
+  release.set()
+
+  for thread in threads:
+    thread.join()
+  return results
+
+
+def test_single_flight_shares_one_call():
+  calls = []
+  single_flight = SingleFlight()
+
+  results = _join_while_running(single_flight, lambda: calls.append(1) or u'answer', 3)
+
+  assert results == [u'answer'] * 3
+  assert len(calls) == 1
+  assert single_flight.stats() == {u'calls': 1, u'shared': 2}
+
+
+def test_single_flight_hands_out_copies():
+  single_flight = SingleFlight(share=list)
+
+  results = _join_while_running(single_flight, lambda: [u'answer'], 3)
+
+  assert results == [[u'answer']] * 3
+  assert len(set(id(result) for result in results)) == 3
+
+
+def test_single_flight_copies_on_each_callers_thread():
+  threads = []
+  lock = threading.Lock()
+  calls = []
+
+  def share(result):
+    with lock:
+      threads.append(threading.current_thread())
+      calls.append(1)
+      if len(calls) == 1:
+        raise MemoryError(u'copying failed')
+    return list(result)
+
+  results = _join_while_running(SingleFlight(share=share), lambda: [u'answer'], 3)
+
+  assert len(set(threads)) == 3
+  assert sorted(results, key=lambda result: isinstance(result, list))[1:] == [[u'answer']] * 2
+  assert len([result for result in results if isinstance(result, MemoryError)]) == 1
+
+
+def test_single_flight_shares_errors():
+  single_flight = SingleFlight()
+
+  def fail():
+    raise ValueError(u'oops')
+
+  results = _join_while_running(single_flight, fail, 2)
+
+  assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+def test_single_flight_shares_interruptions():
+  def interrupted():
+    raise SystemExit(1)
+
+  results = _join_while_running(SingleFlight(share=list), interrupted, 3)
+
+  assert [type(result) for result in results] == [SystemExit] * 3
+
+
+def test_single_flight_forgets_finished_calls():
+  single_flight = SingleFlight()
+
+  assert single_flight.do(u'key', lambda: 1) == 1
+  assert single_flight.do(u'key', lambda: 2) == 2
+  with raises(ValueError):
+    single_flight.do(u'key', lambda: int(u'x'))
+  assert single_flight.stats()[u'calls'] == 3